@@ -1,34 +1,53 @@
 
 import streamlit as st
+import os
+import base64
+import heapq
 import threading
-import queue
 import time
 import random
-import json
 
 # Local Modules
-from logic.dynamics import (
-    BASE_SCORE,
-    apply_decay,
-    apply_definitive,
-    apply_hesitation,
-    apply_interruption,
-    get_influence,
-    DEFINITIVE_GAIN,
-    HESITATION_PENALTY,
-    INTERRUPT_TRANSFER,
+from logic.engine import RemoteEngine, result_event
+from logic.dynamics import DECAY_MODES, DECAY_PERIOD
+from logic.models import DEFAULT_MODEL, MODELS, available_models
+from logic.profiling import SessionProfiler, profiling_default
+from logic.records import format_confidence, format_event, format_time
+from logic.rules import get_classifier
+from logic.session import (
+    new_session,
+    add_subject,
+    change_decay_mode,
+    record_classification,
+    record_interruption,
+    process_results,
+    build_export_json,
+    model_comparison,
+    model_influence,
+    model_names,
+)
+from logic.snapshot import SUFFIX as SNAPSHOT_SUFFIX, list_snapshots, load_snapshot, save_snapshot
+from logic.spill import bound_session, memory_report, unbound_session
+from ui.components import (
+    load_css,
+    render_header,
+    leaderboard_html,
+    subject_card,
+    classification_tag,
+    fragment_cache_info,
 )
-from logic.analysis import classify_speech
-from ui.components import load_css, render_header
 from ui.graphs import render_graph
 from audio_modules.voice import (
     load_voice_encoder,
     get_enrollment_script,
     audio_to_numpy,
+    embed_utterance,
     preprocess_wav,
     RESEMBLYZER_AVAILABLE,
 )
+from audio_modules.channel import ResultChannel
 from audio_modules.listener import AudioListener
+from audio_modules.multichannel import MicChannel, MultiMicListener, list_inputs
 import speech_recognition as sr # Needed for enrollment button inside app.py
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -38,19 +57,32 @@ st.set_page_config(
     page_title="Conversational Power Dynamics — Behavioral Lab",
     layout="wide",
 )
+if "profiler" not in st.session_state:
+    st.session_state.profiler = SessionProfiler()
+profiler = st.session_state.profiler
+profiler.begin_run(profile=st.session_state.get("profiling", profiling_default()))
+
 load_css()
 render_header()
 
 # ═══════════════════════════════════════════════════════════════════════════
 #  SESSION STATE
 # ═══════════════════════════════════════════════════════════════════════════
+AUDIO_QUEUE_SIZE = 1000  # listener results held between reruns; oldest dropped
+AUDIO_DRAIN_MAX = 200    # results applied per rerun
+RENDER_SECTIONS = ("leaderboard", "controls", "graph", "transcript")
+LARGE_GROUP = 12         # subjects at which large-group mode kicks in
+LEADERBOARD_TOP_K = 10   # large groups: leaderboard rows shown
+CARDS_PER_ROW = 6        # large groups: subject cards per grid row
+CARDS_PER_PAGE = 24
+GRAPH_MAX_NODES = 30     # large groups: the rest collapse into one node
+GRAPH_MIN_EDGE = 2       # large groups: hide edges with fewer interruptions
+SNAPSHOT_DIR = os.environ.get("GLM_SNAPSHOT_DIR", "snapshots")
+TRANSCRIPT_PAGE = 50     # transcript lines per page, newest first
+LOG_PAGE = 100           # event log lines per page
 for key, default in [
-    ("people", []),
-    ("nodes", {}),
-    ("edges", {}),
-    ("log", []),
-    ("transcript", []),
-    ("audio_queue", queue.Queue()),
+    *new_session().items(),
+    ("audio_queue", ResultChannel(maxsize=AUDIO_QUEUE_SIZE)),
     ("listener", None),
     ("listening", False),
     ("voice_profiles", {}),
@@ -59,6 +91,39 @@ for key, default in [
     if key not in st.session_state:
         st.session_state[key] = default
 
+
+# ── Engine service (optional) ──
+# With GLM_ENGINE_URL set (see server.py), every action that changes engine
+# state here (events, decay mode, speaking-time and scoring-model settings,
+# snapshot restores, resets) is also posted to the service, which streams
+# it to other dashboards. logic/engine.py lists what is not mirrored.
+@st.cache_resource
+def get_remote_engine(url):
+    return RemoteEngine(url)
+
+
+remote_engine = get_remote_engine(os.environ["GLM_ENGINE_URL"]) if os.environ.get("GLM_ENGINE_URL") else None
+
+
+@st.cache_resource
+def get_audio_inputs():
+    return list_inputs()
+
+
+def page_control(key, n_items, per_page):
+    """Page number (1 = newest) for a long list; older pages load on demand."""
+    n_pages = -(-n_items // per_page)
+    if n_pages <= 1:
+        return 1
+    return st.number_input(
+        f"Page (1 = newest, of {n_pages})", min_value=1, max_value=n_pages, value=1, key=key,
+    )
+
+
+def forward(event):
+    if remote_engine is not None:
+        remote_engine.send(event)
+
 try:
     import speech_recognition as sr_check
     SR_AVAILABLE = True
@@ -70,13 +135,13 @@ except ImportError:
 #  COMPUTED METRICS
 # ═══════════════════════════════════════════════════════════════════════════
 total_people = len(st.session_state.people)
-total_statements = sum(n["statements"] for n in st.session_state.nodes.values())
-total_hesitations = sum(n["hesitations"] for n in st.session_state.nodes.values())
-total_interruptions = sum(st.session_state.edges.values())
+total_statements = sum(n.statements for n in st.session_state.nodes.values())
+total_hesitations = sum(n.hesitations for n in st.session_state.nodes.values())
+total_interruptions = st.session_state.interactions.total
 enrolled_count = sum(
     1 for p in st.session_state.people if p in st.session_state.voice_profiles
 )
-influence = get_influence(st.session_state.nodes)
+influence, scores = model_influence(st.session_state)
 
 if total_people > 0:
     st.markdown(f"""
@@ -103,6 +168,7 @@ if total_people > 0:
         </div>
     </div>
     """, unsafe_allow_html=True)
+profiler.lap("header")
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -116,13 +182,8 @@ new_person = st.sidebar.text_input(
 )
 if st.sidebar.button("Add Subject", use_container_width=True) and new_person.strip():
     name = new_person.strip()
-    if name not in st.session_state.nodes:
-        st.session_state.people.append(name)
-        st.session_state.nodes[name] = {
-            "raw_score": BASE_SCORE,
-            "statements": 0,
-            "hesitations": 0,
-        }
+    if add_subject(st.session_state, name):
+        forward({"type": "subject", "name": name})
         st.rerun()
     else:
         st.sidebar.warning(f"'{name}' already exists.")
@@ -139,7 +200,7 @@ for person in st.session_state.people:
         f'<span class="sb-status {status_cls}">{status_txt}</span>'
         f'<br><span class="sb-influence">{pct:.1f}%</span>'
         f'<div class="sb-meta">'
-        f'RAW:{node["raw_score"]:.0f}  S:{node["statements"]}  H:{node["hesitations"]}'
+        f'RAW:{scores[person]:.0f}  S:{node.statements}  H:{node.hesitations}'
         f'</div>'
         f'</div>',
         unsafe_allow_html=True,
@@ -186,7 +247,7 @@ if SR_AVAILABLE and RESEMBLYZER_AVAILABLE and st.session_state.people:
                                 audio = recognizer.record(source, duration=10)
                             wav_np = audio_to_numpy(audio)
                             processed = preprocess_wav(wav_np, source_sr=16000)
-                            embedding = encoder.embed_utterance(processed)
+                            embedding = embed_utterance(encoder, processed)
                             st.session_state.voice_profiles[person] = embedding
                             st.session_state.enrollment_scripts.pop(person, None)
                             st.rerun()
@@ -216,11 +277,38 @@ if SR_AVAILABLE and st.session_state.people:
             "Fallback speaker", st.session_state.people, key="active_speaker",
         )
     if not st.session_state.listening:
+        # Per-participant mics: a mapped subject needs no voice profile and
+        # overlap between their channels is read as interruptions
+        inputs = get_audio_inputs()
+        mic_labels = ["Room mic (voice ID)", *(label for label, _ in inputs)]
+        if len(inputs) > 1:
+            with st.sidebar.expander("Microphones"):
+                for person in st.session_state.people:
+                    st.selectbox(
+                        person, range(len(mic_labels)), format_func=mic_labels.__getitem__,
+                        key=f"mic_{person}",
+                    )
+        mic_map = {
+            person: inputs[st.session_state[f"mic_{person}"] - 1][1]
+            for person in st.session_state.people
+            if st.session_state.get(f"mic_{person}") and st.session_state[f"mic_{person}"] <= len(inputs)
+        }
         if st.sidebar.button("Start Recording", use_container_width=True, type="primary"):
             enc = load_voice_encoder() if RESEMBLYZER_AVAILABLE else None
-            listener = AudioListener(
-                st.session_state.audio_queue, enc, st.session_state.voice_profiles,
-            )
+            listener_profiler = profiler if st.session_state.get("profiling") else None
+            if mic_map:
+                channels = [MicChannel(m.device, m.channel, person) for person, m in mic_map.items()]
+                if len(mic_map) < len(st.session_state.people):
+                    channels.append(MicChannel())  # everyone else on the default mic
+                listener = MultiMicListener(
+                    st.session_state.audio_queue, enc, st.session_state.voice_profiles,
+                    channels, profiler=listener_profiler,
+                )
+            else:
+                listener = AudioListener(
+                    st.session_state.audio_queue, enc, st.session_state.voice_profiles,
+                    profiler=listener_profiler,
+                )
             listener.start()
             st.session_state.listener = listener
             st.session_state.listening = True
@@ -243,56 +331,65 @@ elif SR_AVAILABLE:
         unsafe_allow_html=True,
     )
 
+# ── Scoring ──
+st.sidebar.markdown("## Scoring")
+score_speaking_time = st.sidebar.checkbox(
+    "Credit speaking time",
+    value=st.session_state.settings["score_speaking_time"],
+    help="Adds +1 raw score per second a subject holds the floor.",
+)
+if score_speaking_time != st.session_state.settings["score_speaking_time"]:
+    st.session_state.settings["score_speaking_time"] = score_speaking_time
+    forward({"type": "settings", "settings": {"score_speaking_time": score_speaking_time}})
+decay_mode = st.sidebar.radio(
+    "Decay",
+    DECAY_MODES,
+    index=DECAY_MODES.index(st.session_state.clock.mode),
+    format_func={"event": "Per event", "time": "Time-based"}.get,
+    horizontal=True,
+    help=f"Per event: 5% decay on every action. Time-based: 5% per "
+         f"{DECAY_PERIOD:g} s of wall time, including silence.",
+)
+if decay_mode != st.session_state.clock.mode:
+    change_decay_mode(st.session_state, decay_mode)
+    forward({"type": "decay_mode", "mode": decay_mode})
+    st.rerun()
+model_labels = {name: MODELS[name].label for name in available_models()}
+settings = st.session_state.settings
+settings["scoring_model"] = st.sidebar.selectbox(
+    "Model",
+    list(model_labels),
+    # a name this build doesn't have (e.g. from a newer snapshot) shows the default
+    index=list(model_labels).index(
+        settings.get("scoring_model") if settings.get("scoring_model") in model_labels else DEFAULT_MODEL
+    ),
+    format_func=model_labels.get,
+    help="Drives the leaderboard, cards and graph. Other models replay the event log.",
+)
+settings["compare_models"] = st.sidebar.multiselect(
+    "Compare with",
+    [m for m in model_labels if m != settings["scoring_model"]],
+    default=[
+        m for m in settings.get("compare_models", [])
+        if m in model_labels and m != settings["scoring_model"]
+    ],
+    format_func=model_labels.get,
+)
+model_settings = {key: settings[key] for key in ("scoring_model", "compare_models")}
+if model_settings != st.session_state.get("forwarded_models"):
+    # the service's export reports the same models as this dashboard
+    forward({"type": "settings", "settings": model_settings})
+    st.session_state.forwarded_models = model_settings
+
 # ── Export Session ──
 st.sidebar.markdown("## Export")
 
-def build_export_json():
-    inf = get_influence(st.session_state.nodes)
-    subjects = []
-    for name in st.session_state.people:
-        node = st.session_state.nodes[name]
-        subjects.append({
-            "name": name,
-            "raw_score": round(node["raw_score"], 2),
-            "influence_pct": round(inf.get(name, 0), 2),
-            "statements": node["statements"],
-            "hesitations": node["hesitations"],
-        })
-    edges = []
-    for (src, dst), count in st.session_state.edges.items():
-        edges.append({
-            "interrupter": src,
-            "interrupted": dst,
-            "count": count,
-        })
-    transcript = []
-    for entry in st.session_state.transcript:
-        if isinstance(entry, dict):
-            t = {
-                "time": entry.get("time", ""),
-                "speaker": entry.get("speaker", ""),
-                "text": entry.get("text", ""),
-                "classification": entry.get("classification", ""),
-            }
-            if entry.get("confidence"):
-                t["confidence"] = entry["confidence"].strip()
-            if entry.get("interrupted"):
-                t["interrupted"] = entry["interrupted"]
-            transcript.append(t)
-        else:
-            transcript.append({"raw": str(entry)})
-    return json.dumps({
-        "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
-        "subjects": subjects,
-        "transcript": transcript,
-        "interaction_graph": edges,
-        "event_log": list(st.session_state.log),
-    }, indent=2)
-
 if st.session_state.people:
+    # Built on click: in a long session the export reads the spilled pages
+    export_state = {key: st.session_state[key] for key in new_session()}
     st.sidebar.download_button(
         label="Export Session (JSON)",
-        data=build_export_json(),
+        data=lambda: build_export_json(export_state),
         file_name=f"session_{time.strftime('%Y%m%d_%H%M%S')}.json",
         mime="application/json",
         use_container_width=True,
@@ -304,102 +401,108 @@ else:
         unsafe_allow_html=True,
     )
 
+# ── Snapshot ──
+# Full session state, voice profiles included, so a restored session
+# needs no re-enrollment.
+st.sidebar.markdown("## Snapshot")
+if st.session_state.people and st.sidebar.button("Save Snapshot", use_container_width=True):
+    path = save_snapshot(
+        st.session_state,
+        os.path.join(SNAPSHOT_DIR, f"session_{time.strftime('%Y%m%d_%H%M%S')}{SNAPSHOT_SUFFIX}"),
+    )
+    st.sidebar.caption(f"Saved {path}")
+saved = list_snapshots(SNAPSHOT_DIR)
+restore_from = st.sidebar.selectbox(
+    "Saved snapshots", saved, format_func=os.path.basename, index=None,
+    placeholder="Choose a snapshot",
+) if saved else None
+uploaded = st.sidebar.file_uploader("Or upload", type=[SNAPSHOT_SUFFIX.lstrip(".")])
+if (restore_from or uploaded) and st.sidebar.button("Restore Snapshot", use_container_width=True):
+    try:
+        if uploaded:
+            blob = uploaded.getvalue()
+        else:
+            with open(restore_from, "rb") as f:
+                blob = f.read()
+        restored = load_snapshot(blob)
+    except (OSError, ValueError, KeyError) as e:
+        st.sidebar.error(f"Could not restore: {e}")
+    else:
+        if st.session_state.listener and st.session_state.listener.running:
+            st.session_state.listener.stop()
+        for key, value in restored.items():
+            st.session_state[key] = value
+        forward({"type": "restore", "snapshot": base64.b64encode(blob).decode("ascii")})
+        st.session_state.audio_queue = ResultChannel(maxsize=AUDIO_QUEUE_SIZE)
+        st.session_state.listener = None
+        st.session_state.listening = False
+        st.rerun()
+
+# ── Long Session ──
+# Keeps only the newest transcript and event log entries in RAM; older
+# ones move to a temp file and are paged back in on demand.
+st.sidebar.markdown("## Long Session")
+budget_mb = st.sidebar.number_input(
+    "Transcript & log RAM budget (MB)", min_value=0,
+    value=int(st.session_state.settings.get("memory_budget_mb", 0)), step=8,
+    help="0 keeps everything in memory.",
+)
+st.session_state.settings["memory_budget_mb"] = budget_mb
+if budget_mb:
+    bound_session(st.session_state, budget_mb * 2**20)
+else:
+    unbound_session(st.session_state)
+
+# ── Diagnostics ──
+st.sidebar.markdown("## Diagnostics")
+profiling = st.sidebar.checkbox(
+    "Profile script & listener", value=profiling_default(), key="profiling",
+)
+if st.session_state.listener:
+    st.session_state.listener.profiler = profiler if profiling else None
+if profiler.has_stats:
+    st.sidebar.download_button(
+        label="Download Profile (.pstats)",
+        data=profiler.dump(),
+        file_name=f"profile_{time.strftime('%Y%m%d_%H%M%S')}.pstats",
+        mime="application/octet-stream",
+        use_container_width=True,
+    )
+    if st.sidebar.button("Clear Profile", use_container_width=True):
+        profiler.reset()
+        st.rerun()
+
 # ── Reset ──
 st.sidebar.markdown("---")
 if st.sidebar.button("Reset Session", use_container_width=True):
     if st.session_state.listener and st.session_state.listener.running:
         st.session_state.listener.stop()
     for key in [
-        "people", "nodes", "edges", "log", "transcript",
+        *new_session(),
         "listening", "voice_profiles", "enrollment_scripts",
     ]:
         if key in st.session_state:
             del st.session_state[key]
-    st.session_state.audio_queue = queue.Queue()
+    st.session_state.audio_queue = ResultChannel(maxsize=AUDIO_QUEUE_SIZE)
     st.session_state.listener = None
+    forward({"type": "reset"})
     st.rerun()
+profiler.lap("sidebar")
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 #  PROCESS AUDIO QUEUE
 # ═══════════════════════════════════════════════════════════════════════════
 if st.session_state.listening:
-    processed = False
     fallback_speaker = st.session_state.get("active_speaker", None)
-    while not st.session_state.audio_queue.empty():
-        try:
-            result = st.session_state.audio_queue.get_nowait()
-        except queue.Empty:
-            break
-        if isinstance(result, str):
-            text = result
-            speaker = fallback_speaker
-            confidence = 0.0
-            interrupted_person = None
-        else:
-            text = result["text"]
-            speaker = result["speaker"]
-            confidence = result["confidence"]
-            interrupted_person = result["interrupted"]
-        
-        if text.startswith("[STT ERROR") or text.startswith("[AUDIO ERROR"):
-            st.session_state.log.append(text)
-            continue
-        
-        if speaker is None:
-            speaker = fallback_speaker
-        
-        conf_str = f" {confidence:.0%}" if confidence > 0 else ""
-        classification = classify_speech(text)
-        
-        st.session_state.transcript.append({
-            "speaker": speaker or "UNKNOWN",
-            "confidence": conf_str,
-            "text": text,
-            "classification": classification,
-            "interrupted": interrupted_person,
-            "time": time.strftime("%H:%M:%S"),
-        })
-        
-        if speaker and speaker in st.session_state.nodes:
-            if classification == "definitive":
-                apply_definitive(st.session_state.nodes, speaker)
-                st.session_state.log.append(
-                    f'{time.strftime("%H:%M:%S")}  {speaker}  DEFINITIVE  +{DEFINITIVE_GAIN}  "{text}"'
-                )
-                processed = True
-            elif classification == "hesitation":
-                apply_hesitation(st.session_state.nodes, speaker)
-                st.session_state.log.append(
-                    f'{time.strftime("%H:%M:%S")}  {speaker}  HESITATION  -{HESITATION_PENALTY}  "{text}"'
-                )
-                processed = True
-            else:
-                # Neutral still triggers decay (silence penalty to everyone)
-                apply_decay(st.session_state.nodes)
-                st.session_state.log.append(
-                    f'{time.strftime("%H:%M:%S")}  {speaker}  NEUTRAL     ~decay  "{text}"'
-                )
-                processed = True
-        
-        if interrupted_person and speaker and interrupted_person != speaker:
-            if (
-                interrupted_person in st.session_state.nodes
-                and speaker in st.session_state.nodes
-            ):
-                apply_interruption(
-                    st.session_state.nodes, speaker, interrupted_person,
-                )
-                edge_key = (speaker, interrupted_person)
-                st.session_state.edges[edge_key] = (
-                    st.session_state.edges.get(edge_key, 0) + 1
-                )
-                st.session_state.log.append(
-                    f'{time.strftime("%H:%M:%S")}  {speaker} -> {interrupted_person}  '
-                    f'INTERRUPTION  +/-{INTERRUPT_TRANSFER}'
-                )
-                processed = True
-    
+    results = st.session_state.audio_queue.get_many(AUDIO_DRAIN_MAX, timeout=0)
+    # one apply_events() call (and time-mode catch-up) for the whole burst
+    processed = process_results(st.session_state, results, fallback_speaker) > 0
+    for result in results:
+        if not result.error:
+            forward({**result_event(result), "speaker": result.speaker or fallback_speaker})
+
+    profiler.lap("queue_drain")
     if processed:
         st.rerun()
 
@@ -409,63 +512,60 @@ if st.session_state.listening:
 # ═══════════════════════════════════════════════════════════════════════════
 if st.session_state.people:
 
-    # Recompute influence after any queue processing
-    influence = get_influence(st.session_state.nodes)
+    # Recompute influence after any queue processing (and, in time mode,
+    # decay accrued since the last event; nothing is written back)
+    influence, scores = model_influence(st.session_state)
 
     # ── Leaderboard ─────────────────────────────────────────────────────
     st.markdown('<div class="section-label">Influence Leaderboard</div>', unsafe_allow_html=True)
     
-    ranked = sorted(influence.items(), key=lambda x: x[1], reverse=True)
-    lb_html = '<div class="leaderboard">'
-    for rank, (name, pct) in enumerate(ranked, 1):
-        raw = st.session_state.nodes[name]["raw_score"]
-        lb_html += (
-            f'<div class="lb-row">'
-            f'<span class="lb-rank">{str(rank).zfill(2)}</span>'
-            f'<span class="lb-name">{name}</span>'
-            f'<div class="lb-bar-wrap"><div class="lb-bar" style="width:{pct:.1f}%"></div></div>'
-            f'<span class="lb-pct">{pct:.1f}%</span>'
-            f'</div>'
-        )
-    lb_html += '</div>'
-    st.markdown(lb_html, unsafe_allow_html=True)
+    people = st.session_state.people
+    large_group = len(people) >= LARGE_GROUP
+    dominance = st.session_state.interactions.metrics()
+    if large_group:
+        ranked = heapq.nlargest(LEADERBOARD_TOP_K, influence.items(), key=lambda x: x[1])
+    else:
+        ranked = sorted(influence.items(), key=lambda x: x[1], reverse=True)
+    st.markdown(
+        leaderboard_html(ranked, dominance, hidden=len(people) - len(ranked)),
+        unsafe_allow_html=True,
+    )
+    profiler.lap("leaderboard")
 
     st.divider()
 
     # ── Manual Controls ─────────────────────────────────────────────────
     st.markdown('<div class="section-label">Manual Controls</div>', unsafe_allow_html=True)
 
-    cols = st.columns(len(st.session_state.people))
-    for i, person in enumerate(st.session_state.people):
-        with cols[i]:
-            idx = str(i + 1).zfill(2)
-            pct = influence.get(person, 0)
-            raw = st.session_state.nodes[person]["raw_score"]
-            st.markdown(
-                f'<div class="subject-card">'
-                f'<div class="id">Subject {idx}</div>'
-                f'<div class="name">{person}</div>'
-                f'<div class="influence">{pct:.1f}%</div>'
-                f'<div class="raw">RAW {raw:.0f}</div>'
-                f'<div class="inf-bar-wrap"><div class="inf-bar" style="width:{pct:.1f}%"></div></div>'
-                f'</div>',
-                unsafe_allow_html=True,
-            )
-            c1, c2 = st.columns(2)
-            with c1:
-                if st.button("Definitive", key=f"def_{person}", use_container_width=True):
-                    apply_definitive(st.session_state.nodes, person)
-                    st.session_state.log.append(
-                        f'{time.strftime("%H:%M:%S")}  {person}  DEFINITIVE  +{DEFINITIVE_GAIN}  (manual)'
-                    )
-                    st.rerun()
-            with c2:
-                if st.button("Hesitation", key=f"hes_{person}", use_container_width=True):
-                    apply_hesitation(st.session_state.nodes, person)
-                    st.session_state.log.append(
-                        f'{time.strftime("%H:%M:%S")}  {person}  HESITATION  -{HESITATION_PENALTY}  (manual)'
-                    )
-                    st.rerun()
+    if large_group:
+        n_pages = -(-len(people) // CARDS_PER_PAGE)
+        page = st.number_input(
+            f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, key="card_page",
+        )
+        first = (page - 1) * CARDS_PER_PAGE
+        page_people = list(enumerate(people))[first:first + CARDS_PER_PAGE]
+        rows = [page_people[i:i + CARDS_PER_ROW] for i in range(0, len(page_people), CARDS_PER_ROW)]
+    else:
+        rows = [list(enumerate(people))]
+    for row in rows:
+        cols = st.columns(CARDS_PER_ROW if large_group else len(row))
+        for col, (i, person) in zip(cols, row):
+            with col:
+                st.markdown(
+                    subject_card(i + 1, person, round(influence.get(person, 0), 1), round(scores[person])),
+                    unsafe_allow_html=True,
+                )
+                c1, c2 = st.columns(2)
+                with c1:
+                    if st.button("Definitive", key=f"def_{person}", use_container_width=True):
+                        record_classification(st.session_state, person, "definitive")
+                        forward({"type": "classification", "speaker": person, "classification": "definitive"})
+                        st.rerun()
+                with c2:
+                    if st.button("Hesitation", key=f"hes_{person}", use_container_width=True):
+                        record_classification(st.session_state, person, "hesitation")
+                        forward({"type": "classification", "speaker": person, "classification": "hesitation"})
+                        st.rerun()
 
     st.divider()
 
@@ -492,65 +592,88 @@ if st.session_state.people:
             if interrupter == interrupted_sel:
                 st.warning("A subject cannot interrupt themselves.")
             else:
-                apply_interruption(
-                    st.session_state.nodes, interrupter, interrupted_sel,
-                )
-                edge_key = (interrupter, interrupted_sel)
-                st.session_state.edges[edge_key] = (
-                    st.session_state.edges.get(edge_key, 0) + 1
-                )
-                st.session_state.log.append(
-                    f'{time.strftime("%H:%M:%S")}  {interrupter} -> {interrupted_sel}  '
-                    f'INTERRUPTION  +/-{INTERRUPT_TRANSFER}  (manual)'
+                record_interruption(
+                    st.session_state, interrupter, interrupted_sel, manual=True,
                 )
+                forward({"type": "interruption", "interrupter": interrupter, "interrupted": interrupted_sel})
                 st.rerun()
         st.divider()
 
+    profiler.lap("controls")
+
     # ── Graph ───────────────────────────────────────────────────────────
     st.markdown('<div class="section-label">Interaction Graph</div>', unsafe_allow_html=True)
-    render_graph(st.session_state.people, st.session_state.nodes, st.session_state.edges, influence)
+    render_graph(
+        st.session_state.people, st.session_state.nodes,
+        st.session_state.interactions, influence, scores,
+        max_nodes=GRAPH_MAX_NODES if large_group else None,
+        min_edge=GRAPH_MIN_EDGE if large_group else 1,
+    )
+    st.session_state.latency.mark_rendered()
+    profiler.lap("graph")
 
     st.divider()
 
     # ── Live Transcript ─────────────────────────────────────────────────
-    if st.session_state.transcript:
+    transcript = st.session_state.transcript
+    if transcript:
         with st.expander("Live Transcript", expanded=st.session_state.listening):
-            for entry in reversed(st.session_state.transcript[-50:]):
-                if isinstance(entry, dict):
-                    cls = entry["classification"]
-                    spk = entry["speaker"]
-                    conf = entry["confidence"]
-                    txt = entry["text"]
-                    ts = entry.get("time", "")
-                    interrupted = entry.get("interrupted")
-                    if cls == "definitive":
-                        cls_span = '<span class="cls-def">[DEFINITIVE]</span>'
-                    elif cls == "hesitation":
-                        cls_span = '<span class="cls-hes">[HESITATION]</span>'
-                    else:
-                        cls_span = '<span class="cls-neu">[NEUTRAL]</span>'
-                    line = (
-                        f'<div class="tx-entry">'
-                        f'<span class="ts">{ts}</span>'
-                        f'<span class="spk">{spk}{conf}</span> '
-                        f'{cls_span} {txt}'
+            page = page_control("transcript_page", len(transcript), TRANSCRIPT_PAGE)
+            stop = len(transcript) - (page - 1) * TRANSCRIPT_PAGE
+            for entry in reversed(transcript[max(0, stop - TRANSCRIPT_PAGE):stop]):
+                spk = entry.speaker or "UNKNOWN"
+                conf = format_confidence(entry.confidence)
+                cls_span = classification_tag(entry.classification)
+                line = (
+                    f'<div class="tx-entry">'
+                    f'<span class="ts">{format_time(entry.t)}</span>'
+                    f'<span class="spk">{spk}{conf}</span> '
+                    f'{cls_span} {entry.text}'
+                )
+                if entry.interrupted:
+                    line += (
+                        f' <span class="int-flag">'
+                        f'[INTERRUPTED {entry.interrupted.upper()}]</span>'
                     )
-                    if interrupted:
-                        line += (
-                            f' <span class="int-flag">'
-                            f'[INTERRUPTED {interrupted.upper()}]</span>'
-                        )
-                    line += "</div>"
-                    st.markdown(line, unsafe_allow_html=True)
-                else:
-                    st.text(entry)
+                line += "</div>"
+                st.markdown(line, unsafe_allow_html=True)
+
+    # ── Turn Taking ─────────────────────────────────────────────────────
+    turn_stats = st.session_state.turns.summary()["subjects"]
+    if turn_stats:
+        with st.expander("Turn Taking", expanded=False):
+            st.table([
+                {
+                    "subject": name,
+                    "speaking s": s["speaking_s"],
+                    "share": f'{s["speaking_share"]:.0%}',
+                    "turns": s["turns"],
+                    "mean turn s": s["turn_length"]["mean"],
+                    "mean latency s": s["response_latency"]["mean"],
+                    "overlap s": s["overlap_s"],
+                }
+                for name, s in turn_stats.items()
+            ])
+
+    # ── Model Comparison ────────────────────────────────────────────────
+    compared = model_names(st.session_state.settings)
+    if len(compared) > 1:
+        with st.expander("Model Comparison", expanded=False):
+            by_model = model_comparison(st.session_state)
+            st.table([
+                {"subject": name, **{model_labels[m]: f"{by_model[m][name]:.1f}%" for m in compared}}
+                for name in people
+            ])
 
     # ── Event Log ───────────────────────────────────────────────────────
     with st.expander("Event Log", expanded=False):
-        if st.session_state.log:
-            for entry in reversed(st.session_state.log):
+        log = st.session_state.log
+        if log:
+            page = page_control("log_page", len(log), LOG_PAGE)
+            stop = len(log) - (page - 1) * LOG_PAGE
+            for entry in reversed(log[max(0, stop - LOG_PAGE):stop]):
                 st.markdown(
-                    f'<div class="log-entry">{entry}</div>',
+                    f'<div class="log-entry">{format_event(entry)}</div>',
                     unsafe_allow_html=True,
                 )
         else:
@@ -559,9 +682,109 @@ if st.session_state.people:
                 unsafe_allow_html=True,
             )
 
+    profiler.lap("transcript")
+
+    # ── Diagnostics ─────────────────────────────────────────────────────
+    with st.expander("Diagnostics", expanded=False):
+        sections = profiler.section_summary()
+        if sections:
+            st.table([
+                {"section": name, "last ms": round(last, 2), "mean ms": round(mean, 2)}
+                for name, last, mean in sections
+            ])
+        if profiling and profiler.has_stats:
+            st.table(profiler.top())
+        last = profiler.last_sections
+        render_ms = sum(last.get(k, 0.0) for k in RENDER_SECTIONS) * 1000
+        fragments = "  ".join(
+            f"{name} {hits}/{hits + misses}" for name, (hits, misses) in fragment_cache_info().items()
+        )
+        st.markdown(
+            f'<div class="log-entry">RENDER {render_ms:.1f} ms last rerun  '
+            f'fragment cache hits {fragments}</div>',
+            unsafe_allow_html=True,
+        )
+        classifier = get_classifier()
+        st.markdown(
+            f'<div class="log-entry">RULES {classifier.path}  '
+            f'{classifier.rules.size} phrases/patterns  '
+            f'loaded {time.strftime("%H:%M:%S", time.localtime(classifier.loaded_at))}'
+            + (f'  <span class="int-flag">{classifier.last_error}</span>' if classifier.last_error else "")
+            + '</div>',
+            unsafe_allow_html=True,
+        )
+        channel = st.session_state.audio_queue
+        st.markdown(
+            f'<div class="log-entry">QUEUE {channel.qsize()}/{channel.maxsize} pending  '
+            f'{channel.dropped} dropped</div>',
+            unsafe_allow_html=True,
+        )
+        listener = st.session_state.listener
+        if listener is not None and listener.gate is not None:
+            g = listener.gate.stats()
+            st.markdown(
+                f'<div class="log-entry">VAD {g["rejected"]}/{g["segments"]} phrases rejected  '
+                f'{g["rejected_audio_s"]:.1f}s audio  ~{g["saved_s"]:.1f}s embed+STT saved  '
+                f'floor {g["noise_floor_db"]:.0f} dBFS</div>',
+                unsafe_allow_html=True,
+            )
+        memory = memory_report(st.session_state)
+        st.markdown(
+            '<div class="log-entry">MEMORY  ' + "  ".join(
+                f'{name} {m["ram_bytes"] / 1024:.0f} KB'
+                + (f' (+{m["disk_bytes"] / 1024:.0f} KB on disk)' if m["disk_bytes"] else "")
+                for name, m in memory.items()
+            ) + '</div>',
+            unsafe_allow_html=True,
+        )
+        if isinstance(listener, MultiMicListener):
+            m = listener.stats()
+            levels = "  ".join(
+                f"{c['subject'] or c['label']} {c['level_db']:.0f} dB" for c in m["channels"]
+            )
+            st.markdown(
+                f'<div class="log-entry">MICS {len(m["channels"])} channels  {m["pending"]} held  '
+                f'{m["bleed"]} cross-talk dropped  {m["interruptions"]} overlaps  {levels}</div>',
+                unsafe_allow_html=True,
+            )
+        if listener is not None and listener.tracker.names:
+            posteriors = "  ".join(
+                f"{name or 'unknown'} {p:.0%}" for name, p in listener.tracker.posteriors().items()
+            )
+            st.markdown(f'<div class="log-entry">SPEAKER {posteriors}</div>', unsafe_allow_html=True)
+        if remote_engine is not None:
+            st.markdown(
+                f'<div class="log-entry">ENGINE {remote_engine.url}  {remote_engine.sent} sent  '
+                f'{remote_engine.failed} failed'
+                + (f'  <span class="int-flag">{remote_engine.last_error}</span>' if remote_engine.last_error else "")
+                + '</div>',
+                unsafe_allow_html=True,
+            )
+        latency = st.session_state.latency.summary()
+        if latency:
+            st.table([
+                {
+                    "stage": name, "n": s["count"],
+                    "p50 ms": s["p50_ms"], "p95 ms": s["p95_ms"],
+                    "p99 ms": s["p99_ms"], "max ms": s["max_ms"],
+                }
+                for name, s in latency.items()
+            ])
+            if "end_to_end" in latency:
+                st.bar_chart(latency["end_to_end"]["histogram"])
+        else:
+            st.markdown(
+                '<div class="log-entry">No timed results yet.</div>',
+                unsafe_allow_html=True,
+            )
+
+    profiler.end_run()
+
     # ── Auto-refresh ────────────────────────────────────────────────────
+    # Wakes as soon as the listener delivers a result; the timeout keeps
+    # time-decayed scores moving during silence.
     if st.session_state.listening:
-        time.sleep(2)
+        st.session_state.audio_queue.wait(timeout=2)
         st.rerun()
 
 else:
@@ -571,3 +794,4 @@ else:
         <div class="msg">Add subjects in the sidebar to begin observation.</div>
     </div>
     """, unsafe_allow_html=True)
+    profiler.end_run()
@@ -0,0 +1,128 @@
+
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SPEAKER ATTRIBUTION
+# ═══════════════════════════════════════════════════════════════════════════
+# identify_speaker() decides each phrase on its own. SpeakerTracker instead
+# runs an HMM forward filter over "who is talking": one state per enrolled
+# subject plus an "unknown" state, sticky transitions (a new phrase is
+# usually the same speaker, less so the longer the pause before it), and
+# emissions from temperature-scaled cosine similarity. The transition mixes
+# the belief toward uniform, pred = (1 - m) * p + m / K, with m growing from
+# SWITCH_PROB toward 1 over the pause: a long silence (or a phrase with no
+# time) falls back to the flat prior, never to one that favours everyone
+# but the last speaker. The filter state is
+# one probability per state, so each phrase costs O(subjects).
+SWITCH_PROB = 0.15         # mix toward uniform between back-to-back phrases
+MEMORY_S = 8.0             # after this much silence the prior is mostly forgotten
+TEMPERATURE = 0.05         # cosine -> logit scale; see fit_temperature
+UNKNOWN_SIMILARITY = 0.65  # evidence level of "none of the enrolled subjects"
+MIN_POSTERIOR = 0.5        # below this no subject is credited
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def emission_probs(similarities, temperature=TEMPERATURE, unknown=UNKNOWN_SIMILARITY):
+    """Softmax over [similarities..., unknown] at `temperature`."""
+    logits = np.append(similarities, unknown) / temperature
+    logits -= logits.max()
+    e = np.exp(logits)
+    return e / e.sum()
+
+
+def fit_temperature(similarities, labels, grid=np.geomspace(0.005, 0.5, 60),
+                    unknown=UNKNOWN_SIMILARITY):
+    """Temperature minimising the negative log-likelihood of labelled phrases.
+
+    similarities: (n, k) cosine scores; labels: index of the true subject,
+    or k for someone not enrolled. Evaluated over `grid` in one batch.
+    """
+    sims = np.asarray(similarities, dtype=np.float64)
+    labels = np.asarray(labels)
+    logits = np.concatenate([sims, np.full((sims.shape[0], 1), unknown)], axis=1)
+    scaled = logits[None, :, :] / grid[:, None, None]
+    scaled -= scaled.max(axis=2, keepdims=True)
+    log_z = np.log(np.exp(scaled).sum(axis=2))
+    picked = scaled[:, np.arange(sims.shape[0]), labels]
+    nll = (log_z - picked).mean(axis=1)
+    return float(grid[int(np.argmin(nll))])
+
+
+class SpeakerTracker:
+    """Online speaker posterior over the enrolled voice profiles.
+
+    Call update() once per phrase with its embedding, the current profile
+    dict and the phrase time. The profile set may change between calls;
+    the tracker re-syncs and carries over the belief for subjects it
+    already knew.
+    """
+
+    def __init__(self, switch_prob=SWITCH_PROB, memory_s=MEMORY_S,
+                 temperature=TEMPERATURE, unknown=UNKNOWN_SIMILARITY,
+                 min_posterior=MIN_POSTERIOR):
+        self.switch_prob = switch_prob
+        self.memory_s = memory_s
+        self.temperature = temperature
+        self.unknown = unknown
+        self.min_posterior = min_posterior
+        self.names = ()
+        self.posterior = np.ones(1)  # [subjects..., unknown]
+        self._matrix = np.empty((0, 0))
+        self._last_t = None
+
+    def _sync(self, profiles):
+        names = tuple(profiles)
+        if names == self.names:
+            return
+        old = dict(zip(self.names, self.posterior[:-1]))
+        self._matrix = normalize_rows(np.stack([np.asarray(profiles[n], dtype=np.float64) for n in names]))
+        prior = np.array([old.get(n, 0.0) for n in names] + [self.posterior[-1]])
+        if prior.sum() <= 0:
+            prior = np.ones(len(names) + 1)
+        self.posterior = prior / prior.sum()
+        self.names = names
+
+    def _mix(self, t):
+        """Weight of the uniform prior in the prediction, given the pause
+        before t (1.0 when there is no previous phrase or no time)."""
+        if self._last_t is None or t is None:
+            return 1.0
+        dt = max(0.0, t - self._last_t)
+        return 1.0 - (1.0 - self.switch_prob) * np.exp(-dt / self.memory_s)
+
+    def update(self, embedding, profiles, t=None):
+        """Fold in one phrase. Returns (speaker or None, posterior of speaker)."""
+        if not profiles:
+            return None, 0.0
+        self._sync(profiles)
+        emb = np.asarray(embedding, dtype=np.float64)
+        sims = self._matrix @ (emb / max(np.linalg.norm(emb), 1e-12))
+
+        # predict: keep the belief with weight 1 - m, forget it with weight m
+        p = self.posterior
+        m = self._mix(t)
+        pred = (1.0 - m) * p + m / len(p)
+        # correct
+        post = pred * emission_probs(sims, self.temperature, self.unknown)
+        total = post.sum()
+        self.posterior = post / total if total > 0 else np.full(len(p), 1.0 / len(p))
+        if t is not None:
+            self._last_t = t
+
+        best = int(np.argmax(self.posterior))
+        confidence = float(self.posterior[best])
+        if best == len(self.names) or confidence < self.min_posterior:
+            return None, 0.0
+        return self.names[best], confidence
+
+    def posteriors(self):
+        """{subject: probability} plus None for unknown."""
+        return {**dict(zip(self.names, self.posterior[:-1].tolist())), None: float(self.posterior[-1])}
+
+    def reset(self):
+        self.posterior = np.full(len(self.names) + 1, 1.0 / (len(self.names) + 1))
+        self._last_t = None
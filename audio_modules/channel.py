@@ -0,0 +1,108 @@
+
+import queue
+import asyncio
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RESULT CHANNEL
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass(slots=True)
+class ListenerResult:
+    """One transcribed phrase (or a listener error) on its way to the engine."""
+    text: str
+    speaker: str | None = None
+    confidence: float = 0.0
+    interrupted: str | None = None
+    start: float | None = None   # voiced span, listener clock (see speech_bounds)
+    end: float | None = None
+    timing: dict | None = None   # per-stage perf_counter stamps (logic.telemetry)
+    error: bool = False          # text is an [STT ERROR ...]/[AUDIO ERROR ...] note
+    seq: int = 0                 # assigned by ResultChannel.put, monotonic
+
+
+class ResultChannel:
+    """Thread-safe FIFO of ListenerResults with blocking, batch and asyncio reads.
+
+    With maxsize > 0 the channel is bounded: when full, the oldest item is
+    dropped so the dashboard always sees the freshest speech, and `dropped`
+    counts the losses. Raises queue.Empty like queue.Queue on timeouts.
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._seq = itertools.count(1)
+        self._waiters = []  # (loop, future) of pending async readers
+
+    def put(self, item):
+        with self._cond:
+            item.seq = next(self._seq)
+            if self.maxsize and len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+            waiters, self._waiters = self._waiters, []
+        for loop, fut in waiters:
+            loop.call_soon_threadsafe(_resolve, fut)
+        return item.seq
+
+    def get(self, block=True, timeout=None):
+        with self._cond:
+            if not block:
+                if not self._items:
+                    raise queue.Empty
+            elif not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._items.popleft()
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def get_many(self, max_n, timeout=None):
+        """Up to max_n items. Waits up to `timeout` for the first one
+        (0 = don't wait, None = forever); returns [] on timeout."""
+        with self._cond:
+            if timeout != 0 and not self._items:
+                self._cond.wait_for(lambda: self._items, timeout)
+            n = min(max_n, len(self._items))
+            return [self._items.popleft() for _ in range(n)]
+
+    def wait(self, timeout=None):
+        """Block until an item is available, without consuming it."""
+        with self._cond:
+            return bool(self._cond.wait_for(lambda: self._items, timeout))
+
+    async def aget(self):
+        return (await self.aget_many(1))[0]
+
+    async def aget_many(self, max_n):
+        """Awaitable get_many: resolves as soon as at least one item exists."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._items:
+                    n = min(max_n, len(self._items))
+                    return [self._items.popleft() for _ in range(n)]
+                fut = loop.create_future()
+                self._waiters.append((loop, fut))
+            await fut
+
+    def empty(self):
+        return not self._items
+
+    def qsize(self):
+        return len(self._items)
+
+    __len__ = qsize
+
+
+def _resolve(fut):
+    if not fut.done():
+        fut.set_result(None)
@@ -0,0 +1,121 @@
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  EMBEDDING CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+CACHE_DIR = os.environ.get(
+    "GLM_EMBED_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "group-leader-model", "embeddings"),
+)
+MAX_ENTRIES = int(os.environ.get("GLM_EMBED_CACHE_SIZE", "4096"))  # 0 disables
+ENCODER_TAG = b"resemblyzer-cpu-v1"  # bump to invalidate every cached entry
+
+
+def fingerprint(wav):
+    """Fast content hash of preprocessed PCM samples."""
+    samples = np.ascontiguousarray(wav, dtype=np.float32)
+    h = hashlib.blake2b(ENCODER_TAG, digest_size=16)
+    h.update(samples)
+    return h.hexdigest()
+
+
+class EmbeddingCache:
+    """Bounded on-disk LRU of embeddings, one .npy file per fingerprint.
+
+    Recency is persisted through file mtimes so the eviction order
+    survives restarts. Safe to share between the listener thread and
+    the Streamlit script.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # key -> loaded array or None
+        if max_entries > 0:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_index()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".npy")
+
+    def _load_index(self):
+        entries = []
+        for fname in os.listdir(self.cache_dir):
+            if not fname.endswith(".npy"):
+                continue
+            try:
+                mtime = os.stat(os.path.join(self.cache_dir, fname)).st_mtime
+            except OSError:
+                continue
+            entries.append((mtime, fname[:-4]))
+        for _, key in sorted(entries):
+            self._index[key] = None
+        self._evict()
+
+    def _evict(self):
+        while len(self._index) > self.max_entries:
+            key, _ = self._index.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, key):
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            emb = self._index[key]
+            if emb is None:
+                try:
+                    emb = np.load(self._path(key))
+                except (OSError, ValueError):
+                    del self._index[key]
+                    self.misses += 1
+                    return None
+                self._index[key] = emb
+            self._index.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return emb
+
+    def put(self, key, embedding):
+        if self.max_entries <= 0:
+            return
+        emb = np.asarray(embedding, dtype=np.float32)
+        tmp = self._path(key) + f".{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                np.save(f, emb)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return
+        with self._lock:
+            self._index[key] = emb
+            self._index.move_to_end(key)
+            self._evict()
+
+    def __len__(self):
+        return len(self._index)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
@@ -0,0 +1,116 @@
+
+import os
+import time
+import numpy as np
+import speech_recognition as sr
+from .listener import AudioListener
+from .channel import ListenerResult
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FILE INGESTION
+# ═══════════════════════════════════════════════════════════════════════════
+AUDIO_EXTENSIONS = (".wav", ".flac", ".aif", ".aiff")
+
+
+def find_audio_files(paths):
+    """Expand files and directories into a sorted list of recordings."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for fname in files:
+                    if fname.lower().endswith(AUDIO_EXTENSIONS):
+                        found.append(os.path.join(root, fname))
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+def _rms(audio):
+    samples = np.frombuffer(audio.get_raw_data(convert_width=2), dtype=np.int16)
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))
+
+
+class _ClockedStream:
+    """Wraps an AudioFile stream to track (and optionally pace) audio time."""
+
+    def __init__(self, stream, bytes_per_sec, realtime):
+        self._stream = stream
+        self._bytes_per_sec = bytes_per_sec
+        self._realtime = realtime
+        self._start = time.perf_counter()
+        self.bytes_read = 0
+        self.exhausted = False
+
+    @property
+    def position(self):
+        """Seconds of audio consumed so far."""
+        return self.bytes_read / self._bytes_per_sec
+
+    def read(self, size=-1):
+        buf = self._stream.read(size)
+        if not buf:
+            self.exhausted = True
+            return buf
+        self.bytes_read += len(buf)
+        if self._realtime:
+            ahead = self.position - (time.perf_counter() - self._start)
+            if ahead > 0:
+                time.sleep(ahead)
+        return buf
+
+
+class FileListener(AudioListener):
+    """AudioListener fed from recordings instead of a microphone.
+
+    Files are streamed back to back through the same segmentation, speaker
+    ID and STT path as live capture. With realtime=False audio is consumed as
+    fast as the pipeline allows. Interruption timing uses the audio clock, so
+    results do not depend on playback speed.
+    """
+
+    def __init__(self, result_queue, encoder, profiles, paths, realtime=False):
+        super().__init__(result_queue, encoder, profiles)
+        self.paths = find_audio_files(paths)
+        self.realtime = realtime
+        self.error_backoff = 2.0 if realtime else 0.0
+        self.audio_seconds = 0.0
+        self.phrases = 0
+
+    def _listen_loop(self):
+        recognizer = sr.Recognizer()
+        recognizer.dynamic_energy_threshold = True
+        recognizer.pause_threshold = 0.8
+
+        offset = 0.0  # audio time at the start of the current file
+        for path in self.paths:
+            if self._stop_event.is_set():
+                break
+            try:
+                source = sr.AudioFile(path)
+                with source:
+                    stream = _ClockedStream(
+                        source.stream,
+                        source.SAMPLE_RATE * source.SAMPLE_WIDTH,
+                        self.realtime,
+                    )
+                    source.stream = stream
+                    while not self._stop_event.is_set() and not stream.exhausted:
+                        audio = recognizer.listen(source, phrase_time_limit=10)
+                        # At end of file listen() returns whatever is left,
+                        # which is usually trailing room tone.
+                        if stream.exhausted and _rms(audio) <= recognizer.energy_threshold:
+                            break
+                        self.phrases += 1
+                        try:
+                            self._process_audio(recognizer, audio, offset + stream.position)
+                        except Exception as e:
+                            print(f"Listener Error: {e}")
+                    offset += stream.position
+            except (ValueError, OSError, EOFError) as e:
+                self.result_queue.put(ListenerResult(
+                    f"[AUDIO ERROR: {os.path.basename(path)}: {e}]", error=True,
+                ))
+            self.audio_seconds = offset
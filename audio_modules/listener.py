@@ -2,14 +2,55 @@
 import threading
 import queue
 import time
+import numpy as np
 import speech_recognition as sr
-from .voice import audio_to_numpy, identify_speaker, preprocess_wav
+from .voice import audio_to_numpy, embed_utterance, preprocess_wav
+from .attribution import SpeakerTracker
+from .channel import ListenerResult
+from .vad import VoiceActivityGate
+from logic.telemetry import stamp
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SPEECH BOUNDS
+# ═══════════════════════════════════════════════════════════════════════════
+BOUNDS_FRAME_S = 0.02
+BOUNDS_PEAK_RATIO = 0.1  # frames this far below the phrase peak count as silence
+
+
+def speech_bounds(recognizer, audio, now):
+    """(start, end) of the voiced part of a captured phrase, on `now`'s clock.
+
+    listen() returns after pause_threshold of silence and drops all but
+    non_speaking_duration of it, so the audio ends a little before `now`.
+    Within the audio, the first and last frames above the energy threshold
+    (capped relative to the phrase peak, since the dynamic threshold keeps
+    rising while someone speaks) mark the speech.
+    """
+    samples = np.frombuffer(audio.get_raw_data(convert_width=2), dtype=np.int16)
+    audio_end = now - max(0.0, recognizer.pause_threshold - recognizer.non_speaking_duration)
+    audio_start = audio_end - samples.size / audio.sample_rate
+    frame = max(1, int(audio.sample_rate * BOUNDS_FRAME_S))
+    n = samples.size // frame
+    if n == 0:
+        return audio_start, audio_end
+    frames = samples[:n * frame].reshape(n, frame).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    threshold = min(recognizer.energy_threshold, BOUNDS_PEAK_RATIO * rms.max())
+    voiced = np.flatnonzero(rms > threshold)
+    if voiced.size == 0:
+        return audio_start, audio_end
+    frame_s = frame / audio.sample_rate
+    return (
+        audio_start + int(voiced[0]) * frame_s,
+        audio_start + int(voiced[-1] + 1) * frame_s,
+    )
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 #  AUDIO LISTENER
 # ═══════════════════════════════════════════════════════════════════════════
 class AudioListener:
-    def __init__(self, result_queue, encoder, profiles):
+    def __init__(self, result_queue, encoder, profiles, profiler=None):
         self.result_queue = result_queue
         self.encoder = encoder
         self.profiles = profiles
@@ -17,6 +58,10 @@ class AudioListener:
         self._thread = None
         self._prev_speaker = None
         self._prev_speaker_time = 0.0
+        self.error_backoff = 2.0  # seconds to wait after an STT request error
+        self.profiler = profiler  # SessionProfiler; may be swapped while running
+        self.gate = VoiceActivityGate()  # set to None to send every phrase on
+        self.tracker = SpeakerTracker()  # smoothed speaker posteriors across phrases
 
     def start(self):
         self._stop_event.clear()
@@ -39,75 +84,122 @@ class AudioListener:
         # (Not implemented here to keep it simple, but good for Phase 2b)
 
         try:
-            mic = sr.Microphone()
+            mic = self.open_source()
             with mic as source:
                 recognizer.adjust_for_ambient_noise(source, duration=1)
         except OSError:
-            self.result_queue.put("[AUDIO ERROR: No microphone found]")
+            self.result_queue.put(ListenerResult("[AUDIO ERROR: No microphone found]", error=True))
             return
 
         while not self._stop_event.is_set():
+            profiler = self.profiler
+            profile = profiler.start_thread_profile() if profiler else None
             try:
                 with mic as source:
                     # Listen for up to 10 seconds of speech, timeout after 3s of silence
                     audio = recognizer.listen(source, timeout=3, phrase_time_limit=10)
-                
-                speaker = None
-                confidence = 0.0
-                
-                # 1. Identify Speaker
-                if self.encoder is not None and self.profiles:
-                    try:
-                        wav_np = audio_to_numpy(audio)
-                        processed = preprocess_wav(wav_np, source_sr=16000)
-                        embedding = self.encoder.embed_utterance(processed)
-                        speaker, confidence = identify_speaker(
-                            embedding, self.profiles
-                        )
-                    except Exception:
-                        pass # Silently fail on embedding errors
-
-                # 2. Convert to Text
-                try:
-                    text = recognizer.recognize_google(audio)
-                except sr.UnknownValueError:
-                    continue # Speech was unintelligible
-                except sr.RequestError as e:
-                    self.result_queue.put({
-                        "speaker": None, "confidence": 0.0,
-                        "text": f"[STT ERROR: {e}]", "interrupted": None,
-                    })
-                    time.sleep(2)
-                    continue
-
-                if not text:
-                    continue
-
-                # 3. Detect Interruption (Simple Logic)
-                interrupted_person = None
-                now = time.time()
-                # If speaker changed quickly (within 2.5s), assume interruption
-                if (
-                    speaker is not None
-                    and self._prev_speaker is not None
-                    and speaker != self._prev_speaker
-                    and (now - self._prev_speaker_time) < 2.5
-                ):
-                    interrupted_person = self._prev_speaker
-                
-                self._prev_speaker = speaker
-                self._prev_speaker_time = now
-
-                self.result_queue.put({
-                    "speaker": speaker,
-                    "confidence": confidence,
-                    "text": text,
-                    "interrupted": interrupted_person,
-                })
-
+                timing = {}
+                stamp(timing, "capture")
+                self._process_audio(recognizer, audio, time.time(), timing)
             except sr.WaitTimeoutError:
+                self.on_silence(time.time())
                 continue # Just loop back if no speech heard
             except Exception as e:
                 # Catch-all for other audio errors to keep thread alive
                 print(f"Listener Error: {e}")
                 continue
+            finally:
+                if profile is not None:
+                    profile.disable()
+                    profiler.add_profile(profile)
+
+    # ── Hooks (overridden by per-channel listeners, see multichannel.py) ──
+    def open_source(self):
+        """The sr.AudioSource to capture from."""
+        return sr.Microphone()
+
+    def on_silence(self, now):
+        """listen() timed out with no speech up to `now`."""
+
+    def identify(self, audio, now, timing):
+        """(speaker, confidence) for a phrase; (None, 0.0) if unknown."""
+        if self.encoder is None or not self.profiles:
+            return None, 0.0
+        speaker, confidence = None, 0.0
+        try:
+            wav_np = audio_to_numpy(audio)
+            processed = preprocess_wav(wav_np, source_sr=16000)
+            embedding = embed_utterance(self.encoder, processed)
+            speaker, confidence = self.tracker.update(embedding, self.profiles, now)
+        except Exception:
+            pass # Silently fail on embedding errors
+        stamp(timing, "embed")
+        return speaker, confidence
+
+    def detect_interruption(self, speaker, now):
+        """Name of the speaker `speaker` cut off, if any."""
+        interrupted_person = None
+        # If speaker changed quickly (within 2.5s), assume interruption
+        if (
+            speaker is not None
+            and self._prev_speaker is not None
+            and speaker != self._prev_speaker
+            and (now - self._prev_speaker_time) < 2.5
+        ):
+            interrupted_person = self._prev_speaker
+
+        self._prev_speaker = speaker
+        self._prev_speaker_time = now
+        return interrupted_person
+
+    def _process_audio(self, recognizer, audio, now, timing=None):
+        """Speaker ID -> STT -> interruption check for one captured phrase.
+
+        `now` is the phrase end time on the listener's clock (wall time for
+        the microphone, audio time for file ingestion). `timing` collects
+        per-stage latency stamps and travels with the result.
+        """
+        if timing is None:
+            timing = {}
+            stamp(timing, "capture")
+        gate = self.gate
+        if gate is not None and not gate.accept(audio):
+            return  # silence or noise: skip speaker ID and STT
+        t0 = time.perf_counter()
+
+        # 1. Identify Speaker
+        speaker, confidence = self.identify(audio, now, timing)
+
+        # 2. Convert to Text
+        try:
+            text = recognizer.recognize_google(audio)
+        except sr.UnknownValueError:
+            if gate is not None:
+                gate.record_cost(time.perf_counter() - t0)
+            return # Speech was unintelligible
+        except sr.RequestError as e:
+            self.result_queue.put(ListenerResult(f"[STT ERROR: {e}]", error=True))
+            time.sleep(self.error_backoff)
+            return
+
+        stamp(timing, "stt")
+        if gate is not None:
+            gate.record_cost(time.perf_counter() - t0)
+        if not text:
+            return
+
+        start, end = speech_bounds(recognizer, audio, now)
+
+        # 3. Detect Interruption
+        interrupted_person = self.detect_interruption(speaker, now)
+
+        stamp(timing, "enqueue")
+        self.result_queue.put(ListenerResult(
+            text,
+            speaker=speaker,
+            confidence=confidence,
+            interrupted=interrupted_person,
+            start=start,
+            end=end,
+            timing=timing,
+        ))
@@ -0,0 +1,442 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+import numpy as np
+import speech_recognition as sr
+from .attribution import SpeakerTracker
+from .listener import AudioListener
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MULTI-MICROPHONE CAPTURE
+# ═══════════════════════════════════════════════════════════════════════════
+# One AudioListener per input channel: either a separate device (one USB
+# table mic per participant) or one channel of a multichannel interface.
+# A channel mapped to a subject skips speaker ID entirely; unmapped
+# channels fall back to voice embeddings over the unmapped subjects.
+#
+# Each channel runs its own capture -> VAD -> STT thread, so phrases finish
+# out of order. ChannelMerger holds them until every channel has moved past
+# their end time, then emits one stream ordered by end time (the order a
+# single listener delivers in), dropping cross-talk and marking
+# interruptions from cross-channel overlap on the way.
+MAX_HOLD_S = 4.0           # emit regardless once a phrase is this old
+RECENT_S = 15.0            # emitted phrases kept for overlap checks
+CROSSTALK_OVERLAP = 0.5    # time overlap (intersection / union) of a bleed pair
+CROSSTALK_DB = 6.0         # a bleed copy is at least this much quieter
+DEVICE_BUFFER_S = 5.0      # per-channel audio held for a listener that falls behind
+
+
+@dataclass(slots=True)
+class MicChannel:
+    """An input: `device` index, optional `channel` of a multichannel
+    device (None = the device's mono input) and the subject it belongs to."""
+    device: int | None = None
+    channel: int | None = None
+    subject: str | None = None
+
+    @property
+    def label(self):
+        dev = "default" if self.device is None else f"dev {self.device}"
+        return dev if self.channel is None else f"{dev} ch {self.channel}"
+
+
+def list_inputs():
+    """[(label, MicChannel)] for every input device and channel; [] without PyAudio."""
+    try:
+        pa = sr.Microphone.get_pyaudio().PyAudio()
+    except (AttributeError, OSError):
+        return []
+    inputs = []
+    try:
+        for i in range(pa.get_device_count()):
+            info = pa.get_device_info_by_index(i)
+            n = int(info.get("maxInputChannels", 0))
+            if n < 1:
+                continue
+            inputs.append((f"{info['name']}", MicChannel(i)))
+            if n > 1:
+                inputs.extend((f"{info['name']} · ch {c + 1}", MicChannel(i, c)) for c in range(n))
+    finally:
+        pa.terminate()
+    return inputs
+
+
+def level_db(audio):
+    """RMS level of an sr.AudioData phrase in dBFS."""
+    samples = np.frombuffer(audio.get_raw_data(convert_width=2), dtype=np.int16)
+    if samples.size == 0:
+        return -120.0
+    rms = np.sqrt(np.mean(samples.astype(np.float32) ** 2))
+    return float(20 * np.log10(max(rms, 1e-6) / 32768.0))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MULTICHANNEL DEVICES
+# ═══════════════════════════════════════════════════════════════════════════
+class _ChannelStream:
+    """Blocking byte FIFO with the read(frames) interface listen() expects."""
+
+    def __init__(self, sample_width, max_bytes):
+        self._buf = bytearray()
+        self._cond = threading.Condition()
+        self._width = sample_width
+        self._max = max_bytes
+        self.closed = False
+
+    def feed(self, data):
+        with self._cond:
+            self._buf += data
+            if len(self._buf) > self._max:
+                del self._buf[:len(self._buf) - self._max]  # listener fell behind
+            self._cond.notify()
+
+    def read(self, size):
+        n = size * self._width
+        with self._cond:
+            while len(self._buf) < n and not self.closed:
+                self._cond.wait()
+            if self.closed:
+                raise OSError("input device closed")
+            data = bytes(self._buf[:n])
+            del self._buf[:n]
+        return data
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class ChannelSource(sr.AudioSource):
+    """One channel of a DeviceChannels capture, usable with sr.Recognizer."""
+
+    def __init__(self, device, index):
+        self.device = device
+        self.index = index
+        self.SAMPLE_RATE = device.sample_rate  # known once the device is open
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = device.chunk
+        self.stream = None
+
+    def __enter__(self):
+        self.device.start()
+        self.SAMPLE_RATE = self.device.sample_rate
+        self.stream = self.device.streams[self.index]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None  # the device keeps capturing for the other channels
+
+
+class DeviceChannels:
+    """Captures every channel of one input device and splits the
+    interleaved frames into per-channel streams."""
+
+    def __init__(self, device_index, n_channels, sample_rate=None, chunk=1024):
+        self.device_index = device_index
+        self.n_channels = n_channels
+        self.chunk = chunk
+        self.sample_rate = sample_rate
+        self.streams = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def source(self, index):
+        return ChannelSource(self, index)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            pyaudio = sr.Microphone.get_pyaudio()
+            self._pa = pyaudio.PyAudio()
+            if self.sample_rate is None:
+                info = self._pa.get_device_info_by_index(self.device_index)
+                self.sample_rate = int(info["defaultSampleRate"])
+            self._stream = self._pa.open(
+                input_device_index=self.device_index, channels=self.n_channels,
+                format=pyaudio.paInt16, rate=self.sample_rate,
+                frames_per_buffer=self.chunk, input=True,
+            )
+            max_bytes = int(DEVICE_BUFFER_S * self.sample_rate) * 2
+            self.streams = [_ChannelStream(2, max_bytes) for _ in range(self.n_channels)]
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop_event.is_set():
+                self.split(self._stream.read(self.chunk, exception_on_overflow=False))
+        finally:
+            for stream in self.streams:
+                stream.close()
+            self._stream.close()
+            self._pa.terminate()
+
+    def split(self, data):
+        """Feed one buffer of interleaved int16 frames to the channel streams."""
+        frames = np.frombuffer(data, dtype=np.int16).reshape(-1, self.n_channels)
+        for c, stream in enumerate(self.streams):
+            stream.feed(frames[:, c].tobytes())
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MERGER
+# ═══════════════════════════════════════════════════════════════════════════
+class ChannelMerger:
+    """Orders per-channel results into `out` (a ResultChannel).
+
+    A channel that is transcribing a phrase holds back everything that
+    ended after the phrase began; an idle channel holds back nothing, as
+    anything it captures later will end later. MAX_HOLD_S bounds the wait
+    when a channel's STT request stalls.
+    """
+
+    def __init__(self, out, hold_s=MAX_HOLD_S, clock=time.time):
+        self.out = out
+        self.hold_s = hold_s
+        self.clock = clock
+        self.emitted = 0
+        self.bleed = 0         # cross-talk copies dropped
+        self.late = 0          # emitted after a later phrase (stalled channel)
+        self.interruptions = 0
+        self._lock = threading.Lock()
+        self._pending = []     # heap of (end, n, channel, level, result)
+        self._busy = {}        # channel -> earliest end of its in-flight phrase
+        self._recent = deque() # (channel, speaker, start, end, level), emitted
+        self._n = itertools.count()
+        self._last_end = float("-inf")
+
+    def busy(self, channel, t):
+        with self._lock:
+            self._busy[channel] = t
+
+    def idle(self, channel):
+        with self._lock:
+            self._busy.pop(channel, None)
+            self._release()
+
+    def push(self, channel, result, level=0.0):
+        with self._lock:
+            if result.error or result.end is None:
+                self.out.put(result)
+                return
+            heapq.heappush(self._pending, (result.end, next(self._n), channel, level, result))
+            self._release()
+
+    def flush(self):
+        """Emit everything pending (e.g. after the listeners stop)."""
+        with self._lock:
+            self._release(force=True)
+
+    def _release(self, force=False):
+        now = self.clock()
+        watermark = min(self._busy.values(), default=now)
+        pending = self._pending
+        while pending and (force or pending[0][0] <= watermark or pending[0][0] < now - self.hold_s):
+            end, _, channel, level, result = heapq.heappop(pending)
+            if self._is_bleed(channel, result, level):
+                self.bleed += 1
+                continue
+            self._mark_interruption(channel, result)
+            if end < self._last_end:
+                self.late += 1
+            self._last_end = max(self._last_end, end)
+            recent = self._recent
+            recent.append((channel, result.speaker, result.start, end, level))
+            while recent and recent[0][3] < end - RECENT_S:
+                recent.popleft()
+            self.emitted += 1
+            self.out.put(result)
+
+    def _is_bleed(self, channel, result, level):
+        """True if a louder phrase on another channel covers the same span."""
+        start, end = result.start, result.end
+        others = [(c, s, e, lv) for c, _, s, e, lv in self._recent]
+        others += [(c, r.start, r.end, lv) for _, _, c, lv, r in self._pending]
+        for c, s, e, lv in others:
+            if c == channel or lv < level + CROSSTALK_DB:
+                continue
+            inter = min(end, e) - max(start, s)
+            if inter > 0 and inter / (max(end, e) - min(start, s)) >= CROSSTALK_OVERLAP:
+                return True
+        return False
+
+    def _mark_interruption(self, channel, result):
+        """Speaker B interrupts A when B starts while A is talking and A
+        stops before B does. Overlaps B doesn't outlast (backchannel,
+        "mm-hm") are not interruptions."""
+        speaker = result.speaker
+        if speaker is None or result.interrupted is not None:
+            return
+        best = None
+        for c, other, s, e, _ in self._recent:
+            if c == channel or other is None or other == speaker:
+                continue
+            if s < result.start < e < result.end and (best is None or s > best[0]):
+                best = (s, other)
+        if best is not None:
+            result.interrupted = best[1]
+            self.interruptions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "emitted": self.emitted,
+                "pending": len(self._pending),
+                "bleed": self.bleed,
+                "late": self.late,
+                "interruptions": self.interruptions,
+            }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  LISTENERS
+# ═══════════════════════════════════════════════════════════════════════════
+class _Inlet:
+    """Stands in for a listener's result queue and forwards to the merger."""
+
+    def __init__(self, merger, listener):
+        self.merger = merger
+        self.listener = listener
+
+    def put(self, result):
+        self.merger.push(self.listener.index, result, self.listener.level)
+
+
+class OpenProfiles(Mapping):
+    """Live view of the profiles of subjects without a mic of their own.
+
+    Reads through to the app's profile dict, so a subject enrolled while
+    recording is matched on the unmapped channels from the next phrase.
+    """
+
+    def __init__(self, profiles, mapped):
+        self._profiles = profiles
+        self._mapped = frozenset(mapped)
+
+    def __getitem__(self, name):
+        if name in self._mapped:
+            raise KeyError(name)
+        return self._profiles[name]
+
+    def __iter__(self):
+        # list() copies in one step, so enrolling from another thread is safe
+        return (name for name in list(self._profiles) if name not in self._mapped)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class ChannelListener(AudioListener):
+    """AudioListener for one MicChannel, reporting into a ChannelMerger."""
+
+    def __init__(self, index, spec, merger, encoder, profiles, source=None):
+        super().__init__(None, encoder, profiles)
+        self.result_queue = _Inlet(merger, self)
+        self.index = index
+        self.spec = spec
+        self.merger = merger
+        self.level = 0.0
+        self._source = source
+
+    def open_source(self):
+        if self._source is not None:
+            return self._source
+        return sr.Microphone(device_index=self.spec.device)
+
+    def on_silence(self, now):
+        self.merger.idle(self.index)
+
+    def identify(self, audio, now, timing):
+        if self.spec.subject is not None:
+            return self.spec.subject, 1.0  # the mic says who it is
+        return super().identify(audio, now, timing)
+
+    def detect_interruption(self, speaker, now):
+        if self.spec.subject is not None:
+            return None  # one voice per mic: the merger compares channels
+        return super().detect_interruption(speaker, now)  # shared mic: speaker changes
+
+    def _process_audio(self, recognizer, audio, now, timing=None):
+        self.merger.busy(self.index, now - len(audio.frame_data) / (audio.sample_rate * audio.sample_width))
+        try:
+            self.level = level_db(audio)
+            super()._process_audio(recognizer, audio, now, timing)
+        finally:
+            self.merger.idle(self.index)
+
+
+class MultiMicListener:
+    """Runs one ChannelListener per MicChannel and merges their results
+    into `result_queue`. Drop-in for AudioListener in the app."""
+
+    def __init__(self, result_queue, encoder, profiles, channels, profiler=None):
+        self.merger = ChannelMerger(result_queue)
+        mapped = {spec.subject for spec in channels if spec.subject}
+        # unmapped mics only need to tell apart the subjects without one
+        open_profiles = OpenProfiles(profiles, mapped)
+        devices = {}
+        for spec in channels:
+            if spec.channel is not None:
+                n = devices.get(spec.device, 0)
+                devices[spec.device] = max(n, spec.channel + 1)
+        self.devices = {d: DeviceChannels(d, n) for d, n in devices.items()}
+        self.listeners = []
+        for i, spec in enumerate(channels):
+            source = self.devices[spec.device].source(spec.channel) if spec.channel is not None else None
+            self.listeners.append(ChannelListener(
+                i, spec, self.merger, None if spec.subject else encoder, open_profiles, source,
+            ))
+        self.profiler = profiler
+        unmapped = [l for l in self.listeners if l.spec.subject is None]
+        self.tracker = unmapped[0].tracker if unmapped else SpeakerTracker()
+        self.gate = None  # one per channel; see stats()
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        self._profiler = profiler
+        for listener in self.listeners:
+            listener.profiler = profiler
+
+    def start(self):
+        for listener in self.listeners:
+            listener.start()
+
+    def stop(self):
+        for listener in self.listeners:
+            listener.stop()
+        for device in self.devices.values():
+            device.stop()
+        self.merger.flush()
+
+    @property
+    def running(self):
+        return any(listener.running for listener in self.listeners)
+
+    def stats(self):
+        return {
+            **self.merger.stats(),
+            "channels": [
+                {
+                    "label": l.spec.label,
+                    "subject": l.spec.subject,
+                    "running": l.running,
+                    "level_db": round(l.level, 1),
+                    "gate": l.gate.stats() if l.gate else None,
+                }
+                for l in self.listeners
+            ],
+        }
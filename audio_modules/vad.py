@@ -0,0 +1,135 @@
+
+import threading
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  VOICE ACTIVITY GATE
+# ═══════════════════════════════════════════════════════════════════════════
+# recognizer.listen() hands back anything louder than its energy threshold:
+# coughs, keyboard clatter, HVAC swells. The gate looks at each captured
+# phrase before speaker ID and STT and drops the ones with too little
+# speech-like audio in them.
+#
+# Per 20 ms frame (Hann-windowed, one batched rfft per phrase, written into
+# a preallocated spectrum buffer where numpy supports rfft(out=...)):
+#   energy    dB above the gate's noise floor
+#   flatness  geometric / arithmetic mean of the power spectrum; ~1 for
+#             broadband noise, well below that for voiced speech
+#   band      share of power in the 100-4000 Hz speech band
+# A frame is voiced when all three pass; a phrase needs MIN_VOICED_S of
+# voiced frames.
+FRAME_S = 0.02
+SPEECH_BAND_HZ = (100.0, 4000.0)
+ENERGY_MARGIN_DB = 9.0     # above the noise floor
+FLATNESS_MAX = 0.45
+BAND_RATIO_MIN = 0.6
+MIN_VOICED_S = 0.15
+FLOOR_PERCENTILE = 10      # quietest frames of a phrase approximate the room
+FLOOR_ADAPT = 0.1          # EMA weight of each phrase's floor estimate
+INITIAL_FLOOR_DB = -60.0   # dBFS
+BUFFER_SECONDS = 12.0      # preallocated; grows if a phrase is longer
+_EPS = 1e-12
+_RFFT_OUT = np.lib.NumpyVersion(np.__version__) >= "2.0.0"  # rfft(out=) and float32 FFTs
+
+
+class VoiceActivityGate:
+    """Decides whether a captured phrase is worth embedding and transcribing.
+
+    Scratch buffers are allocated for BUFFER_SECONDS at the current sample
+    rate and reused across phrases. accept() is called from one listener
+    thread; stats() may be read from any thread.
+    """
+
+    def __init__(self, frame_s=FRAME_S, buffer_seconds=BUFFER_SECONDS):
+        self.frame_s = frame_s
+        self.buffer_seconds = buffer_seconds
+        self.floor_db = INITIAL_FLOOR_DB
+        self.segments = 0
+        self.rejected = 0
+        self.rejected_audio_s = 0.0
+        self._cost_n = 0
+        self._cost_mean = 0.0
+        self._lock = threading.Lock()
+        self._rate = None
+
+    def _allocate(self, rate, n_samples):
+        frame = max(1, int(rate * self.frame_s))
+        n_frames = max(1, n_samples // frame)
+        self._rate = rate
+        self._frame = frame
+        self._samples = np.empty(n_frames * frame, dtype=np.float32)
+        self._windowed = np.empty((n_frames, frame), dtype=np.float32)
+        self._power = np.empty((n_frames, frame // 2 + 1), dtype=np.float32)
+        self._spectrum = np.empty((n_frames, frame // 2 + 1), dtype=np.complex64)
+        self._window = np.hanning(frame).astype(np.float32)
+        freqs = np.fft.rfftfreq(frame, 1.0 / rate)
+        self._band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+
+    def frame_features(self, samples, rate):
+        """(energy_db, flatness, band_ratio) per frame of int16 `samples`."""
+        frame = max(1, int(rate * self.frame_s))
+        n = samples.size // frame
+        if self._rate != rate or n * frame > self._samples.size:
+            self._allocate(rate, max(n * frame, int(rate * self.buffer_seconds)))
+        if n == 0:
+            empty = np.empty(0, dtype=np.float32)
+            return empty, empty, empty
+        x = self._samples[:n * frame]
+        np.multiply(samples[:n * frame], 1.0 / 32768.0, out=x, casting="unsafe")
+        frames = x.reshape(n, frame)
+        windowed = self._windowed[:n]
+        np.multiply(frames, self._window, out=windowed)
+        power = self._power[:n]
+        if _RFFT_OUT:
+            spectrum = np.fft.rfft(windowed, axis=1, out=self._spectrum[:n])
+        else:
+            spectrum = np.fft.rfft(windowed, axis=1)
+        np.abs(spectrum, out=power, casting="unsafe")
+        np.square(power, out=power)
+        power += _EPS
+
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + _EPS)
+        total = power.sum(axis=1)
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / (total / power.shape[1])
+        band_ratio = power[:, self._band].sum(axis=1) / total
+        return energy_db, flatness, band_ratio
+
+    def accept(self, audio):
+        """True if the sr.AudioData phrase contains enough speech."""
+        samples = np.frombuffer(audio.get_raw_data(convert_width=2), dtype=np.int16)
+        rate = audio.sample_rate
+        energy_db, flatness, band_ratio = self.frame_features(samples, rate)
+        voiced_s = 0.0
+        if energy_db.size:
+            voiced = (
+                (energy_db > self.floor_db + ENERGY_MARGIN_DB)
+                & (flatness < FLATNESS_MAX)
+                & (band_ratio > BAND_RATIO_MIN)
+            )
+            voiced_s = np.count_nonzero(voiced) * self._frame / rate
+            floor = float(np.percentile(energy_db, FLOOR_PERCENTILE))
+            self.floor_db += FLOOR_ADAPT * (floor - self.floor_db)
+        ok = voiced_s >= MIN_VOICED_S
+        with self._lock:
+            self.segments += 1
+            if not ok:
+                self.rejected += 1
+                self.rejected_audio_s += samples.size / rate
+        return ok
+
+    def record_cost(self, seconds):
+        """Report the downstream (embed + STT) time of an accepted phrase."""
+        with self._lock:
+            self._cost_n += 1
+            self._cost_mean += (seconds - self._cost_mean) / self._cost_n
+
+    def stats(self):
+        with self._lock:
+            return {
+                "segments": self.segments,
+                "rejected": self.rejected,
+                "rejected_audio_s": round(self.rejected_audio_s, 2),
+                "mean_cost_s": round(self._cost_mean, 4),
+                "saved_s": round(self.rejected * self._cost_mean, 2),
+                "noise_floor_db": round(self.floor_db, 1),
+            }
@@ -4,7 +4,9 @@ import random
 import io
 import wave
 import struct
+import threading
 import numpy as np
+from .embedding_cache import EmbeddingCache, fingerprint
 
 try:
     from resemblyzer import VoiceEncoder, preprocess_wav
@@ -65,6 +67,30 @@ def load_voice_encoder():
     return None
 
 
+_cache_lock = threading.Lock()
+_default_cache = None
+
+
+def get_embedding_cache():
+    """Process-wide embedding cache shared by the listener and enrollment."""
+    global _default_cache
+    with _cache_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache()
+        return _default_cache
+
+
+def embed_utterance(encoder, processed_wav, cache=None):
+    """Embed preprocessed audio, skipping the encoder for audio seen before."""
+    cache = get_embedding_cache() if cache is None else cache
+    key = fingerprint(processed_wav)
+    embedding = cache.get(key)
+    if embedding is None:
+        embedding = encoder.embed_utterance(processed_wav)
+        cache.put(key, embedding)
+    return embedding
+
+
 def audio_to_numpy(audio_data):
     """Convert SpeechRecognition AudioData to numpy array for Resemblyzer."""
     wav_bytes = audio_data.get_wav_data(convert_rate=16000, convert_width=2)
@@ -0,0 +1,44 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare results/base.json results/head.json --threshold 0.10
+
+Exits non-zero if any shared benchmark got slower by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def compare(base, head, threshold):
+    """Yield (name, base_s, head_s, ratio, regressed) for shared benchmarks."""
+    for name in sorted(set(base["results"]) & set(head["results"])):
+        b = base["results"][name]["median_s"]
+        h = head["results"][name]["median_s"]
+        ratio = h / b if b else float("inf")
+        yield name, b, h, ratio, ratio > 1 + threshold
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown fraction (default 0.10)")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    print(f"{'benchmark':<42}{'base ms':>12}{'head ms':>12}{'ratio':>9}")
+    regressions = 0
+    for name, b, h, ratio, regressed in compare(base, head, args.threshold):
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<42}{b * 1e3:12.3f}{h * 1e3:12.3f}{ratio:9.2f}{flag}")
+        regressions += regressed
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Load test for the engine service: event throughput and dashboard latency.
+
+    python -m benchmarks.loadtest                       # in-process server
+    python -m benchmarks.loadtest --rate 20000 --dashboards 50 --seconds 20
+    python -m benchmarks.loadtest --url ws://127.0.0.1:8765 --subjects 10
+
+Senders post synthetic events over WS /ingest at a target rate; dashboards
+hold WS /stream open and time how long it takes for each acknowledged
+event to show up in a snapshot.
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import threading
+import time
+
+from benchmarks import synthetic
+
+EVENT_MIX = (("utterance", 0.6), ("classification", 0.3), ("interruption", 0.1))
+
+
+def make_events(subjects, n, seed=0):
+    rng = random.Random(seed)
+    transcript = synthetic.make_transcript(min(n, 2000), seed=seed)
+    kinds, weights = zip(*EVENT_MIX)
+    events = []
+    for i in range(n):
+        kind = rng.choices(kinds, weights)[0]
+        a, b = rng.sample(subjects, 2)
+        if kind == "utterance":
+            events.append({"type": kind, "text": transcript[i % len(transcript)], "speaker": a,
+                           "confidence": round(rng.uniform(0.6, 1.0), 2)})
+        elif kind == "classification":
+            events.append({"type": kind, "speaker": a,
+                           "classification": rng.choice(("definitive", "hesitation"))})
+        else:
+            events.append({"type": kind, "interrupter": a, "interrupted": b})
+    return events
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_server(subjects):
+    """Run server.py's app in a background thread. Returns (ws base url, server)."""
+    import uvicorn
+    from server import create_app, make_engine
+    port = _free_port()
+    config = uvicorn.Config(create_app(make_engine(subjects)), host="127.0.0.1", port=port,
+                            log_level="warning", ws_max_size=64 * 1024 * 1024)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"ws://127.0.0.1:{port}", server
+
+
+async def sender(url, events, rate, seconds, batch, sent_at, acked):
+    """Post `rate` events/s in batches; record when each seq was sent."""
+    import websockets
+    async with websockets.connect(f"{url}/ingest", max_size=None) as ws:
+        t0 = time.perf_counter()
+        i = 0
+        n_batches = int(rate * seconds / batch)
+        for k in range(n_batches):
+            # pace against the schedule rather than sleeping a fixed amount
+            delay = t0 + k * batch / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            chunk = [events[(i + j) % len(events)] for j in range(batch)]
+            i += batch
+            await ws.send(json.dumps(chunk))
+            reply = json.loads(await ws.recv())
+            sent_at.append((reply["seq"], time.perf_counter()))
+            acked[0] = reply["seq"]
+        return time.perf_counter() - t0
+
+
+async def dashboard(url, sent_at, latencies, stop):
+    import websockets
+    async with websockets.connect(f"{url}/stream", max_size=None) as ws:
+        j = 0
+        while not stop.is_set():
+            try:
+                snap = json.loads(await asyncio.wait_for(ws.recv(), 0.5))
+            except asyncio.TimeoutError:
+                continue
+            now = time.perf_counter()
+            # every batch covered by this snapshot is now visible
+            while j < len(sent_at) and sent_at[j][0] <= snap["seq"]:
+                latencies.append(now - sent_at[j][1])
+                j += 1
+
+
+def _pct(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_load(url, subjects, rate, seconds, dashboards, batch):
+    events = make_events(subjects, 5000)
+    sent_at, acked, per_dash = [], [0], [[] for _ in range(dashboards)]
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(dashboard(url, sent_at, lat, stop)) for lat in per_dash]
+    await asyncio.sleep(0.2)
+    elapsed = await sender(url, events, rate, seconds, batch, sent_at, acked)
+    await asyncio.sleep(1.0)  # let the last snapshots arrive
+    stop.set()
+    await asyncio.gather(*tasks)
+    latencies = [x for lat in per_dash for x in lat]
+    return {
+        "subjects": len(subjects),
+        "target_rate": rate,
+        "events": acked[0],
+        "achieved_rate": round(acked[0] / elapsed, 1),
+        "dashboards": dashboards,
+        "p50_ms": round(_pct(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_pct(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_pct(latencies, 0.99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="ws:// base of a running server (default: start one)")
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--rate", type=int, default=5000, help="events per second")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--dashboards", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=50, help="events per WS message")
+    args = parser.parse_args(argv)
+
+    subjects = synthetic.make_subjects(args.subjects)
+    url = args.url
+    if url is None:
+        url, _ = start_local_server(subjects)
+    else:
+        # a remote server may not know the subjects yet
+        import urllib.request
+        http = url.replace("ws://", "http://", 1).replace("wss://", "https://", 1)
+        body = json.dumps([{"type": "subject", "name": s} for s in subjects]).encode()
+        urllib.request.urlopen(urllib.request.Request(
+            f"{http}/events", data=body, headers={"Content-Type": "application/json"},
+        ))
+
+    result = asyncio.run(run_load(url, subjects, args.rate, args.seconds, args.dashboards, args.batch))
+    for key, value in result.items():
+        print(f"  {key:<16}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Snapshot round-trip check: save a simulated session, restore it later.
+
+    python -m benchmarks.roundtrip
+    python -m benchmarks.roundtrip --advance 86400 --minutes 30
+
+For each decay mode a Conversation is run for --minutes of simulated time,
+saved, and restored --advance seconds later on the decay clock. The
+restored session must report the same influence and scores as at the
+save, and both sessions must then evolve identically. Exits non-zero on a
+mismatch.
+"""
+import argparse
+import sys
+
+from benchmarks.simulator import Conversation, make_speakers
+from logic.dynamics import DECAY_MODES, get_influence, get_scores
+from logic.session import new_session, add_subject, change_decay_mode, process_result
+from logic.snapshot import load_snapshot, snapshot_bytes
+
+TOLERANCE = 1e-9
+
+
+def _close(a, b):
+    return a.keys() == b.keys() and all(abs(a[k] - b[k]) <= TOLERANCE * max(1.0, abs(a[k])) for k in a)
+
+
+def check_mode(mode, minutes=10.0, advance=3600.0, subjects=5, seed=0):
+    """[failure messages] for one decay mode (empty when the round trip holds)."""
+    speakers = make_speakers(subjects, seed=seed)
+    conv = Conversation(speakers, seed=seed)
+    state = new_session()
+    for s in speakers:
+        add_subject(state, s.name)
+    change_decay_mode(state, mode, now=0.0)  # the Conversation clock starts at 0
+    while conv.t < minutes * 60:
+        process_result(state, conv.next()[1])
+
+    saved_at = conv.t
+    before = get_influence(state["nodes"], state["clock"], saved_at)
+    scores = get_scores(state["nodes"], state["clock"], saved_at)
+    blob = snapshot_bytes(state, now=saved_at)
+    restored_at = saved_at + advance
+    restored = load_snapshot(blob, now=restored_at)
+
+    failures = []
+    after = get_influence(restored["nodes"], restored["clock"], restored_at)
+    if not _close(before, after):
+        failures.append(f"{mode}: influence changed across restore: {before} -> {after}")
+    if not _close(scores, get_scores(restored["nodes"], restored["clock"], restored_at)):
+        failures.append(f"{mode}: scores changed across restore")
+
+    # the same next utterances, shifted by the time spent on disk
+    for _ in range(50):
+        result = conv.next()[1]
+        process_result(state, result)
+        result.start += advance
+        result.end += advance
+        process_result(restored, result)
+    now = conv.t
+    if not _close(get_influence(state["nodes"], state["clock"], now),
+                  get_influence(restored["nodes"], restored["clock"], now + advance)):
+        failures.append(f"{mode}: sessions diverged after restore")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0, help="simulated session length")
+    parser.add_argument("--advance", type=float, default=3600.0, help="seconds between save and restore")
+    parser.add_argument("--subjects", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = []
+    for mode in DECAY_MODES:
+        found = check_mode(mode, args.minutes, args.advance, args.subjects, args.seed)
+        print(f"  {mode:<6} {'FAIL' if found else 'ok'}", file=sys.stderr)
+        failures += found
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""Micro-benchmarks for the engine, classifier, speaker ID and rendering.
+
+    python -m benchmarks.run                 # full suite -> benchmarks/results/<commit>.json
+    python -m benchmarks.run --quick         # smaller sizes, fewer repeats
+    python -m benchmarks.run --only engine   # name prefix filter
+    python -m benchmarks.compare base.json head.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+
+from benchmarks import synthetic
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+BENCHMARKS = []  # (name, fn, params, quick_params)
+
+
+def benchmark(name, params, quick=None):
+    """Register `fn(param)` -> (callable, ops_per_call) for each param."""
+    def wrap(fn):
+        BENCHMARKS.append((name, fn, params, quick or params[:1]))
+        return fn
+    return wrap
+
+
+def measure(fn, repeat=5, min_time=0.1):
+    """Median seconds per call, looping each sample until `min_time` elapses."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ENGINE
+# ═══════════════════════════════════════════════════════════════════════════
+@benchmark("engine.apply_events", params=[5, 20, 100, 500], quick=[5, 100])
+def bench_engine_apply(n_subjects):
+    from logic.dynamics import (
+        apply_decay, apply_definitive, apply_hesitation, apply_interruption,
+    )
+    subjects = synthetic.make_subjects(n_subjects)
+    events = synthetic.make_event_stream(subjects, 1000)
+    nodes = synthetic.make_nodes(subjects)
+
+    def run():
+        for kind, actor, target in events:
+            if kind == "definitive":
+                apply_definitive(nodes, actor)
+            elif kind == "hesitation":
+                apply_hesitation(nodes, actor)
+            elif kind == "interruption":
+                apply_interruption(nodes, actor, target)
+            else:
+                apply_decay(nodes)
+    return run, len(events)
+
+
+@benchmark("engine.apply_events_timed", params=[5, 20, 100, 500], quick=[5, 100])
+def bench_engine_apply_timed(n_subjects):
+    from logic.dynamics import DecayClock, apply_events
+    subjects = synthetic.make_subjects(n_subjects)
+    events = [
+        (kind, actor, target, 0.5 * i)
+        for i, (kind, actor, target) in enumerate(synthetic.make_event_stream(subjects, 1000))
+    ]
+    nodes = synthetic.make_nodes(subjects)
+
+    def run():
+        apply_events(nodes, events, DecayClock("time", t_ref=0.0))
+    return run, len(events)
+
+
+def _model_batch(subjects, n, timed=False):
+    from logic.models import DECAY, INTERRUPTION, STATEMENT, EventBatch
+    from logic.dynamics import DEFINITIVE_GAIN, HESITATION_PENALTY, INTERRUPT_TRANSFER
+    index = {name: i for i, name in enumerate(subjects)}
+    rows = []
+    for i, (kind, actor, target) in enumerate(synthetic.make_event_stream(subjects, n)):
+        t = 0.5 * i if timed else np.nan
+        if kind == "definitive":
+            rows.append((STATEMENT, index[actor], -1, DEFINITIVE_GAIN, t))
+        elif kind == "hesitation":
+            rows.append((STATEMENT, index[actor], -1, -HESITATION_PENALTY, t))
+        elif kind == "interruption":
+            rows.append((INTERRUPTION, index[actor], index[target], INTERRUPT_TRANSFER, t))
+        else:
+            rows.append((DECAY, -1, -1, 0.0, t))
+    return EventBatch.from_rows(rows)
+
+
+@benchmark("models.default_apply", params=[5, 20, 100, 500], quick=[5, 100])
+def bench_model_apply(n_subjects):
+    from logic.models import get_model
+    batch = _model_batch(synthetic.make_subjects(n_subjects), 1000)
+    model = get_model("default")
+    state = model.init(n_subjects)
+
+    def run():
+        model.apply(state, batch)
+    return run, len(batch)
+
+
+@benchmark("models.compare_all", params=[5, 100, 500], quick=[5, 100])
+def bench_model_compare(n_subjects):
+    from logic.models import ModelRunner, available_models
+    batch = _model_batch(synthetic.make_subjects(n_subjects), 1000, timed=True)
+    runner = ModelRunner(available_models(), people=synthetic.make_subjects(n_subjects))
+
+    def run():
+        runner.apply(batch)
+    return run, len(batch)
+
+
+@benchmark("engine.get_influence", params=[5, 20, 100, 500], quick=[5, 100])
+def bench_get_influence(n_subjects):
+    from logic.dynamics import get_influence
+    nodes = synthetic.make_nodes(synthetic.make_subjects(n_subjects))
+    return (lambda: get_influence(nodes)), 1
+
+
+@benchmark("interactions.record", params=[5, 50, 500], quick=[5, 500])
+def bench_interaction_record(n_subjects):
+    subjects = synthetic.make_subjects(n_subjects)
+    graph = synthetic.make_interactions(subjects, density=0.0)
+    pairs = [(a, t) for _, a, t in synthetic.make_event_stream(subjects, 5000) if t]
+
+    def run():
+        for src, dst in pairs:
+            graph.record(src, dst, t=0.0)
+    return run, len(pairs)
+
+
+@benchmark("interactions.pagerank", params=[5, 50, 500], quick=[5, 500])
+def bench_pagerank(n_subjects):
+    graph = synthetic.make_interactions(synthetic.make_subjects(n_subjects))
+    src, dst = graph.names[0], graph.names[-1]
+
+    def run():
+        graph.record(src, dst, t=0.0)  # dirty the cache like a live event
+        graph.pagerank()
+    return run, 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CLASSIFIER
+# ═══════════════════════════════════════════════════════════════════════════
+@benchmark("classifier.classify_speech", params=[10000], quick=[2000])
+def bench_classify(n_sentences):
+    from logic.analysis import classify_speech
+    transcript = synthetic.make_transcript(n_sentences)
+
+    def run():
+        for text in transcript:
+            classify_speech(text)
+    return run, n_sentences
+
+
+@benchmark("rules.classify", params=[100, 1000, 10000, 100000], quick=[100, 10000])
+def bench_rules_classify(n_phrases):
+    from logic.rules import RuleSet
+    rules = RuleSet.from_dict(synthetic.make_rule_spec(n_phrases))
+    transcript = synthetic.make_transcript(2000)
+
+    def run():
+        for text in transcript:
+            rules.classify(text)
+    return run, len(transcript)
+
+
+@benchmark("rules.compile", params=[1000, 100000], quick=[1000])
+def bench_rules_compile(n_phrases):
+    from logic.rules import RuleSet
+    spec = synthetic.make_rule_spec(n_phrases)
+    return (lambda: RuleSet.from_dict(spec)), 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SPEAKER ID
+# ═══════════════════════════════════════════════════════════════════════════
+@benchmark("voice.identify_speaker", params=[2, 8, 32, 128], quick=[2, 32])
+def bench_identify(n_profiles):
+    from audio_modules.voice import identify_speaker
+    profiles = synthetic.make_profiles(synthetic.make_subjects(n_profiles))
+    queries = synthetic.make_embeddings(100, seed=1)
+
+    def run():
+        for emb in queries:
+            identify_speaker(emb, profiles)
+    return run, len(queries)
+
+
+@benchmark("voice.speaker_tracker", params=[2, 8, 32, 128], quick=[2, 32])
+def bench_speaker_tracker(n_profiles):
+    from audio_modules.attribution import SpeakerTracker
+    profiles = synthetic.make_profiles(synthetic.make_subjects(n_profiles))
+    queries = synthetic.make_embeddings(100, seed=1)
+    tracker = SpeakerTracker()
+
+    def run():
+        for i, emb in enumerate(queries):
+            tracker.update(emb, profiles, t=2.0 * i)
+    return run, len(queries)
+
+
+@benchmark("voice.audio_to_numpy", params=[10.0])
+def bench_audio_to_numpy(seconds):
+    from audio_modules.voice import audio_to_numpy
+    audio = synthetic.make_audio_data(seconds)
+    return (lambda: audio_to_numpy(audio)), 1
+
+
+@benchmark("voice.vad_gate", params=[2.0, 10.0], quick=[2.0])
+def bench_vad_gate(seconds):
+    from audio_modules.vad import VoiceActivityGate
+    audio = synthetic.make_audio_data(seconds)
+    gate = VoiceActivityGate()
+    return (lambda: gate.accept(audio)), 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SNAPSHOTS
+# ═══════════════════════════════════════════════════════════════════════════
+def _simulated_session(hours, n_subjects=10):
+    from benchmarks.simulator import Conversation, make_speakers
+    from logic.session import new_session, add_subject, process_result
+    speakers = make_speakers(n_subjects, embeddings=True)
+    state = new_session()
+    for s in speakers:
+        add_subject(state, s.name)
+    state["voice_profiles"] = {s.name: s.profile for s in speakers}
+    conversation = Conversation(speakers)
+    while conversation.t < hours * 3600:
+        process_result(state, conversation.next()[1])
+    return state
+
+
+@benchmark("session.snapshot_save", params=[1, 3, 12], quick=[3])
+def bench_snapshot_save(hours):
+    from logic.snapshot import snapshot_bytes
+    state = _simulated_session(hours)
+    return (lambda: snapshot_bytes(state)), 1
+
+
+@benchmark("session.snapshot_load", params=[1, 3, 12], quick=[3])
+def bench_snapshot_load(hours):
+    from logic.snapshot import load_snapshot, snapshot_bytes
+    data = snapshot_bytes(_simulated_session(hours))
+    return (lambda: load_snapshot(data)), 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RENDERING
+# ═══════════════════════════════════════════════════════════════════════════
+@benchmark("ui.build_graph_html", params=[5, 20, 60], quick=[5])
+def bench_graph_html(n_subjects):
+    from ui.graphs import build_graph_html
+    from logic.dynamics import get_influence
+    subjects = synthetic.make_subjects(n_subjects)
+    nodes = synthetic.make_nodes(subjects)
+    interactions = synthetic.make_interactions(subjects)
+    influence = get_influence(nodes)
+    return (lambda: build_graph_html(subjects, nodes, interactions, influence)), 1
+
+
+@benchmark("ui.layout", params=[12, 60, 200], quick=[12])
+def bench_layout(n_subjects):
+    """Uncached cost: paid once per subject set."""
+    from ui.layout import layout_positions
+    names = tuple(synthetic.make_subjects(n_subjects))
+
+    def run():
+        layout_positions.cache_clear()
+        layout_positions(names)
+    return run, 1
+
+
+@benchmark("ui.leaderboard_html", params=[5, 20, 60], quick=[5])
+def bench_leaderboard_html(n_subjects):
+    """A steady session: one subject's score moves per rerun, the rest are cached."""
+    from ui.components import leaderboard_html
+    from logic.dynamics import apply_definitive, get_influence
+    subjects = synthetic.make_subjects(n_subjects)
+    nodes = synthetic.make_nodes(subjects)
+    dominance = synthetic.make_interactions(subjects).metrics()
+    rng = random.Random(0)
+
+    def run():
+        apply_definitive(nodes, rng.choice(subjects))
+        ranked = sorted(get_influence(nodes).items(), key=lambda x: x[1], reverse=True)
+        leaderboard_html(ranked, dominance)
+    return run, 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RUNNER
+# ═══════════════════════════════════════════════════════════════════════════
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(only=None, quick=False):
+    results = {}
+    for name, fn, params, quick_params in BENCHMARKS:
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        for param in (quick_params if quick else params):
+            key = f"{name}[{param}]"
+            try:
+                call, ops = fn(param)
+            except ImportError as e:
+                print(f"  {key:<40}skipped ({e})", file=sys.stderr)
+                continue
+            stats = measure(call, repeat=3 if quick else 7)
+            stats["ops_per_call"] = ops
+            stats["ops_per_s"] = ops / stats["median_s"] if stats["median_s"] else 0.0
+            results[key] = stats
+            print(
+                f"  {key:<40}{stats['median_s'] * 1e3:10.3f} ms"
+                f"{stats['ops_per_s']:14.0f} ops/s",
+                file=sys.stderr,
+            )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="*", help="benchmark name prefixes")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--out", help="result path (default: results/<commit>.json)")
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "system": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": run_suite(args.only, args.quick),
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+
+import time
+import random
+import asyncio
+import threading
+import numpy as np
+
+from audio_modules.channel import ListenerResult
+from benchmarks import synthetic
+from logic.rules import get_classifier
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CONVERSATION SIMULATOR
+# ═══════════════════════════════════════════════════════════════════════════
+# Generates a plausible meeting as a stream of ListenerResults on a
+# simulated clock (seconds from 0). Who speaks next follows talkativeness;
+# how they phrase it follows assertiveness, with marker phrases drawn from
+# the live rule file so classifier changes are exercised too.
+MEAN_TURN_S = 4.0
+MEAN_GAP_S = 0.6
+DEFERENCE_PROB = 0.05     # share of turns with a deference marker
+MARKER_PROB = 0.5         # share of turns with a definitive or hesitation marker
+EMBEDDING_NOISE = 0.04    # per-dimension noise around a speaker's profile
+
+
+class SimSpeaker:
+    """talkativeness: relative share of turns. assertiveness 0-1: definitive
+    vs hesitant phrasing. interrupt_rate: chance a turn cuts the previous
+    speaker off."""
+
+    __slots__ = ("name", "talkativeness", "assertiveness", "interrupt_rate", "profile")
+
+    def __init__(self, name, talkativeness=1.0, assertiveness=0.5, interrupt_rate=0.1, profile=None):
+        self.name = name
+        self.talkativeness = talkativeness
+        self.assertiveness = assertiveness
+        self.interrupt_rate = interrupt_rate
+        self.profile = profile
+
+
+def make_speakers(n, seed=0, embeddings=False):
+    """n speakers with spread-out traits (and voice profiles if asked)."""
+    rng = random.Random(seed)
+    profiles = synthetic.make_profiles(synthetic.make_subjects(n), seed=seed) if embeddings else {}
+    return [
+        SimSpeaker(
+            name,
+            talkativeness=rng.lognormvariate(0.0, 0.6),
+            assertiveness=rng.betavariate(2, 2),
+            interrupt_rate=rng.uniform(0.0, 0.25),
+            profile=profiles.get(name),
+        )
+        for name in synthetic.make_subjects(n)
+    ]
+
+
+class Conversation:
+    """Infinite, seeded stream of utterances between `speakers`."""
+
+    def __init__(self, speakers, seed=0, mean_turn_s=MEAN_TURN_S, mean_gap_s=MEAN_GAP_S,
+                 rules=None):
+        self.speakers = speakers
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.mean_turn_s = mean_turn_s
+        self.mean_gap_s = mean_gap_s
+        rules = rules or get_classifier().rules
+        self.phrases = {
+            name: rules.phrases_for(name) or [name]
+            for name in ("definitive", "hesitation", "deference")
+        }
+        self.t = 0.0
+        self._prev = None
+        self._prev_end = 0.0
+
+    def _phrase(self, speaker):
+        rng = self.rng
+        words = rng.sample(synthetic.FILLER_WORDS, rng.randint(5, 12))
+        roll = rng.random()
+        category = None
+        if roll < DEFERENCE_PROB:
+            category = "deference"
+        elif roll < DEFERENCE_PROB + MARKER_PROB:
+            category = "definitive" if rng.random() < speaker.assertiveness else "hesitation"
+        if category:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(self.phrases[category]))
+        return " ".join(words)
+
+    def _next_speaker(self):
+        candidates = [s for s in self.speakers if s is not self._prev] or self.speakers
+        return self.rng.choices(candidates, [s.talkativeness for s in candidates])[0]
+
+    def embedding(self, speaker):
+        """Noisy voice embedding for one of `speaker`'s phrases."""
+        noise = self.np_rng.standard_normal(speaker.profile.shape).astype(np.float32)
+        emb = speaker.profile + EMBEDDING_NOISE * noise
+        return emb / np.linalg.norm(emb)
+
+    def next(self):
+        """(SimSpeaker, ListenerResult) for the next utterance."""
+        rng = self.rng
+        speaker = self._next_speaker()
+        duration = rng.expovariate(1.0 / self.mean_turn_s) + 0.3
+        interrupted = None
+        if self._prev is not None and rng.random() < speaker.interrupt_rate:
+            # cut in before the previous speaker finished
+            start = self._prev_end - rng.uniform(0.2, 1.5)
+            interrupted = self._prev.name
+        else:
+            start = self._prev_end + rng.expovariate(1.0 / self.mean_gap_s)
+        end = start + duration
+        result = ListenerResult(
+            self._phrase(speaker),
+            speaker=speaker.name,
+            confidence=round(rng.uniform(0.7, 0.99), 2),
+            interrupted=interrupted,
+            start=start,
+            end=end,
+        )
+        self._prev, self._prev_end = speaker, max(end, self._prev_end)
+        self.t = self._prev_end
+        return speaker, result
+
+    def __iter__(self):
+        while True:
+            yield self.next()[1]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FEEDERS
+# ═══════════════════════════════════════════════════════════════════════════
+class ChannelFeeder:
+    """Plays a Conversation into a ResultChannel from a background thread,
+    standing in for AudioListener.
+
+    speed: simulated seconds per wall second (1.0 = real time); None plays
+    as fast as the channel takes it. Result times are shifted onto the
+    wall clock at start, like a live microphone. With a SpeakerTracker the
+    speaker is re-attributed from a noisy embedding, as the listener does.
+    """
+
+    def __init__(self, channel, conversation, speed=1.0, tracker=None, profiles=None):
+        self.channel = channel
+        self.conversation = conversation
+        self.speed = speed
+        self.tracker = tracker
+        self.profiles = profiles or {}
+        self.sent = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        conv = self.conversation
+        t0 = time.time()
+        wall0 = time.perf_counter()
+        while not self._stop_event.is_set():
+            speaker, result = conv.next()
+            if self.speed:
+                delay = wall0 + result.end / self.speed - time.perf_counter()
+                if delay > 0 and self._stop_event.wait(delay):
+                    break
+            if self.tracker is not None and speaker.profile is not None:
+                result.speaker, result.confidence = self.tracker.update(
+                    conv.embedding(speaker), self.profiles, result.end,
+                )
+            result.start += t0
+            result.end += t0
+            result.timing = {}
+            self.channel.put(result)
+            self.sent += 1
+
+
+async def feed_engine(engine, conversation, rate, seconds):
+    """Post utterance events to a logic.engine.Engine at `rate` per second."""
+    from logic.engine import result_event
+    t0 = time.perf_counter()
+    n = int(rate * seconds)
+    for i in range(n):
+        delay = t0 + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        engine.post(result_event(conversation.next()[1]))
+    return n
@@ -0,0 +1,175 @@
+"""Soak test: a simulated meeting run for hours against the app's engine path.
+
+    python -m benchmarks.soak --minutes 10 --subjects 8 --speed 50
+    python -m benchmarks.soak --hours 4 --speed 1 --out soak.json
+
+A ChannelFeeder plays a Conversation into a ResultChannel; the main loop
+drains it and performs the same work as an app rerun (engine update, then
+leaderboard, cards, transcript, event log and optionally the graph HTML)
+every --refresh seconds. Each sample records RSS, session sizes and
+refresh latency, so memory growth and slowdowns over time show up.
+--budget-mb runs the session in long-session mode (logic/spill.py).
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import numpy as np
+
+from audio_modules.channel import ResultChannel
+from audio_modules.attribution import SpeakerTracker
+from benchmarks.simulator import ChannelFeeder, Conversation, make_speakers
+from logic.dynamics import get_influence, get_scores
+from logic.records import format_confidence, format_event, format_time
+from logic.session import new_session, add_subject, process_results
+from logic.spill import bound_session, memory_report
+from ui.components import leaderboard_html, subject_card
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def refresh(state, graph=False):
+    """The data and HTML work of one app rerun, minus Streamlit itself."""
+    nodes, clock = state["nodes"], state["clock"]
+    influence = get_influence(nodes, clock)
+    scores = get_scores(nodes, clock)
+    dominance = state["interactions"].metrics()
+    ranked = sorted(influence.items(), key=lambda x: x[1], reverse=True)
+    leaderboard_html(ranked, dominance)
+    for i, person in enumerate(state["people"]):
+        subject_card(i + 1, person, round(influence[person], 1), round(scores[person]))
+    "".join(
+        f"{format_time(e.t)} {e.speaker}{format_confidence(e.confidence)} {e.text}"
+        for e in state["transcript"][-50:]
+    )
+    "".join(format_event(event) for event in state["log"][-100:])
+    state["turns"].summary()
+    state["latency"].summary()
+    if graph:
+        from ui.graphs import build_graph_html
+        build_graph_html(state["people"], nodes, state["interactions"], influence, scores)
+    state["latency"].mark_rendered()
+
+
+def run_soak(seconds, n_subjects=8, speed=50.0, refresh_s=2.0, sample_s=30.0,
+             graph=False, attribute=False, seed=0, progress=None, budget_mb=0):
+    speakers = make_speakers(n_subjects, seed=seed, embeddings=attribute)
+    state = new_session()
+    for s in speakers:
+        add_subject(state, s.name)
+    if budget_mb:
+        bound_session(state, budget_mb * 2**20)
+    channel = ResultChannel(maxsize=10000)
+    feeder = ChannelFeeder(
+        channel, Conversation(speakers, seed=seed), speed=speed,
+        tracker=SpeakerTracker() if attribute else None,
+        profiles={s.name: s.profile for s in speakers} if attribute else None,
+    )
+
+    samples, window = [], []
+    t0 = time.perf_counter()
+    next_sample = t0 + sample_s
+    feeder.start()
+    try:
+        while time.perf_counter() - t0 < seconds:
+            channel.wait(timeout=refresh_s)
+            results = channel.get_many(10000, timeout=0)
+            process_results(state, results)
+            r0 = time.perf_counter()
+            refresh(state, graph)
+            window.append(time.perf_counter() - r0)
+
+            now = time.perf_counter()
+            if now >= next_sample:
+                ms = np.array(window) * 1000
+                sample = {
+                    "elapsed_s": round(now - t0, 1),
+                    "rss_mb": round(rss_bytes() / 2**20, 1),
+                    "utterances": feeder.sent,
+                    "transcript": len(state["transcript"]),
+                    "log": len(state["log"]),
+                    "dropped": channel.dropped,
+                    "refreshes": len(window),
+                    "refresh_p50_ms": round(float(np.percentile(ms, 50)), 2),
+                    "refresh_p95_ms": round(float(np.percentile(ms, 95)), 2),
+                    "refresh_max_ms": round(float(ms.max()), 2),
+                    "memory_kb": {
+                        name: round(m["ram_bytes"] / 1024, 1) for name, m in memory_report(state).items()
+                    },
+                }
+                samples.append(sample)
+                if progress:
+                    progress(sample)
+                window = []
+                next_sample = now + sample_s
+    finally:
+        feeder.stop()
+
+    summary = {"samples": len(samples)}
+    if len(samples) >= 2:
+        hours = np.array([s["elapsed_s"] for s in samples]) / 3600
+        summary["rss_growth_mb_per_hour"] = round(float(np.polyfit(hours, [s["rss_mb"] for s in samples], 1)[0]), 2)
+        summary["refresh_p95_first_ms"] = samples[0]["refresh_p95_ms"]
+        summary["refresh_p95_last_ms"] = samples[-1]["refresh_p95_ms"]
+    return {
+        "config": {
+            "seconds": seconds, "subjects": n_subjects, "speed": speed,
+            "refresh_s": refresh_s, "graph": graph, "attribute": attribute, "seed": seed,
+            "budget_mb": budget_mb,
+        },
+        "summary": summary,
+        "samples": samples,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=0.0)
+    parser.add_argument("--minutes", type=float, default=0.0)
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--speed", type=float, default=50.0,
+                        help="simulated seconds per wall second (default 50)")
+    parser.add_argument("--refresh", type=float, default=2.0, help="seconds between reruns")
+    parser.add_argument("--sample", type=float, default=30.0, help="seconds between samples")
+    parser.add_argument("--graph", action="store_true", help="include graph HTML in each refresh")
+    parser.add_argument("--attribute", action="store_true",
+                        help="attribute speakers from synthetic embeddings")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-mb", type=float, default=0.0,
+                        help="long-session mode: RAM budget for transcript and log")
+    parser.add_argument("--out", help="write samples as JSON")
+    args = parser.parse_args(argv)
+
+    seconds = args.hours * 3600 + args.minutes * 60 or 60.0
+
+    def progress(s):
+        print(
+            f"  {s['elapsed_s']:>8.0f}s  rss {s['rss_mb']:>7.1f} MB  utterances {s['utterances']:>8}  "
+            f"refresh p95 {s['refresh_p95_ms']:>7.2f} ms  max {s['refresh_max_ms']:>7.2f} ms",
+            file=sys.stderr,
+        )
+
+    result = run_soak(
+        seconds, args.subjects, args.speed, args.refresh, args.sample,
+        args.graph, args.attribute, args.seed, progress, args.budget_mb,
+    )
+    for key, value in result["summary"].items():
+        print(f"  {key:<26}{value}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"wrote {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+
+import random
+import numpy as np
+from logic.dynamics import BASE_SCORE
+from logic.interactions import InteractionGraph
+from logic.records import Subject
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SYNTHETIC DATA
+# ═══════════════════════════════════════════════════════════════════════════
+# Every generator takes a seed so runs are comparable between commits.
+HESITATION_WORDS = ["um", "uh", "i guess", "i think", "maybe", "sort of", "you know"]
+DEFINITIVE_WORDS = ["absolutely", "definitely", "clearly", "without a doubt", "i am sure"]
+FILLER_WORDS = (
+    "the team should review the budget before we ship the next release and "
+    "then we can talk about hiring plans for the quarter"
+).split()
+EMBEDDING_DIM = 256  # Resemblyzer output size
+
+
+def make_subjects(n):
+    return [f"S{i:03d}" for i in range(n)]
+
+
+def make_nodes(subjects):
+    return {name: Subject(BASE_SCORE) for name in subjects}
+
+
+def make_sentence(rng, marker_prob=0.4):
+    words = rng.sample(FILLER_WORDS, rng.randint(6, 14))
+    roll = rng.random()
+    if roll < marker_prob / 2:
+        words.insert(rng.randrange(len(words)), rng.choice(HESITATION_WORDS))
+    elif roll < marker_prob:
+        words.insert(rng.randrange(len(words)), rng.choice(DEFINITIVE_WORDS))
+    return " ".join(words)
+
+
+def make_transcript(n, seed=0):
+    rng = random.Random(seed)
+    return [make_sentence(rng) for _ in range(n)]
+
+
+def make_rule_spec(n_phrases, n_categories=4, seed=0):
+    """Rule-file dict with n_phrases random 1-4 word phrases, some of which
+    overlap the transcript vocabulary so matches actually happen."""
+    rng = random.Random(seed)
+    vocab = FILLER_WORDS + [f"w{i}" for i in range(5000)]
+    categories = [
+        {"name": f"cat{c}", "priority": c, "score": 5 - 3 * c, "phrases": {}}
+        for c in range(n_categories)
+    ]
+    for _ in range(n_phrases):
+        phrase = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 4)))
+        rng.choice(categories)["phrases"][phrase] = round(rng.uniform(0.5, 2.0), 2)
+    categories[0]["patterns"] = {"um+": 1.0, "uh+": 1.0}
+    return {"categories": categories}
+
+
+def make_embeddings(n, seed=0, dim=EMBEDDING_DIM):
+    """Unit-norm random vectors, shaped like Resemblyzer embeddings."""
+    rng = np.random.default_rng(seed)
+    emb = rng.standard_normal((n, dim)).astype(np.float32)
+    return emb / np.linalg.norm(emb, axis=1, keepdims=True)
+
+
+def make_profiles(subjects, seed=0):
+    return dict(zip(subjects, make_embeddings(len(subjects), seed)))
+
+
+def make_event_stream(subjects, n, seed=0):
+    """List of ("definitive"|"hesitation"|"neutral"|"interruption", actor, target)."""
+    rng = random.Random(seed)
+    kinds = ["definitive", "hesitation", "neutral", "interruption"]
+    weights = [0.3, 0.3, 0.3, 0.1]
+    events = []
+    for kind in rng.choices(kinds, weights, k=n):
+        actor = rng.choice(subjects)
+        target = None
+        if kind == "interruption" and len(subjects) > 1:
+            target = rng.choice(subjects)
+            while target == actor:
+                target = rng.choice(subjects)
+        elif kind == "interruption":
+            kind = "neutral"
+        events.append((kind, actor, target))
+    return events
+
+
+def make_audio_data(seconds, sample_rate=16000, seed=0):
+    """sr.AudioData of noisy voiced-like tones, as the microphone would return."""
+    import speech_recognition as sr
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    wave = 0.3 * np.sin(2 * np.pi * 180 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    wave += 0.02 * rng.standard_normal(t.size)
+    pcm = (np.clip(wave, -1, 1) * 32767).astype("<i2").tobytes()
+    return sr.AudioData(pcm, sample_rate, 2)
+
+
+def make_interactions(subjects, density=0.2, seed=0):
+    rng = random.Random(seed)
+    graph = InteractionGraph()
+    for name in subjects:
+        graph.add_subject(name)
+    for src in subjects:
+        for dst in subjects:
+            if src != dst and rng.random() < density:
+                for _ in range(rng.randint(1, 6)):
+                    graph.record(src, dst, t=0.0)
+    return graph
@@ -0,0 +1,74 @@
+"""Speaker-tracker check: a long pause must forget, never invert, the belief.
+
+    python -m benchmarks.tracker_check
+    python -m benchmarks.tracker_check --subjects 8 --cosine 0.7
+
+A SpeakerTracker hears --history clearly identified phrases from one
+subject, then, after each of a range of pauses (and a phrase with no
+time), a --cosine phrase from the same subject. Its posterior for that subject must never be lower than a fresh
+tracker's on the same phrase, and after a long pause the two must agree.
+Exits non-zero on a failure.
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from audio_modules.attribution import MEMORY_S, SpeakerTracker
+
+PAUSES_S = (0.0, 1.0, MEMORY_S, 60.0, 600.0, None)
+HISTORY_COSINE = 0.9  # phrases before the pause: well above UNKNOWN_SIMILARITY
+TOLERANCE = 1e-9
+
+
+def _phrase(profile, cosine, rng):
+    """A unit embedding at `cosine` similarity to `profile`."""
+    noise = rng.standard_normal(profile.size)
+    noise -= noise @ profile * profile
+    noise /= np.linalg.norm(noise)
+    return cosine * profile + np.sqrt(1.0 - cosine ** 2) * noise
+
+
+def check(subjects=4, history=5, cosine=0.8, dim=256, seed=0):
+    """[failure messages] (empty when the tracker behaves)."""
+    rng = np.random.default_rng(seed)
+    matrix = rng.standard_normal((subjects, dim))
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    profiles = {f"S{i}": row for i, row in enumerate(matrix)}
+    speaker = "S0"
+    phrase = _phrase(profiles[speaker], cosine, rng)
+    fresh = SpeakerTracker()
+    fresh.update(phrase, profiles, 0.0)
+    baseline = fresh.posteriors()[speaker]
+
+    failures = []
+    for pause in PAUSES_S:
+        tracker = SpeakerTracker()
+        for k in range(history):
+            tracker.update(_phrase(profiles[speaker], HISTORY_COSINE, rng), profiles, float(k))
+        tracker.update(phrase, profiles, None if pause is None else history - 1 + pause)
+        resumed = tracker.posteriors()[speaker]
+        if resumed < baseline - TOLERANCE:
+            failures.append(f"pause {pause}: posterior {resumed:.4f} below a fresh tracker's {baseline:.4f}")
+        if (pause is None or pause >= 60 * MEMORY_S) and abs(resumed - baseline) > 1e-3:
+            failures.append(f"pause {pause}: posterior {resumed:.4f} did not return to the fresh {baseline:.4f}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subjects", type=int, default=4)
+    parser.add_argument("--history", type=int, default=5, help="phrases before the pause")
+    parser.add_argument("--cosine", type=float, default=0.8, help="similarity of the phrase after the pause to its speaker")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = check(args.subjects, args.history, args.cosine, seed=args.seed)
+    print(f"  tracker {'FAIL' if failures else 'ok'}", file=sys.stderr)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""Measure the speech classifier and speaker ID against a labelled corpus.
+
+    python evaluate.py corpus.jsonl
+    python evaluate.py corpus.jsonl --rules rules/speech_rules.json draft_rules.json
+    python evaluate.py corpus.jsonl --profiles profiles.npz --workers 4 --out report.json
+
+The corpus is JSON lines, one utterance per line:
+
+    {"text": "...", "label": "definitive", "speaker": "Alice", "audio": "clips/0001.wav"}
+
+"label" is the expected classification ("neutral" for none) and "speaker"
+the true speaker. A voice clip ("audio": WAV/FLAC) or a precomputed
+embedding ("embedding": .npy) enables speaker ID; "t" (seconds) orders
+phrases for the tracker. Lines with "split": "enroll" build the voice
+profiles (mean embedding per speaker) unless --profiles is given, and are
+not scored. Paths are relative to the corpus file.
+
+The corpus is streamed in batches: texts are classified by a process pool
+(one pass per rule file, so rule sets can be compared side by side) and
+clips are embedded by a thread pool through an on-disk embedding cache,
+so re-runs skip the encoder. The report is JSON; a summary goes to stderr.
+"""
+import argparse
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+
+from logic.evaluation import (
+    DEFAULT_THRESHOLDS,
+    UNKNOWN,
+    classification_report,
+    identify_batch,
+    similarity_matrix,
+    speaker_report,
+    threshold_sweep,
+)
+from logic.rules import NEUTRAL, RULES_PATH, load_rules
+from audio_modules.attribution import TEMPERATURE, SpeakerTracker, fit_temperature
+from audio_modules.embedding_cache import CACHE_DIR, ENCODER_TAG, EmbeddingCache
+
+BATCH = 256                # utterances per classification / embedding batch
+SPEAKER_THRESHOLD = 0.65   # identify_speaker()'s default
+EVAL_CACHE_DIR = os.path.join(CACHE_DIR, "eval")
+EVAL_CACHE_SIZE = 100000   # clip embeddings kept on disk
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CORPUS
+# ═══════════════════════════════════════════════════════════════════════════
+def read_corpus(path):
+    """Yield corpus rows with "audio"/"embedding" paths made absolute."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}") from None
+            for key in ("audio", "embedding"):
+                if row.get(key):
+                    row[key] = os.path.join(base, row[key])
+            yield row
+
+
+def batched(rows, n):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CLASSIFIER
+# ═══════════════════════════════════════════════════════════════════════════
+@functools.lru_cache(maxsize=None)
+def _rule_set(path):
+    return load_rules(path)
+
+
+def _classify_chunk(path, texts):
+    """Worker: (predictions, seconds spent classifying)."""
+    rules = _rule_set(path)
+    t0 = time.perf_counter()
+    predictions = [rules.classify(text) for text in texts]
+    return predictions, time.perf_counter() - t0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  EMBEDDINGS
+# ═══════════════════════════════════════════════════════════════════════════
+class ClipEmbedder:
+    """Voice embedding for a corpus row, cached by clip identity (path,
+    size, mtime) so a cached clip is neither decoded nor encoded again."""
+
+    def __init__(self, encoder=None, cache=None):
+        self.encoder = encoder
+        self.cache = cache
+        self.encoded = 0
+        self._lock = threading.Lock()
+
+    def _encoder(self):
+        with self._lock:  # loaded on the first uncached clip
+            if self.encoder is None:
+                self.encoder = load_encoder()
+            return self.encoder
+
+    @staticmethod
+    def key(path):
+        st = os.stat(path)
+        h = hashlib.blake2b(ENCODER_TAG, digest_size=16)
+        h.update(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode())
+        return h.hexdigest()
+
+    def __call__(self, row):
+        if row.get("embedding"):
+            return np.load(row["embedding"]).astype(np.float32)
+        path = row.get("audio")
+        if not path:
+            return None
+        key = self.key(path)
+        if self.cache is not None:
+            embedding = self.cache.get(key)
+            if embedding is not None:
+                return embedding
+        encoder = self._encoder()
+        if encoder is None:
+            raise RuntimeError("audio clips need Resemblyzer (pip install resemblyzer)")
+        import speech_recognition as sr
+        from audio_modules.voice import audio_to_numpy, preprocess_wav
+        with sr.AudioFile(path) as source:
+            audio = sr.Recognizer().record(source)
+        embedding = encoder.embed_utterance(preprocess_wav(audio_to_numpy(audio), source_sr=16000))
+        self.encoded += 1
+        if self.cache is not None:
+            self.cache.put(key, embedding)
+        return np.asarray(embedding, dtype=np.float32)
+
+
+def load_encoder():
+    try:
+        from resemblyzer import VoiceEncoder
+    except ImportError:
+        return None
+    return VoiceEncoder("cpu")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  HARNESS
+# ═══════════════════════════════════════════════════════════════════════════
+class _Done:
+    """Already-computed stand-in for a Future (single-process mode)."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+
+def run_evaluation(corpus, rule_paths=(RULES_PATH,), profiles=None, workers=1, batch=BATCH,
+                   threshold=SPEAKER_THRESHOLD, thresholds=DEFAULT_THRESHOLDS, embedder=None):
+    """Stream `corpus` (an iterable of rows) through every rule file and,
+    where rows carry audio, speaker ID. Returns the report dict."""
+    rule_paths = list(dict.fromkeys(rule_paths))
+    embedder = embedder or ClipEmbedder()
+    labels, speakers, times = [], [], []
+    predictions = {path: [] for path in rule_paths}
+    classify_s = dict.fromkeys(rule_paths, 0.0)
+    embeddings, enroll = [], {}
+    embed_s = 0.0
+
+    t0 = time.perf_counter()
+    procs = ProcessPoolExecutor(workers) if workers > 1 else None
+    threads = ThreadPoolExecutor(workers)
+    try:
+        pending = []  # (rule path, future) for the batch in flight
+        for rows in batched(corpus, batch):
+            scored = [r for r in rows if r.get("split") != "enroll"]
+            texts = [r.get("text", "") for r in scored]
+            for path, future in pending:
+                preds, seconds = future.result()
+                predictions[path] += preds
+                classify_s[path] += seconds
+            pending = [
+                (path, procs.submit(_classify_chunk, path, texts) if procs else _Done(_classify_chunk(path, texts)))
+                for path in rule_paths
+            ]
+            labels += [r.get("label", NEUTRAL) for r in scored]
+            speakers += [r.get("speaker") for r in scored]
+            times += [r.get("t") for r in scored]
+
+            t_embed = time.perf_counter()
+            for row, emb in zip(rows, threads.map(embedder, rows)):
+                if row.get("split") == "enroll":
+                    if emb is not None and row.get("speaker"):
+                        enroll.setdefault(row["speaker"], []).append(emb)
+                else:
+                    embeddings.append(emb)
+            embed_s += time.perf_counter() - t_embed
+        for path, future in pending:
+            preds, seconds = future.result()
+            predictions[path] += preds
+            classify_s[path] += seconds
+    finally:
+        threads.shutdown()
+        if procs:
+            procs.shutdown()
+    wall = time.perf_counter() - t0
+
+    n = len(labels)
+    report = {
+        "corpus": {"utterances": n, "enrollment": sum(map(len, enroll.values())), "wall_seconds": round(wall, 3)},
+        "classifier": {},
+    }
+    for path in rule_paths:
+        seconds = classify_s[path]
+        report["classifier"][path] = {
+            **classification_report(labels, predictions[path]),
+            "seconds": round(seconds, 4),
+            "per_s": round(n / seconds, 1) if seconds else None,
+        }
+
+    if profiles is None and enroll:
+        profiles = {name: np.mean(np.stack(embs), axis=0) for name, embs in enroll.items()}
+    with_audio = [i for i, e in enumerate(embeddings) if e is not None]
+    if profiles and with_audio:
+        report["speaker"] = evaluate_speakers(
+            np.stack([embeddings[i] for i in with_audio]),
+            [speakers[i] for i in with_audio],
+            [times[i] for i in with_audio],
+            profiles, threshold, thresholds,
+        )
+        report["speaker"]["embedding"] = {
+            "seconds": round(embed_s, 3),
+            "encoded": embedder.encoded,
+            "cache_hits": embedder.cache.hits if embedder.cache is not None else 0,
+        }
+    return report
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def _method(pred, true, names, seconds):
+    n = len(true)
+    return {**speaker_report(pred, true, names), "seconds": round(seconds, 4),
+            "per_s": round(n / seconds, 1) if seconds else None}
+
+
+def _run_tracker(embeddings, times, profiles, temperature):
+    tracker = SpeakerTracker(temperature=temperature)
+    index = {name: i for i, name in enumerate(profiles)}
+    out = np.empty(len(embeddings), dtype=np.int64)
+    for i, (emb, t) in enumerate(zip(embeddings, times)):
+        name, _ = tracker.update(emb, profiles, t)
+        out[i] = index[name] if name is not None else UNKNOWN
+    return out
+
+
+def evaluate_speakers(embeddings, speakers, times, profiles, threshold=SPEAKER_THRESHOLD,
+                      thresholds=DEFAULT_THRESHOLDS):
+    """Compare the per-phrase reference, its batched equivalent and the
+    HMM tracker (at the default and a fitted temperature) on one set of
+    embeddings, plus a threshold sweep."""
+    from audio_modules.voice import identify_speaker
+    names = list(profiles)
+    index = {name: i for i, name in enumerate(names)}
+    true = np.array([index.get(s, UNKNOWN) for s in speakers])
+    matrix = np.stack([np.asarray(profiles[name], dtype=np.float64) for name in names])
+
+    def reference():
+        out = np.empty(len(embeddings), dtype=np.int64)
+        for i, emb in enumerate(embeddings):
+            name, _ = identify_speaker(emb, profiles, threshold)
+            out[i] = index[name] if name is not None else UNKNOWN
+        return out
+
+    ref, ref_s = _timed(reference)
+    (batch, _), batch_s = _timed(lambda: identify_batch(similarity_matrix(embeddings, matrix), threshold))
+    sims = similarity_matrix(embeddings, matrix)
+    # fit_temperature labels unenrolled voices as k (the "unknown" column)
+    fitted = fit_temperature(sims, np.where(true == UNKNOWN, len(names), true))
+    tracked, tracked_s = _timed(lambda: _run_tracker(embeddings, times, profiles, TEMPERATURE))
+    tuned, tuned_s = _timed(lambda: _run_tracker(embeddings, times, profiles, fitted))
+    return {
+        "profiles": names,
+        "threshold": threshold,
+        "fitted_temperature": fitted,  # in-sample: fit on this corpus
+        "methods": {
+            "identify_speaker": _method(ref, true, names, ref_s),
+            "batched": {**_method(batch, true, names, batch_s),
+                        "agrees_with_reference": round(float((batch == ref).mean()), 4)},
+            "tracker": {**_method(tracked, true, names, tracked_s), "temperature": TEMPERATURE},
+            "tracker_fitted": {**_method(tuned, true, names, tuned_s), "temperature": fitted},
+        },
+        "sweep": threshold_sweep(sims, true, thresholds),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  OUTPUT
+# ═══════════════════════════════════════════════════════════════════════════
+def _matrix_lines(confusion):
+    labels = ["(none)" if label is None else str(label) for label in confusion["labels"]]
+    width = max(6, *map(len, labels))
+    yield " " * (width + 2) + " ".join(f"{label[:width]:>{width}}" for label in labels)
+    for label, row in zip(labels, confusion["matrix"]):
+        yield f"  {label:<{width}}" + " ".join(f"{v:>{width}}" for v in row)
+
+
+def summary(report):
+    lines = [f"{report['corpus']['utterances']} utterances in {report['corpus']['wall_seconds']} s"]
+    for path, r in report["classifier"].items():
+        lines.append(f"classifier {path}: accuracy {r['accuracy']:.3f}  macro F1 {r['macro_f1']:.3f}  "
+                     f"{r['per_s'] or 0:,.0f} utt/s")
+        lines.extend(_matrix_lines(r["confusion"]))
+    speaker = report.get("speaker")
+    if speaker:
+        lines.append(f"speaker ID at {speaker['threshold']} "
+                     f"(fitted temperature {speaker['fitted_temperature']:.3f}):")
+        for name, m in speaker["methods"].items():
+            lines.append(f"  {name:<18} accuracy {m['accuracy']:.3f}  precision {m['precision']:.3f}  "
+                         f"recall {m['recall']:.3f}  false accept {m['false_accept']:.3f}  "
+                         f"{m['per_s'] or 0:,.0f} phrases/s")
+        lines.append("  threshold  accuracy  precision  recall  false_accept")
+        for row in speaker["sweep"]:
+            lines.append(f"  {row['threshold']:>9.2f}  {row['accuracy']:>8.3f}  {row['precision']:>9.3f}  "
+                         f"{row['recall']:>6.3f}  {row['false_accept']:>12.3f}")
+        e = speaker["embedding"]
+        lines.append(f"  embeddings: {e['encoded']} encoded, {e['cache_hits']} cached, {e['seconds']} s")
+    return "\n".join(lines)
+
+
+def parse_thresholds(value):
+    """"0.5:0.9:0.05" (start:stop:step, inclusive) or "0.6,0.65,0.7"."""
+    if ":" in value:
+        start, stop, step = map(float, value.split(":"))
+        return np.round(np.arange(start, stop + step / 2, step), 4)
+    return np.array([float(v) for v in value.split(",")])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", help="JSON-lines corpus")
+    parser.add_argument("--rules", nargs="+", default=[RULES_PATH], help="rule files to compare")
+    parser.add_argument("--profiles", help=".npz of voice embeddings keyed by name (default: enroll rows)")
+    parser.add_argument("--threshold", type=float, default=SPEAKER_THRESHOLD)
+    parser.add_argument("--thresholds", type=parse_thresholds, default=DEFAULT_THRESHOLDS,
+                        help="sweep as start:stop:step or a comma list")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch", type=int, default=BATCH)
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write cached embeddings")
+    parser.add_argument("--out", help="report path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    for path in args.rules:
+        try:
+            _rule_set(path)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"rules {path}: {e}")
+    profiles = None
+    if args.profiles:
+        with np.load(args.profiles) as archive:
+            profiles = {name: archive[name] for name in archive.files}
+    cache = None if args.no_cache else EmbeddingCache(EVAL_CACHE_DIR, EVAL_CACHE_SIZE)
+    embedder = ClipEmbedder(cache=cache)
+
+    report = run_evaluation(
+        read_corpus(args.corpus), args.rules, profiles, args.workers, args.batch,
+        args.threshold, args.thresholds, embedder,
+    )
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+        print(f"wrote {args.out}", file=sys.stderr)
+    else:
+        print(text)
+    print(summary(report), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
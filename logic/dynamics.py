@@ -1,3 +1,5 @@
+import time
+import numpy as np
 
 # ═══════════════════════════════════════════════════════════════════════════
 #  POWER ENGINE
@@ -5,45 +7,201 @@
 BASE_SCORE = 100
 FLOOR = 10
 DECAY_RATE = 0.95          # 5% silence penalty
+DECAY_PERIOD = 10.0        # seconds per DECAY_RATE step in time-based mode
 DEFINITIVE_GAIN = 15
 HESITATION_PENALTY = 10
 INTERRUPT_TRANSFER = 15
+SPEAKING_TIME_GAIN = 1.0   # per second of speech, when speaking-time scoring is on
 VISUAL_MULTIPLIER = 180    # scales influence % → pyvis node size
 
+DECAY_MODES = ("event", "time")
+
+
+class DecayClock:
+    """Selects the decay model and, in time mode, when scores were last settled.
+
+    "event": every action first decays all subjects by DECAY_RATE.
+    "time":  scores decay continuously by DECAY_RATE ** (dt / DECAY_PERIOD).
+             Stored raw_score values are exact as of t_ref; reads apply the
+             pending decay without touching state, and the next action
+             settles it. Since every subject decays by the same factor and
+             the floor is absorbing, settling lazily matches settling often.
+    """
+
+    __slots__ = ("mode", "t_ref")
+
+    def __init__(self, mode="event", t_ref=None):
+        self.mode = mode
+        self.t_ref = time.time() if t_ref is None else t_ref
+
+    @property
+    def timed(self):
+        return self.mode == "time"
+
+
+def decay_factor(dt):
+    return DECAY_RATE ** (max(0.0, dt) / DECAY_PERIOD)
+
+
+def decay_factors(t_ref, times):
+    """Vectorized per-event decay factors for a burst of timestamped events."""
+    times = np.maximum.accumulate(np.maximum(np.asarray(times, dtype=np.float64), t_ref))
+    gaps = np.diff(times, prepend=t_ref)
+    return np.power(DECAY_RATE, np.maximum(gaps, 0.0) / DECAY_PERIOD)
+
+
+def _scale_all(nodes, factor):
+    names = list(nodes)
+    scores = np.fromiter((nodes[n].raw_score for n in names), dtype=np.float64, count=len(names))
+    scores = np.maximum(FLOOR, scores * factor)
+    for name, score in zip(names, scores.tolist()):
+        nodes[name].raw_score = score
+
+
+def settle(nodes, clock, now=None):
+    """Time mode: fold the decay accrued since clock.t_ref into raw_score."""
+    now = time.time() if now is None else now
+    if now > clock.t_ref:
+        factor = decay_factor(now - clock.t_ref)
+        if factor < 1.0:
+            _scale_all(nodes, factor)
+        clock.t_ref = now
+
+
+def set_decay_mode(nodes, clock, mode, now=None):
+    if mode == clock.mode:
+        return
+    if clock.timed:
+        settle(nodes, clock, now)
+    clock.mode = mode
+    clock.t_ref = time.time() if now is None else now
+
+
+def _decay(nodes, clock, now):
+    if clock is not None and clock.timed:
+        settle(nodes, clock, now)
+    else:
+        apply_decay(nodes)
+
+
 def apply_decay(nodes):
     """Apply 5% silence penalty to every subject. Called before each action."""
-    for name in nodes:
-        nodes[name]["raw_score"] = max(FLOOR, nodes[name]["raw_score"] * DECAY_RATE)
+    for node in nodes.values():
+        node.raw_score = max(FLOOR, node.raw_score * DECAY_RATE)
+
 
+def apply_statement(nodes, person, delta, counter=None, clock=None, now=None):
+    """Classified statement: decay all, then `delta` to speaker (floored).
 
-def apply_definitive(nodes, person):
+    `counter` names the per-subject tally to bump (e.g. "statements").
+    """
+    _decay(nodes, clock, now)
+    node = nodes[person]
+    node.raw_score = max(FLOOR, node.raw_score + delta)
+    if counter:
+        node.bump(counter)
+
+
+def apply_definitive(nodes, person, clock=None, now=None):
     """Definitive statement: decay all, then +15 to speaker."""
-    apply_decay(nodes)
-    nodes[person]["raw_score"] += DEFINITIVE_GAIN
-    nodes[person]["statements"] += 1
+    apply_statement(nodes, person, DEFINITIVE_GAIN, "statements", clock, now)
 
 
-def apply_hesitation(nodes, person):
+def apply_hesitation(nodes, person, clock=None, now=None):
     """Hesitation: decay all, then -10 to speaker."""
-    apply_decay(nodes)
-    nodes[person]["raw_score"] = max(FLOOR, nodes[person]["raw_score"] - HESITATION_PENALTY)
-    nodes[person]["hesitations"] += 1
+    apply_statement(nodes, person, -HESITATION_PENALTY, "hesitations", clock, now)
 
 
-def apply_interruption(nodes, interrupter, interrupted):
+def apply_interruption(nodes, interrupter, interrupted, clock=None, now=None):
     """ELO steal: decay all, then +15 to interrupter, -15 to interrupted."""
-    apply_decay(nodes)
-    nodes[interrupter]["raw_score"] += INTERRUPT_TRANSFER
-    nodes[interrupted]["raw_score"] = max(FLOOR, nodes[interrupted]["raw_score"] - INTERRUPT_TRANSFER)
+    _decay(nodes, clock, now)
+    nodes[interrupter].raw_score += INTERRUPT_TRANSFER
+    nodes[interrupted].raw_score = max(FLOOR, nodes[interrupted].raw_score - INTERRUPT_TRANSFER)
+
+
+def apply_neutral(nodes, clock=None, now=None):
+    """Neutral statement: decay only (silence penalty to everyone)."""
+    _decay(nodes, clock, now)
+
+
+def apply_speaking_time(nodes, person, seconds):
+    """Optional floor-time credit: +1 per second spoken. No decay of its own."""
+    gain = SPEAKING_TIME_GAIN * seconds
+    nodes[person].raw_score += gain
+    return gain
+
+
+def apply_events(nodes, events, clock, rules=None):
+    """Apply a burst of (kind, actor, target, t) events in one pass.
+
+    kind is a rule-file category (score effect and tally from `rules`,
+    default: the live rule file), "neutral", "interruption" or "speaking"
+    (target is then the seconds spoken; credited without decay). t is the
+    event time for time-based decay (None: now). Events naming unknown
+    subjects are skipped. Scores stay in one array for the whole burst;
+    in time mode all decay factors come from one vectorized call, which
+    is also the burst's catch-up since clock.t_ref.
+    """
+    if rules is None:
+        from logic.rules import get_classifier
+        rules = get_classifier().rules
+    names = list(nodes)
+    idx = {name: i for i, name in enumerate(names)}
+    events = [
+        e for e in events
+        if e[1] in idx and (e[0] != "interruption" or e[2] in idx)
+    ]
+    if not events:
+        return
+    decays = [kind != "speaking" for kind, *_ in events]
+    if clock is not None and clock.timed:
+        now = time.time()
+        times = [now if t is None else t for (*_, t), d in zip(events, decays) if d]
+        timed = iter(decay_factors(clock.t_ref, times).tolist() if times else ())
+        factors = [next(timed) if d else 1.0 for d in decays]
+        if times:
+            clock.t_ref = max(clock.t_ref, max(times))
+    else:
+        factors = [DECAY_RATE if d else 1.0 for d in decays]
+
+    scores = np.fromiter((nodes[n].raw_score for n in names), dtype=np.float64, count=len(names))
+    for (kind, actor, target, _), factor in zip(events, factors):
+        if factor < 1.0:
+            np.maximum(FLOOR, scores * factor, out=scores)
+        a = idx[actor]
+        if kind == "interruption":
+            b = idx[target]
+            scores[a] += INTERRUPT_TRANSFER
+            scores[b] = max(FLOOR, scores[b] - INTERRUPT_TRANSFER)
+        elif kind == "speaking":
+            scores[a] += SPEAKING_TIME_GAIN * target
+        else:
+            category = rules.category(kind)
+            if category is not None:
+                scores[a] = max(FLOOR, scores[a] + category.score)
+                if category.counter:
+                    nodes[actor].bump(category.counter)
+    for name, score in zip(names, scores.tolist()):
+        nodes[name].raw_score = score
+
+
+def get_scores(nodes, clock=None, now=None):
+    """Current raw scores. In time mode includes decay accrued since t_ref."""
+    if clock is None or not clock.timed:
+        return {name: n.raw_score for name, n in nodes.items()}
+    now = time.time() if now is None else now
+    factor = decay_factor(now - clock.t_ref)
+    return {name: max(FLOOR, n.raw_score * factor) for name, n in nodes.items()}
 
 
-def get_influence(nodes):
+def get_influence(nodes, clock=None, now=None):
     """Zero-sum normalization. Returns {name: percentage} (0-100)."""
-    total = sum(n["raw_score"] for n in nodes.values())
+    scores = get_scores(nodes, clock, now)
+    total = sum(scores.values())
     if total == 0:
         count = len(nodes) or 1
         return {name: 100.0 / count for name in nodes}
-    return {name: (n["raw_score"] / total) * 100 for name, n in nodes.items()}
+    return {name: (score / total) * 100 for name, score in scores.items()}
 
 
 def get_node_size(influence_pct):
@@ -0,0 +1,325 @@
+
+import json
+import time
+import base64
+import queue
+import asyncio
+import threading
+import urllib.request
+from dataclasses import asdict
+
+from audio_modules.channel import ListenerResult
+from logic.dynamics import DECAY_MODES, get_influence, get_scores
+from logic.models import MODELS
+from logic.session import (
+    new_session,
+    add_subject,
+    change_decay_mode,
+    record_classification,
+    record_interruption,
+    process_results,
+)
+from logic.snapshot import load_snapshot
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  ENGINE SERVICE
+# ═══════════════════════════════════════════════════════════════════════════
+# The engine state and the logic.session functions, driven by an asyncio
+# loop instead of a Streamlit rerun. Events are JSON-able dicts:
+#
+#   {"type": "subject", "name": "Alice"}
+#   {"type": "utterance", "text": "...", "speaker": "Alice", "confidence": 0.8,
+#    "interrupted": null, "start": 12.1, "end": 13.4}
+#   {"type": "classification", "speaker": "Alice", "classification": "definitive"}
+#   {"type": "interruption", "interrupter": "Alice", "interrupted": "Bob"}
+#   {"type": "decay_mode", "mode": "time"}
+#   {"type": "settings", "settings": {"score_speaking_time": true, "scoring_model": "elo",
+#                                     "compare_models": ["default"]}}
+#   {"type": "restore", "snapshot": "<base64 .glmsnap bytes>"}
+#   {"type": "reset"}
+#
+# A dashboard posting to the service forwards every action that changes
+# engine state, so the two stay in step. Not mirrored: voice profiles,
+# enrollment and the long-session memory budget (local to the dashboard),
+# and anything the dashboard applied while the service was unreachable.
+# Events are applied in batches; after each batch subscribers get the
+# latest snapshot. Subscribers that fall behind skip to the newest one.
+MAX_BATCH = 1000           # events applied per engine step
+PUBLISH_INTERVAL = 0.05    # s; minimum gap between snapshots
+EVENT_TYPES = (
+    "subject", "utterance", "classification", "interruption",
+    "decay_mode", "settings", "restore", "reset",
+)
+
+
+def _model_name(value):
+    return isinstance(value, str) and value in MODELS
+
+
+# setting -> check of its value; settings events may only carry these
+SETTING_CHECKS = {
+    "score_speaking_time": lambda v: isinstance(v, bool),
+    "scoring_model": _model_name,
+    "compare_models": lambda v: isinstance(v, list) and all(_model_name(m) for m in v),
+}
+
+
+def validate_event(event):
+    """Raise ValueError unless `event` is a well-formed event dict."""
+    if not isinstance(event, dict) or event.get("type") not in EVENT_TYPES:
+        raise ValueError(f"event type must be one of {EVENT_TYPES}")
+    required = {
+        "subject": ("name",),
+        "utterance": ("text",),
+        "classification": ("speaker", "classification"),
+        "interruption": ("interrupter", "interrupted"),
+        "decay_mode": ("mode",),
+        "settings": (),
+        "restore": ("snapshot",),
+        "reset": (),
+    }[event["type"]]
+    missing = [k for k in required if not isinstance(event.get(k), str)]
+    if missing:
+        raise ValueError(f"{event['type']} event needs string field(s) {missing}")
+    if event["type"] == "decay_mode" and event["mode"] not in DECAY_MODES:
+        raise ValueError(f"decay mode must be one of {DECAY_MODES}")
+    if event["type"] == "settings":
+        settings = event.get("settings")
+        if not isinstance(settings, dict):
+            raise ValueError("settings event needs an object field 'settings'")
+        bad = [k for k, v in settings.items() if k not in SETTING_CHECKS or not SETTING_CHECKS[k](v)]
+        if bad:
+            raise ValueError(
+                f"invalid setting(s) {bad}; known: {list(SETTING_CHECKS)}, models: {sorted(MODELS)}"
+            )
+
+
+def result_event(result):
+    """Utterance event for a ListenerResult (timing stamps stay local)."""
+    d = asdict(result)
+    d.pop("timing")
+    d.pop("seq")
+    d["type"] = "utterance"
+    return d
+
+
+class Engine:
+    """Owns one session and applies posted events to it on the event loop.
+
+    All mutation happens in the run() task, so handlers only enqueue.
+    """
+
+    def __init__(self, state=None, max_batch=MAX_BATCH, publish_interval=PUBLISH_INTERVAL):
+        self.state = state if state is not None else new_session()
+        self.max_batch = max_batch
+        self.publish_interval = publish_interval
+        self.seq = 0           # events accepted
+        self.applied = 0       # events applied
+        self.errors = 0
+        self.version = 0       # engine steps that changed state
+        self._inbox = asyncio.Queue()
+        self._subscribers = set()
+        self._changed = asyncio.Event()
+
+    # ── Input ──
+    def post(self, event):
+        """Validate and enqueue one event. Returns its sequence number."""
+        validate_event(event)
+        self.seq += 1
+        self._inbox.put_nowait(event)
+        return self.seq
+
+    def post_many(self, events):
+        for event in events:
+            validate_event(event)
+        for event in events:
+            self._inbox.put_nowait(event)
+        self.seq += len(events)
+        return self.seq
+
+    async def attach(self, channel, fallback_speaker=None):
+        """Feed a ResultChannel (e.g. a local AudioListener) into the engine."""
+        while True:
+            for result in await channel.aget_many(self.max_batch):
+                if fallback_speaker and result.speaker is None:
+                    result.speaker = fallback_speaker
+                self.seq += 1
+                self._inbox.put_nowait(result)
+
+    # ── Apply ──
+    @staticmethod
+    def _result(event):
+        """The ListenerResult an utterance event carries, else None."""
+        if isinstance(event, ListenerResult):
+            return event
+        if event["type"] != "utterance":
+            return None
+        return ListenerResult(
+            event["text"],
+            speaker=event.get("speaker"),
+            confidence=float(event.get("confidence") or 0.0),
+            interrupted=event.get("interrupted"),
+            start=event.get("start"),
+            end=event.get("end"),
+        )
+
+    def _apply(self, event):
+        state = self.state
+        kind = event["type"]
+        if kind == "subject":
+            add_subject(state, event["name"])
+        elif kind == "classification":
+            if event["speaker"] in state["nodes"]:
+                record_classification(state, event["speaker"], event["classification"], event.get("text"))
+        elif kind == "interruption":
+            src, dst = event["interrupter"], event["interrupted"]
+            if src != dst and src in state["nodes"] and dst in state["nodes"]:
+                record_interruption(state, src, dst, manual=True)
+        elif kind == "decay_mode":
+            change_decay_mode(state, event["mode"])
+        elif kind == "settings":
+            state["settings"].update(event["settings"])
+        elif kind == "restore":
+            self._replace(load_snapshot(base64.b64decode(event["snapshot"])))
+        elif kind == "reset":
+            self._replace(new_session())
+
+    def _replace(self, session):
+        """Swap in a whole new session, keeping the state dict's identity."""
+        self.state.clear()
+        self.state.update({key: session[key] for key in new_session()})
+
+    def _error(self, e):
+        self.errors += 1
+        print(f"Engine Error: {type(e).__name__}: {e}")
+
+    def step(self, batch):
+        """Apply a batch in order; each run of consecutive utterances goes
+        through process_results() as one burst (one decay catch-up)."""
+        burst = []
+        for event in batch + [None]:
+            try:
+                result = self._result(event) if event is not None else None
+            except (KeyError, ValueError, TypeError) as e:
+                self._error(e)
+                continue
+            if result is not None:
+                burst.append(result)
+                continue
+            if burst:
+                try:
+                    process_results(self.state, burst)
+                except (KeyError, ValueError, TypeError) as e:
+                    self._error(e)
+                burst = []
+            if event is not None:
+                try:
+                    self._apply(event)
+                except (KeyError, ValueError, TypeError) as e:
+                    self._error(e)
+        self.applied += len(batch)
+        self.version += 1
+        self._changed.set()
+
+    async def run(self):
+        publisher = asyncio.create_task(self._publish_loop())
+        try:
+            while True:
+                batch = [await self._inbox.get()]
+                while len(batch) < self.max_batch and not self._inbox.empty():
+                    batch.append(self._inbox.get_nowait())
+                self.step(batch)
+                await asyncio.sleep(0)  # let handlers and the publisher run
+        finally:
+            publisher.cancel()
+
+    # ── Output ──
+    def snapshot(self):
+        state = self.state
+        nodes, clock = state["nodes"], state["clock"]
+        metrics = state["interactions"].metrics()
+        return {
+            "version": self.version,
+            "seq": self.applied,
+            "t": time.time(),
+            "influence": {k: round(v, 3) for k, v in get_influence(nodes, clock).items()},
+            "scores": {k: round(v, 2) for k, v in get_scores(nodes, clock).items()},
+            "net_dominance": {k: m["net_dominance"] for k, m in metrics.items()},
+            "interruptions": state["interactions"].total,
+        }
+
+    def subscribe(self):
+        """Queue that always holds at most the newest snapshot."""
+        q = asyncio.Queue(maxsize=1)
+        self._subscribers.add(q)
+        q.put_nowait(self.snapshot())
+        return q
+
+    def unsubscribe(self, q):
+        self._subscribers.discard(q)
+
+    async def _publish_loop(self):
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            if self._subscribers:
+                snap = self.snapshot()
+                for q in self._subscribers:
+                    if q.full():
+                        q.get_nowait()  # drop the stale snapshot
+                    q.put_nowait(snap)
+            await asyncio.sleep(self.publish_interval)
+
+    def stats(self):
+        return {
+            "accepted": self.seq,
+            "applied": self.applied,
+            "pending": self._inbox.qsize(),
+            "errors": self.errors,
+            "version": self.version,
+            "subscribers": len(self._subscribers),
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CLIENT
+# ═══════════════════════════════════════════════════════════════════════════
+class RemoteEngine:
+    """Forwards events to an engine service from a background thread.
+
+    send() never blocks the caller; events are batched into one POST per
+    flush. If the service is unreachable the batch is dropped and counted.
+    """
+
+    def __init__(self, url, max_batch=500, timeout=2.0):
+        self.url = url.rstrip("/")
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.sent = 0
+        self.failed = 0
+        self.last_error = None
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def send(self, event):
+        self._queue.put(event)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            request = urllib.request.Request(
+                f"{self.url}/events", data=json.dumps(batch).encode(),
+                headers={"Content-Type": "application/json"}, method="POST",
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout):
+                    pass
+                self.sent += len(batch)
+            except OSError as e:
+                self.failed += len(batch)
+                self.last_error = str(e)
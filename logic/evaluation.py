@@ -0,0 +1,121 @@
+
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  EVALUATION METRICS
+# ═══════════════════════════════════════════════════════════════════════════
+# Scores classifier and speaker-ID output against a labelled corpus (see
+# evaluate.py). Everything works on whole arrays, so a corpus is scored in
+# one pass and a threshold sweep reuses one similarity matrix. Speaker
+# labels are profile indices, with -1 for "no enrolled subject" (both as
+# the truth for unenrolled voices and as the prediction when nobody is
+# credited).
+UNKNOWN = -1
+DEFAULT_THRESHOLDS = np.round(np.arange(0.40, 0.951, 0.05), 2)
+
+
+def confusion_matrix(true, pred, labels):
+    """(k, k) counts, rows = true label, columns = predicted, in `labels` order."""
+    index = {label: i for i, label in enumerate(labels)}
+    t = np.fromiter((index[x] for x in true), dtype=np.int64, count=len(true))
+    p = np.fromiter((index[x] for x in pred), dtype=np.int64, count=len(pred))
+    matrix = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    np.add.at(matrix, (t, p), 1)
+    return matrix
+
+
+def class_metrics(matrix, labels):
+    """{label: precision, recall, f1, support} from a confusion matrix."""
+    tp = np.diag(matrix).astype(np.float64)
+    predicted = matrix.sum(axis=0)
+    support = matrix.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    return {
+        label: {
+            "precision": round(float(precision[i]), 4),
+            "recall": round(float(recall[i]), 4),
+            "f1": round(float(f1[i]), 4),
+            "support": int(support[i]),
+        }
+        for i, label in enumerate(labels)
+    }
+
+
+def classification_report(true, pred, labels=None):
+    """Accuracy, macro F1, per-class metrics and the confusion matrix."""
+    labels = list(labels) if labels is not None else sorted(set(true) | set(pred))
+    matrix = confusion_matrix(true, pred, labels)
+    classes = class_metrics(matrix, labels)
+    present = [c for c in classes.values() if c["support"]]
+    n = int(matrix.sum())
+    return {
+        "n": n,
+        "accuracy": round(float(np.trace(matrix)) / n, 4) if n else 0.0,
+        "macro_f1": round(sum(c["f1"] for c in present) / len(present), 4) if present else 0.0,
+        "classes": classes,
+        "confusion": {"labels": labels, "matrix": matrix.tolist()},
+    }
+
+
+# ── Speaker ID ──
+def similarity_matrix(embeddings, profiles):
+    """(n, k) cosine similarity of every embedding to every profile row."""
+    emb = np.asarray(embeddings, dtype=np.float64)
+    prof = np.asarray(profiles, dtype=np.float64)
+    emb = emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+    prof = prof / np.maximum(np.linalg.norm(prof, axis=1, keepdims=True), 1e-12)
+    return emb @ prof.T
+
+
+def identify_batch(similarities, threshold):
+    """identify_speaker() for a whole matrix: (best index or -1, its similarity)."""
+    sims = np.asarray(similarities)
+    if sims.shape[1] == 0:
+        return np.full(sims.shape[0], UNKNOWN), np.zeros(sims.shape[0])
+    best = sims.argmax(axis=1)
+    score = sims[np.arange(sims.shape[0]), best]
+    credited = (score >= threshold) & (score > 0)
+    return np.where(credited, best, UNKNOWN), np.where(credited, score, 0.0)
+
+
+def speaker_report(pred, true, names=None):
+    """Speaker-ID metrics. `pred`/`true` are profile indices or -1.
+
+    accuracy counts "nobody" as correct for unenrolled voices; precision
+    is over credited phrases, recall over enrolled-speaker phrases, and
+    false_accept is the share of unenrolled phrases credited to someone.
+    """
+    pred = np.asarray(pred)
+    true = np.asarray(true)
+    n = pred.size
+    credited = pred != UNKNOWN
+    enrolled = true != UNKNOWN
+    hit = credited & (pred == true)
+    report = {
+        "n": int(n),
+        "accuracy": round(float((pred == true).mean()), 4) if n else 0.0,
+        "precision": round(float(hit.sum() / credited.sum()), 4) if credited.any() else 0.0,
+        "recall": round(float(hit.sum() / enrolled.sum()), 4) if enrolled.any() else 0.0,
+        "coverage": round(float(credited.mean()), 4) if n else 0.0,
+        "false_accept": round(float((credited & ~enrolled).sum() / (~enrolled).sum()), 4) if (~enrolled).any() else 0.0,
+    }
+    if names is not None:
+        labels = [*names, None]
+        lookup = np.array(labels, dtype=object)
+        report["confusion"] = {
+            "labels": labels,
+            "matrix": confusion_matrix(lookup[true].tolist(), lookup[pred].tolist(), labels).tolist(),
+        }
+    return report
+
+
+def threshold_sweep(similarities, true, thresholds=DEFAULT_THRESHOLDS):
+    """speaker_report() (without confusion) at each threshold, from one matrix."""
+    rows = []
+    for threshold in thresholds:
+        pred, _ = identify_batch(similarities, threshold)
+        rows.append({"threshold": float(threshold), **speaker_report(pred, true)})
+    return rows
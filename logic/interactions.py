@@ -0,0 +1,261 @@
+
+import time
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  INTERACTION GRAPH
+# ═══════════════════════════════════════════════════════════════════════════
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOL = 1e-6
+PAGERANK_MAX_ITER = 100
+PAGERANK_EXACT_MAX = 256    # subjects up to which the exact inverse is kept
+PAGERANK_REBUILD = 1000     # incremental updates before the inverse is recomputed
+
+
+class InteractionGraph:
+    """Dense interruption adjacency matrix with incrementally kept metrics.
+
+    matrix[i, j] counts how often subject i interrupted subject j. Degrees,
+    net dominance and reciprocity are updated in O(1) per interruption.
+
+    PageRank solves r = (1-d)/n * 1^T (I - dS)^-1 for the row-stochastic
+    transition S. Up to PAGERANK_EXACT_MAX subjects the inverse is built on
+    the first read and then kept current per interruption: one event
+    changes one row of S, so a Sherman-Morrison rank-one update costs
+    O(n^2) instead of a power iteration. The inverse is recomputed every
+    PAGERANK_REBUILD updates to shed rounding drift, and dropped when a
+    subject joins (every dangling row changes). Larger graphs fall back to
+    a power iteration on read, warm-started from the previous vector.
+    """
+
+    def __init__(self, capacity=8):
+        self.names = []
+        self.index = {}
+        self.matrix = np.zeros((capacity, capacity), dtype=np.int32)
+        self.out_degree = np.zeros(capacity, dtype=np.int64)
+        self.in_degree = np.zeros(capacity, dtype=np.int64)
+        self.total = 0
+        self.reciprocal = 0  # sum over unordered pairs of min(A[i,j], A[j,i])
+        self._ev_time = np.zeros(64, dtype=np.float64)
+        self._ev_src = np.zeros(64, dtype=np.int32)
+        self._ev_dst = np.zeros(64, dtype=np.int32)
+        self.n_events = 0
+        self._ev_sorted = True   # event times non-decreasing (events() can bisect)
+        self._rank = None
+        self._rank_dirty = True
+        self._inv = None         # (I - d*S)^-1 while kept incrementally
+        self._inv_updates = 0
+
+    def __len__(self):
+        return len(self.names)
+
+    # ── Updates ──
+    def add_subject(self, name):
+        if name in self.index:
+            return self.index[name]
+        i = len(self.names)
+        if i == self.matrix.shape[0]:
+            self._grow(2 * i)
+        self.names.append(name)
+        self.index[name] = i
+        self._rank = None
+        self._rank_dirty = True
+        self._inv = None
+        return i
+
+    def _grow(self, capacity):
+        n = self.matrix.shape[0]
+        matrix = np.zeros((capacity, capacity), dtype=self.matrix.dtype)
+        matrix[:n, :n] = self.matrix
+        self.matrix = matrix
+        self.out_degree = np.resize(self.out_degree, capacity)
+        self.in_degree = np.resize(self.in_degree, capacity)
+        self.out_degree[n:] = 0
+        self.in_degree[n:] = 0
+
+    def record(self, interrupter, interrupted, t=None):
+        """Count one interruption. O(1) apart from amortised growth, plus
+        the O(n^2) PageRank update while the inverse is kept."""
+        i = self.add_subject(interrupter)
+        j = self.add_subject(interrupted)
+        old_row = self._transition_row(j) if self._inv is not None else None
+        # min(A_ij, A_ji) grows only if A_ij was the smaller side
+        if self.matrix[i, j] < self.matrix[j, i]:
+            self.reciprocal += 1
+        self.matrix[i, j] += 1
+        self.out_degree[i] += 1
+        self.in_degree[j] += 1
+        self.total += 1
+        self._rank_dirty = True
+        if old_row is not None:
+            self._update_inverse(j, self._transition_row(j) - old_row)
+
+        k = self.n_events
+        if k == self._ev_time.size:
+            size = 2 * k
+            self._ev_time = np.resize(self._ev_time, size)
+            self._ev_src = np.resize(self._ev_src, size)
+            self._ev_dst = np.resize(self._ev_dst, size)
+        self._ev_time[k] = time.time() if t is None else t
+        if k and self._ev_time[k] < self._ev_time[k - 1]:
+            self._ev_sorted = False
+        self._ev_src[k] = i
+        self._ev_dst[k] = j
+        self.n_events = k + 1
+
+    # ── Persistence ──
+    def to_arrays(self):
+        """(arrays, meta) covering the full graph state (see logic.snapshot)."""
+        n, k = len(self.names), self.n_events
+        arrays = {
+            "matrix": self.matrix[:n, :n],
+            "out_degree": self.out_degree[:n],
+            "in_degree": self.in_degree[:n],
+            "ev_time": self._ev_time[:k],
+            "ev_src": self._ev_src[:k],
+            "ev_dst": self._ev_dst[:k],
+        }
+        return arrays, {"names": list(self.names), "total": self.total, "reciprocal": self.reciprocal}
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        names = meta["names"]
+        n, k = len(names), arrays["ev_time"].size
+        graph = cls(capacity=max(8, n))
+        graph.names = list(names)
+        graph.index = {name: i for i, name in enumerate(names)}
+        graph.matrix[:n, :n] = arrays["matrix"]
+        graph.out_degree[:n] = arrays["out_degree"]
+        graph.in_degree[:n] = arrays["in_degree"]
+        size = max(64, k)
+        graph._ev_time = np.zeros(size, dtype=np.float64)
+        graph._ev_src = np.zeros(size, dtype=np.int32)
+        graph._ev_dst = np.zeros(size, dtype=np.int32)
+        graph._ev_time[:k] = arrays["ev_time"]
+        graph._ev_src[:k] = arrays["ev_src"]
+        graph._ev_dst[:k] = arrays["ev_dst"]
+        graph.n_events = k
+        graph._ev_sorted = bool(np.all(np.diff(graph._ev_time[:k]) >= 0))
+        graph.total = meta["total"]
+        graph.reciprocal = meta["reciprocal"]
+        return graph
+
+    # ── Reads ──
+    def count(self, interrupter, interrupted):
+        i, j = self.index.get(interrupter), self.index.get(interrupted)
+        if i is None or j is None:
+            return 0
+        return int(self.matrix[i, j])
+
+    def items(self):
+        """((interrupter, interrupted), count) for every non-zero pair."""
+        n = len(self.names)
+        src, dst = np.nonzero(self.matrix[:n, :n])
+        for i, j in zip(src.tolist(), dst.tolist()):
+            yield (self.names[i], self.names[j]), int(self.matrix[i, j])
+
+    def events(self, since=None):
+        """[(time, interrupter, interrupted)] in arrival order, those at or
+        after `since` if given."""
+        times = self._ev_time[:self.n_events]
+        if since is None:
+            picked = range(self.n_events)
+        elif self._ev_sorted:
+            picked = range(int(np.searchsorted(times, since, side="left")), self.n_events)
+        else:
+            picked = np.flatnonzero(times >= since).tolist()
+        return [
+            (float(self._ev_time[k]), self.names[self._ev_src[k]], self.names[self._ev_dst[k]])
+            for k in picked
+        ]
+
+    def net_dominance(self):
+        """Interruptions made minus interruptions suffered, per subject."""
+        n = len(self.names)
+        return self.out_degree[:n] - self.in_degree[:n]
+
+    def reciprocity(self):
+        """Fraction of interruptions answered by one in the other direction."""
+        return 2 * self.reciprocal / self.total if self.total else 0.0
+
+    # ── PageRank ──
+    def _transition_row(self, j):
+        """Row j of S: where subject j's rank flows (uniform when dangling)."""
+        n = len(self.names)
+        if self.in_degree[j] == 0:
+            return np.full(n, 1.0 / n)
+        return self.matrix[:n, j] / float(self.in_degree[j])
+
+    def _update_inverse(self, j, delta):
+        """Sherman-Morrison: row j of S moved by `delta`; O(n^2)."""
+        if self._inv_updates >= PAGERANK_REBUILD:
+            self._inv = None
+            return
+        inv = self._inv
+        left = inv[:, j].copy()                        # M e_j
+        right = delta @ inv                            # delta^T M
+        inv += np.outer(left, right) * (PAGERANK_DAMPING / (1.0 - PAGERANK_DAMPING * right[j]))
+        self._inv_updates += 1
+
+    def _build_inverse(self, n):
+        flows = self.matrix[:n, :n].T.astype(np.float64)  # flows[j, i] = A[i, j]
+        out = flows.sum(axis=1)
+        dangling = out == 0
+        out[dangling] = 1.0
+        transition = flows / out[:, None]
+        transition[dangling] = 1.0 / n
+        self._inv = np.linalg.inv(np.eye(n) - PAGERANK_DAMPING * transition)
+        self._inv_updates = 0
+
+    def pagerank(self):
+        """PageRank where each interrupted subject passes rank to its interrupter.
+
+        Subjects that interrupt often, and interrupt subjects who themselves
+        dominate, score highest. Sums to 1.
+        """
+        n = len(self.names)
+        if n == 0:
+            return np.zeros(0)
+        if not self._rank_dirty and self._rank is not None and self._rank.size == n:
+            return self._rank
+        if n <= PAGERANK_EXACT_MAX:
+            if self._inv is None:
+                self._build_inverse(n)
+            rank = self._inv.sum(axis=0)
+            self._rank = rank / rank.sum()
+            self._rank_dirty = False
+            return self._rank
+        # Column-stochastic transition: interrupted j -> interrupter i
+        flows = self.matrix[:n, :n].T.astype(np.float64)  # flows[j, i] = A[i, j]
+        out = flows.sum(axis=1)
+        dangling = out == 0
+        out[dangling] = 1.0
+        transition = flows / out[:, None]
+        rank = self._rank if self._rank is not None and self._rank.size == n else np.full(n, 1.0 / n)
+        teleport = (1.0 - PAGERANK_DAMPING) / n
+        for _ in range(PAGERANK_MAX_ITER):
+            spread = PAGERANK_DAMPING * rank[dangling].sum() / n
+            new = teleport + spread + PAGERANK_DAMPING * (rank @ transition)
+            new /= new.sum()
+            if np.abs(new - rank).sum() < PAGERANK_TOL:
+                rank = new
+                break
+            rank = new
+        self._rank = rank
+        self._rank_dirty = False
+        return rank
+
+    def metrics(self):
+        """{name: {out, in, net, pagerank}} for display and export."""
+        n = len(self.names)
+        rank = self.pagerank()
+        net = self.net_dominance()
+        return {
+            name: {
+                "interruptions_made": int(self.out_degree[i]),
+                "interruptions_suffered": int(self.in_degree[i]),
+                "net_dominance": int(net[i]),
+                "pagerank": round(float(rank[i]), 4),
+            }
+            for i, name in enumerate(self.names[:n])
+        }
@@ -0,0 +1,437 @@
+
+import math
+import numpy as np
+
+from logic.dynamics import (
+    BASE_SCORE,
+    FLOOR,
+    DECAY_RATE,
+    DECAY_PERIOD,
+    DECAY_MODES,
+)
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SCORING MODELS
+# ═══════════════════════════════════════════════════════════════════════════
+# A scoring model turns the session's event stream into per-subject scores.
+# Models keep their state in numpy arrays indexed like state["people"] and
+# consume events in batches (EventBatch: one array per field), so several
+# models can be run side by side on the same stream for comparison.
+#
+# ModelRunner feeds registered models from the session's event log (the
+# same EngineEvents the Event Log shows), so a model added mid-session, or
+# to a restored snapshot, is back-filled by replaying the log. Log times
+# are processing (wall-clock) times, not the listener's event times, so in
+# time-based decay mode a replay of the default model only approximates
+# the engine; the session reads the default model from the engine itself
+# (logic.session.model_influence).
+STATEMENT, DECAY, INTERRUPTION, SPEAKING = range(4)
+DEFAULT_MODEL = "default"
+
+MODELS = {}  # name -> ScoringModel subclass
+
+
+def register_model(cls):
+    """Class decorator: make a ScoringModel selectable by its `name`."""
+    MODELS[cls.name] = cls
+    return cls
+
+
+def get_model(name, **params):
+    try:
+        return MODELS[name](**params)
+    except KeyError:
+        raise ValueError(f"unknown scoring model {name!r}; have {sorted(MODELS)}") from None
+
+
+def available_models():
+    return list(MODELS)
+
+
+def known_model_settings(settings):
+    """`settings` with model names this build lacks dropped (the selected
+    model falls back to the default), e.g. from an older or newer snapshot."""
+    selected = settings.get("scoring_model", DEFAULT_MODEL)
+    return {
+        **settings,
+        "scoring_model": selected if selected in MODELS else DEFAULT_MODEL,
+        "compare_models": [m for m in settings.get("compare_models", []) if m in MODELS],
+    }
+
+
+class EventBatch:
+    """Columnar events. kind: STATEMENT/DECAY/INTERRUPTION/SPEAKING;
+    actor/target: subject index or -1; value: score delta (statements,
+    interruption transfer) or speaking-time gain; t: event time, NaN for
+    per-event decay."""
+
+    __slots__ = ("kind", "actor", "target", "value", "t")
+
+    def __init__(self, kind, actor, target, value, t):
+        self.kind = kind
+        self.actor = actor
+        self.target = target
+        self.value = value
+        self.t = t
+
+    def __len__(self):
+        return self.kind.size
+
+    @classmethod
+    def from_rows(cls, rows):
+        """rows: [(kind, actor index, target index, value, t)]."""
+        cols = np.array(rows, dtype=np.float64).reshape(-1, 5).T
+        kind, actor, target, value, t = cols
+        return cls(kind.astype(np.int8), actor.astype(np.int32), target.astype(np.int32), value, t.copy())
+
+    @classmethod
+    def from_log(cls, log, index, timed=False):
+        """Batch for a slice of the session's event log (EngineEvents).
+
+        `index` maps subject names to positions; events naming unknown
+        subjects are skipped, as are errors, joins and mode changes.
+        """
+        rows = []
+        for e in log:
+            kind = e.kind
+            if kind in ("error", "joined", "decay_mode"):
+                continue
+            a = index.get(e.actor, -1)
+            t = e.t if timed else math.nan
+            if kind == "interruption":
+                b = index.get(e.target, -1)
+                if a >= 0 and b >= 0:
+                    rows.append((INTERRUPTION, a, b, e.delta, t))
+            elif kind == "speaking":
+                if a >= 0:
+                    rows.append((SPEAKING, a, -1, e.delta, t))
+            elif kind == "neutral" or a < 0:
+                rows.append((DECAY, -1, -1, 0.0, t))
+            else:
+                rows.append((STATEMENT, a, -1, e.delta, t))
+        return cls.from_rows(rows)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  PROTOCOL
+# ═══════════════════════════════════════════════════════════════════════════
+class ScoringModel:
+    """Base class and protocol for scoring models.
+
+    A model owns no per-session data: init() returns a state dict of
+    arrays, apply() updates it in place for a batch, scores() and
+    influence() read it. grow() extends it when subjects join.
+    """
+
+    name = None
+    label = None
+
+    def init(self, n):
+        raise NotImplementedError
+
+    def grow(self, state, n):
+        """Extend per-subject arrays to `n` subjects (new ones start fresh)."""
+        fresh = self.init(n)
+        for key, arr in state.items():
+            if isinstance(arr, np.ndarray) and arr.size < n:
+                fresh[key][:arr.size] = arr
+                state[key] = fresh[key]
+
+    def apply(self, state, batch):
+        raise NotImplementedError
+
+    def set_clock(self, state, mode, t):
+        """The session switched decay mode at time `t`. Most models ignore it."""
+
+    def scores(self, state, now=None):
+        return state["score"].copy()
+
+    def influence(self, state, now=None):
+        """Percent share (0-100) per subject."""
+        s = self.scores(state, now)
+        total = s.sum()
+        if s.size == 0:
+            return s
+        if total <= 0:
+            return np.full(s.size, 100.0 / s.size)
+        return s / total * 100
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  MODELS
+# ═══════════════════════════════════════════════════════════════════════════
+@register_model
+class DefaultModel(ScoringModel):
+    """The engine's model (logic/dynamics.py) on arrays.
+
+    Every statement, interruption and neutral event first decays all
+    scores (by DECAY_RATE per event, or per DECAY_PERIOD of event time when
+    events carry times); scores never drop below FLOOR. Decay is uniform, so
+    it is kept as one running log-factor and only folded into a subject's
+    score when that subject is touched (or at the end of the batch): the
+    per-event cost is independent of group size.
+    """
+
+    name = "default"
+    label = "Default (decay + transfer)"
+
+    def init(self, n):
+        return {"score": np.full(n, float(BASE_SCORE)), "t_ref": math.nan}
+
+    def _log_factors(self, state, batch):
+        decays = batch.kind != SPEAKING
+        logf = np.where(decays, math.log(DECAY_RATE), 0.0)
+        timed = decays & ~np.isnan(batch.t)
+        if timed.any():
+            t = batch.t[timed]
+            t_ref = state["t_ref"]
+            if math.isnan(t_ref):
+                t_ref = t[0]
+            t = np.maximum.accumulate(np.maximum(t, t_ref))
+            gaps = np.diff(t, prepend=t_ref)
+            logf[timed] = math.log(DECAY_RATE) * gaps / DECAY_PERIOD
+            state["t_ref"] = float(t[-1])
+        return np.cumsum(logf)
+
+    def apply(self, state, batch):
+        if not len(batch):
+            return
+        level = self._log_factors(state, batch).tolist()
+        s = state["score"]
+        at = np.zeros(s.size)  # log-decay level each score is valid at
+        kinds, actors, targets, values = (
+            batch.kind.tolist(), batch.actor.tolist(), batch.target.tolist(), batch.value.tolist(),
+        )
+        floor, exp = float(FLOOR), math.exp
+        for k, kind in enumerate(kinds):
+            a = actors[k]
+            if a < 0:
+                continue
+            lv = level[k]
+            # fold pending decay (floor-then-decay composes: F * f <= F)
+            s[a] = max(floor, s[a] * exp(lv - at[a]))
+            at[a] = lv
+            if kind == STATEMENT:
+                s[a] = max(floor, s[a] + values[k])
+            elif kind == INTERRUPTION:
+                b = targets[k]
+                s[b] = max(floor, s[b] * exp(lv - at[b]))
+                at[b] = lv
+                s[a] += values[k]
+                s[b] = max(floor, s[b] - values[k])
+            elif kind == SPEAKING:
+                s[a] += values[k]
+        np.maximum(floor, s * np.exp(level[-1] - at), out=s)
+
+    def set_clock(self, state, mode, t):
+        if mode == "time":
+            state["t_ref"] = t
+        elif not math.isnan(state["t_ref"]):
+            # leaving time mode settles the decay accrued up to the switch
+            state["score"] = self.scores(state, t)
+            state["t_ref"] = math.nan
+
+    def scores(self, state, now=None):
+        s = state["score"]
+        if now is None or math.isnan(state["t_ref"]):
+            return s.copy()
+        factor = DECAY_RATE ** (max(0.0, now - state["t_ref"]) / DECAY_PERIOD)
+        return np.maximum(FLOOR, s * factor)
+
+
+ELO_BASE = 1000.0
+ELO_K = 24.0
+ELO_SCALE = 400.0
+
+
+@register_model
+class EloModel(ScoringModel):
+    """Online Bradley-Terry: every interruption is a game the interrupter
+    wins; a statement is a game against the group's mean rating, won if
+    its score effect is positive and weighted by its size. Influence is
+    each subject's Bradley-Terry strength share, 10 ** (R / 400)."""
+
+    name = "elo"
+    label = "Elo (pairwise wins)"
+
+    def __init__(self, k=ELO_K, reference=15.0):
+        self.k = k
+        self.reference = reference  # |statement delta| that counts as one full game
+
+    def init(self, n):
+        return {"score": np.full(n, ELO_BASE)}
+
+    def apply(self, state, batch):
+        r = state["score"]
+        n = r.size
+        if not n or not len(batch):
+            return
+        total = float(r.sum())
+        k, ref, scale = self.k, self.reference, ELO_SCALE
+        kinds, actors, targets, values = (
+            batch.kind.tolist(), batch.actor.tolist(), batch.target.tolist(), batch.value.tolist(),
+        )
+        for i, kind in enumerate(kinds):
+            a = actors[i]
+            if kind == INTERRUPTION:
+                b = targets[i]
+                expected = 1.0 / (1.0 + 10 ** ((r[b] - r[a]) / scale))
+                step = k * (1.0 - expected)
+                r[a] += step
+                r[b] -= step
+            elif kind == STATEMENT and values[i]:
+                mean = total / n
+                expected = 1.0 / (1.0 + 10 ** ((mean - r[a]) / scale))
+                outcome = 1.0 if values[i] > 0 else 0.0
+                step = k * min(1.0, abs(values[i]) / ref) * (outcome - expected)
+                r[a] += step
+                total += step
+
+    def influence(self, state, now=None):
+        r = state["score"]
+        if not r.size:
+            return r.copy()
+        strength = np.power(10.0, (r - r.max()) / ELO_SCALE)
+        return strength / strength.sum() * 100
+
+
+EMA_ALPHA = 0.2
+
+
+@register_model
+class EmaModel(ScoringModel):
+    """Recent form: a per-subject exponential moving average of the
+    outcome of that subject's own events (1 = asserted or interrupted
+    someone, 0 = hesitated or was interrupted). Quiet subjects keep their
+    last value instead of decaying. Score is 0-100."""
+
+    name = "ema"
+    label = "EMA (recent form)"
+
+    def __init__(self, alpha=EMA_ALPHA):
+        self.alpha = alpha
+
+    def init(self, n):
+        return {"score": np.full(n, 50.0)}
+
+    def apply(self, state, batch):
+        s = state["score"]
+        alpha = self.alpha
+        kinds, actors, targets, values = (
+            batch.kind.tolist(), batch.actor.tolist(), batch.target.tolist(), batch.value.tolist(),
+        )
+        for i, kind in enumerate(kinds):
+            a = actors[i]
+            if kind == STATEMENT and values[i]:
+                s[a] += alpha * ((100.0 if values[i] > 0 else 0.0) - s[a])
+            elif kind == INTERRUPTION:
+                b = targets[i]
+                s[a] += alpha * (100.0 - s[a])
+                s[b] += alpha * (0.0 - s[b])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  RUNNER
+# ═══════════════════════════════════════════════════════════════════════════
+class ModelRunner:
+    """Runs several models side by side over one session's event log.
+
+    sync(state) reads the log entries added since the last call, builds one
+    EventBatch and applies it to every model, so each event is decoded once
+    however many models are compared.
+    """
+
+    def __init__(self, names=(DEFAULT_MODEL,), params=None, people=()):
+        params = params or {}
+        self.names = list(dict.fromkeys(names))
+        self.models = {name: get_model(name, **params.get(name, {})) for name in self.names}
+        self.states = {name: model.init(0) for name, model in self.models.items()}
+        self.people = []
+        self.index = {}
+        self.cursor = 0  # log entries consumed
+        self.mode = None  # decay mode in force at the cursor
+        self._grow(list(people))
+
+    def _grow(self, people):
+        if not people:
+            return
+        for name in people:
+            self.index[name] = len(self.people)
+            self.people.append(name)
+        for name, model in self.models.items():
+            model.grow(self.states[name], len(self.people))
+
+    def sync(self, state):
+        """Apply log entries added since the last sync. Returns events applied.
+
+        Subjects enter at their "joined" log entry, so a replay starts
+        late joiners where the engine did; subjects with no such entry
+        (sessions saved before joins were logged) enter up front. Logged
+        decay-mode switches are replayed in place.
+        """
+        log = state["log"]
+        if self.mode is None:
+            self.mode = _initial_mode(log, state["clock"].mode)
+        events = log[self.cursor:]
+        self.cursor += len(events)
+        markers = [(i, e) for i, e in enumerate(events) if e.kind in ("joined", "decay_mode")]
+        joining = {e.actor for _, e in markers if e.kind == "joined"}
+        self._grow([p for p in state["people"] if p not in self.index and p not in joining])
+        applied, start = 0, 0
+        for i, e in markers:
+            applied += self._apply_log(events[start:i])
+            if e.kind == "decay_mode":
+                self.mode = e.text
+                for name, model in self.models.items():
+                    model.set_clock(self.states[name], e.text, e.t)
+            elif e.actor not in self.index:
+                self._grow([e.actor])
+            start = i + 1
+        return applied + self._apply_log(events[start:])
+
+    def _apply_log(self, events):
+        if not events:
+            return 0
+        batch = EventBatch.from_log(events, self.index, timed=self.mode == "time")
+        self.apply(batch)
+        return len(batch)
+
+    def apply(self, batch):
+        for name, model in self.models.items():
+            model.apply(self.states[name], batch)
+
+    def scores(self, name, now=None):
+        values = self.models[name].scores(self.states[name], now)
+        return dict(zip(self.people, values.tolist()))
+
+    def influence(self, name, now=None):
+        values = self.models[name].influence(self.states[name], now)
+        return dict(zip(self.people, values.tolist()))
+
+    def compare(self, now=None):
+        """{model: {subject: influence %}} for every model."""
+        return {name: self.influence(name, now) for name in self.names}
+
+
+def _initial_mode(log, current):
+    """Decay mode at the start of the log: the one the first logged switch
+    left (there are only two), else the clock's current mode."""
+    for e in log:
+        if e.kind == "decay_mode":
+            return next(m for m in DECAY_MODES if m != e.text)
+    return current
+
+
+def get_runner(state, names, params=None):
+    """The session's ModelRunner for `names`, rebuilt (replaying the whole
+    log) when the selection changes or after a restore, and synced."""
+    runner = state.get("models")
+    if (
+        runner is None
+        or runner.names != list(dict.fromkeys(names))
+        or runner.cursor > len(state["log"])
+        or any(p not in state["nodes"] for p in runner.people)
+    ):
+        runner = state["models"] = ModelRunner(names, params)
+    runner.sync(state)
+    return runner
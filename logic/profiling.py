@@ -0,0 +1,138 @@
+
+import os
+import time
+import pstats
+import cProfile
+import marshal
+import threading
+from collections import deque
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  PROFILING
+# ═══════════════════════════════════════════════════════════════════════════
+PROFILE_ENV = "GLM_PROFILE"  # set to 1 to start sessions with profiling on
+HISTORY = 50                 # reruns kept for the section breakdown
+
+
+def profiling_default():
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+class SessionProfiler:
+    """Per-rerun section timer with opt-in cProfile aggregation.
+
+    Section laps are always recorded (two perf_counter calls each). When
+    profiling is on, each script run and each listener iteration is
+    profiled with cProfile and merged into a single pstats.Stats.
+
+    A rerun triggered by st.rerun() never reaches end_run(), so begin_run()
+    closes any run still open.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.last_sections = {}
+        self.history = deque(maxlen=HISTORY)
+        self._stats = None
+        self._lock = threading.Lock()
+        self._profile = None
+        self._sections = None
+        self._t_last = 0.0
+
+    # ── Script runs ──
+    def begin_run(self, profile=False):
+        self.end_run()
+        self._sections = {}
+        self._t_last = time.perf_counter()
+        if profile:
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError:  # another profiler is already active
+                self._profile = None
+
+    def lap(self, section):
+        """Attribute the time since the previous lap to `section`."""
+        if self._sections is None:
+            return
+        now = time.perf_counter()
+        self._sections[section] = self._sections.get(section, 0.0) + (now - self._t_last)
+        self._t_last = now
+
+    def end_run(self):
+        if self._profile is not None:
+            self._profile.disable()
+            self.add_profile(self._profile)
+            self._profile = None
+        if self._sections:
+            self.last_sections = self._sections
+            self.history.append(self._sections)
+            self.runs += 1
+        self._sections = None
+
+    def section_summary(self):
+        """[(section, last_ms, mean_ms)] over the recent history."""
+        totals = {}
+        for run in self.history:
+            for name, secs in run.items():
+                totals[name] = totals.get(name, 0.0) + secs
+        n = len(self.history) or 1
+        return [
+            (name, self.last_sections.get(name, 0.0) * 1000, total / n * 1000)
+            for name, total in totals.items()
+        ]
+
+    # ── Aggregated cProfile stats ──
+    def add_profile(self, profile):
+        """Merge a finished cProfile.Profile (from any thread)."""
+        with self._lock:
+            try:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+            except TypeError:  # profile recorded nothing
+                pass
+
+    def start_thread_profile(self):
+        """Enabled cProfile.Profile for one listener-loop iteration, or None."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        return profile
+
+    @property
+    def has_stats(self):
+        return self._stats is not None
+
+    def top(self, n=15, sort="cumulative"):
+        """Rows of the hottest functions for display."""
+        with self._lock:
+            if self._stats is None:
+                return []
+            self._stats.sort_stats(sort)
+            rows = []
+            for func in self._stats.fcn_list[:n]:
+                cc, nc, tt, ct, _ = self._stats.stats[func]
+                rows.append({
+                    "function": pstats.func_std_string(func),
+                    "calls": nc,
+                    "tottime ms": round(tt * 1000, 2),
+                    "cumtime ms": round(ct * 1000, 2),
+                })
+            return rows
+
+    def dump(self):
+        """Aggregated stats in pstats file format (snakeviz, flameprof, gprof2dot)."""
+        with self._lock:
+            if self._stats is None:
+                return b""
+            return marshal.dumps(self._stats.stats)
+
+    def reset(self):
+        with self._lock:
+            self._stats = None
+        self.history.clear()
+        self.last_sections = {}
@@ -0,0 +1,148 @@
+
+import time
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SESSION RECORDS
+# ═══════════════════════════════════════════════════════════════════════════
+# Slotted records for the per-subject, per-utterance and per-event state a
+# session accumulates. Timestamps are epoch seconds and confidence is a
+# 0-1 float; strings are produced only when something is rendered.
+
+class Subject:
+    """Engine state for one subject: raw score plus statement tallies.
+
+    statements/hesitations are fixed slots; any other counter named by the
+    rule file (e.g. "deferrals") lives in `tallies`.
+    """
+
+    __slots__ = ("raw_score", "statements", "hesitations", "tallies")
+
+    def __init__(self, raw_score, statements=0, hesitations=0, tallies=None):
+        self.raw_score = raw_score
+        self.statements = statements
+        self.hesitations = hesitations
+        self.tallies = tallies
+
+    def bump(self, counter):
+        if counter == "statements":
+            self.statements += 1
+        elif counter == "hesitations":
+            self.hesitations += 1
+        else:
+            if self.tallies is None:
+                self.tallies = {}
+            self.tallies[counter] = self.tallies.get(counter, 0) + 1
+
+    def counts(self):
+        """All tallies as {counter: n}."""
+        return {"statements": self.statements, "hesitations": self.hesitations, **(self.tallies or {})}
+
+
+class TranscriptEntry:
+    __slots__ = ("t", "speaker", "text", "classification", "confidence", "interrupted")
+
+    def __init__(self, t, speaker, text, classification, confidence=0.0, interrupted=None):
+        self.t = t
+        self.speaker = speaker            # None if unattributed
+        self.text = text
+        self.classification = classification
+        self.confidence = confidence
+        self.interrupted = interrupted
+
+    def as_dict(self):
+        d = {
+            "t": round(self.t, 3),
+            "speaker": self.speaker,
+            "text": self.text,
+            "classification": self.classification,
+        }
+        if self.confidence > 0:
+            d["confidence"] = round(self.confidence, 4)
+        if self.interrupted:
+            d["interrupted"] = self.interrupted
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d["t"], d.get("speaker"), d["text"], d["classification"],
+            d.get("confidence", 0.0), d.get("interrupted"),
+        )
+
+
+class EngineEvent:
+    """One Event Log entry.
+
+    kind is a rule category name, "neutral", "interruption", "speaking",
+    "joined" (a subject was added), "decay_mode" (text is the new mode)
+    or "error". `delta` is the score change applied to `actor` (and taken
+    from `target` for interruptions); `text` is the classified utterance
+    (None for button presses) or the error message; `duration` is the
+    seconds credited for "speaking".
+    """
+
+    __slots__ = ("t", "kind", "actor", "target", "delta", "text", "manual", "duration")
+
+    def __init__(self, t, kind, actor=None, target=None, delta=0.0, text=None,
+                 manual=False, duration=None):
+        self.t = t
+        self.kind = kind
+        self.actor = actor
+        self.target = target
+        self.delta = delta
+        self.text = text
+        self.manual = manual
+        self.duration = duration
+
+    def as_dict(self):
+        d = {"t": round(self.t, 3), "kind": self.kind}
+        for key in ("actor", "target", "text", "duration"):
+            value = getattr(self, key)
+            if value is not None:
+                d[key] = value
+        if self.delta:
+            d["delta"] = self.delta
+        if self.manual:
+            d["manual"] = True
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d["t"], d["kind"], d.get("actor"), d.get("target"), d.get("delta", 0.0),
+            d.get("text"), d.get("manual", False), d.get("duration"),
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FORMATTING
+# ═══════════════════════════════════════════════════════════════════════════
+def format_time(t):
+    return time.strftime("%H:%M:%S", time.localtime(t))
+
+
+def format_confidence(confidence):
+    return f" {confidence:.0%}" if confidence > 0 else ""
+
+
+def format_event(event):
+    """Event Log line, e.g. '14:02:11  Alice  DEFINITIVE  +15  "we will"'."""
+    ts = format_time(event.t)
+    kind = event.kind
+    if kind == "error":
+        return event.text
+    if kind == "interruption":
+        return (
+            f'{ts}  {event.actor} -> {event.target}  '
+            f'INTERRUPTION  +/-{event.delta:g}' + ("  (manual)" if event.manual else "")
+        )
+    if kind == "decay_mode":
+        return f'{ts}  DECAY MODE -> {event.text}'
+    if kind == "joined":
+        return f'{ts}  {event.actor}  JOINED'
+    if kind == "speaking":
+        return f'{ts}  {event.actor}  SPEAKING    +{event.delta:.1f}  ({event.duration:.1f}s)'
+    note = "(manual)" if event.text is None else f'"{event.text}"'
+    if kind == "neutral":
+        return f'{ts}  {event.actor}  NEUTRAL     ~decay  {note}'
+    return f'{ts}  {event.actor}  {kind.upper():<10}  {event.delta:+g}  {note}'
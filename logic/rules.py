@@ -0,0 +1,207 @@
+
+import os
+import re
+import json
+import time
+import threading
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SPEECH CLASSIFICATION RULES
+# ═══════════════════════════════════════════════════════════════════════════
+# Categories, weighted phrases and score effects live in a JSON rule file:
+#
+#   {"categories": [{"name": "definitive", "priority": 2, "score": 15,
+#                    "counter": "statements",
+#                    "phrases": {"absolutely": 1.0, "i am sure": 1.0},
+#                    "patterns": {"um+": 1.0}}, ...]}
+#
+# "phrases" are literal word sequences; "patterns" are regexes (without
+# capturing groups) matched on word boundaries. The category with the
+# highest summed weight wins, ties go to the higher priority, and text with
+# no match is "neutral".
+RULES_PATH = os.environ.get(
+    "GLM_RULES",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rules", "speech_rules.json"),
+)
+RELOAD_INTERVAL = 1.0  # seconds between rule-file mtime checks
+NEUTRAL = "neutral"
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def _normalize(phrase):
+    return " ".join(_TOKEN.findall(phrase.lower()))
+
+
+class Category:
+    __slots__ = ("name", "priority", "score", "counter")
+
+    def __init__(self, name, priority=0, score=0.0, counter=None):
+        self.name = name
+        self.priority = priority
+        self.score = score
+        self.counter = counter
+
+
+class RuleSet:
+    """A compiled rule file: one matcher for every phrase and pattern.
+
+    Literal phrases go into a hash table of word n-grams, scanned
+    longest-first, so cost grows with transcript length rather than rule
+    count. Regex patterns are joined into a single alternation with one
+    group per pattern.
+    """
+
+    def __init__(self, categories, phrases, patterns):
+        # categories: [Category]; phrases/patterns: {text: (category index, weight)}
+        self.categories = categories
+        self._by_name = {c.name: c for c in categories}
+        self._phrases = phrases
+        self._max_n = max((k.count(" ") + 1 for k in phrases), default=0)
+        self._pattern_targets = list(patterns.values())
+        self._pattern_regex = (
+            re.compile(r"\b(?:" + "|".join(f"({p})" for p in patterns) + r")\b")
+            if patterns else None
+        )
+        self.size = len(phrases) + len(patterns)
+
+    @classmethod
+    def from_dict(cls, spec):
+        categories, phrases, patterns = [], {}, {}
+        for i, cat in enumerate(spec["categories"]):
+            name = cat["name"]
+            if name == NEUTRAL:
+                raise ValueError(f"'{NEUTRAL}' is reserved for text with no match")
+            if any(c.name == name for c in categories):
+                raise ValueError(f"category {name!r} is defined twice")
+            categories.append(Category(
+                name, cat.get("priority", 0), float(cat.get("score", 0)), cat.get("counter"),
+            ))
+            for phrase, weight in cat.get("phrases", {}).items():
+                key = _normalize(phrase)
+                if key in phrases:
+                    # the later category would silently win the phrase
+                    raise ValueError(
+                        f"phrase {phrase!r} is in both {categories[phrases[key][0]].name!r} and {name!r}"
+                    )
+                if key:
+                    phrases[key] = (i, float(weight))
+            for pattern, weight in cat.get("patterns", {}).items():
+                if re.compile(pattern).groups:  # bad regexes fail the whole load
+                    raise ValueError(f"pattern {pattern!r}: use (?:...) instead of (...)")
+                if pattern in patterns:
+                    raise ValueError(
+                        f"pattern {pattern!r} is in both {categories[patterns[pattern][0]].name!r} and {name!r}"
+                    )
+                patterns[pattern] = (i, float(weight))
+        return cls(categories, phrases, patterns)
+
+    def category(self, name):
+        return self._by_name.get(name)
+
+    def phrases_for(self, name):
+        """Literal phrases of a category (used by the simulator)."""
+        idx = next((i for i, c in enumerate(self.categories) if c.name == name), None)
+        return [p for p, (i, _) in self._phrases.items() if i == idx]
+
+    def scores(self, text):
+        """Summed match weight per category index."""
+        totals = [0.0] * len(self.categories)
+        lowered = text.lower()
+        if self._phrases:
+            words = _TOKEN.findall(lowered)
+            table, max_n = self._phrases, self._max_n
+            i, n_words = 0, len(words)
+            while i < n_words:
+                for n in range(min(max_n, n_words - i), 0, -1):
+                    hit = table.get(words[i] if n == 1 else " ".join(words[i:i + n]))
+                    if hit is not None:
+                        totals[hit[0]] += hit[1]
+                        i += n
+                        break
+                else:
+                    i += 1
+        if self._pattern_regex is not None:
+            targets = self._pattern_targets
+            for m in self._pattern_regex.finditer(lowered):
+                idx, weight = targets[m.lastindex - 1]
+                totals[idx] += weight
+        return totals
+
+    def classify(self, text):
+        totals = self.scores(text)
+        best, best_key = NEUTRAL, (0.0, 0)
+        for cat, total in zip(self.categories, totals):
+            key = (total, cat.priority)
+            if total > 0 and key > best_key:
+                best, best_key = cat.name, key
+        return best
+
+
+def load_rules(path=RULES_PATH):
+    with open(path) as f:
+        return RuleSet.from_dict(json.load(f))
+
+
+class RuleClassifier:
+    """Classifier over a rule file that hot-reloads when the file changes.
+
+    At most once per RELOAD_INTERVAL the file's mtime is checked. A change
+    is compiled on a background thread while classification continues on
+    the old rules; the new RuleSet then replaces it in a single reference
+    swap. A file that fails to load leaves the previous rules active and is
+    reported in last_error.
+    """
+
+    def __init__(self, path=RULES_PATH, interval=RELOAD_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.last_error = None
+        self.loaded_at = time.time()
+        self._mtime = os.stat(path).st_mtime
+        self.rules = load_rules(path)
+        self._next_check = time.monotonic() + interval
+        self._reloading = threading.Lock()
+
+    def classify(self, text):
+        self.maybe_reload()
+        return self.rules.classify(text)
+
+    def maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.interval
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as e:
+            self.last_error = str(e)
+            return
+        if mtime != self._mtime and self._reloading.acquire(blocking=False):
+            threading.Thread(target=self._reload, args=(mtime,), daemon=True).start()
+
+    def _reload(self, mtime):
+        try:
+            rules = load_rules(self.path)
+        except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+        else:
+            self.rules = rules
+            self.loaded_at = time.time()
+            self.last_error = None
+        finally:
+            self._mtime = mtime
+            self._reloading.release()
+
+
+_classifier_lock = threading.Lock()
+_classifier = None
+
+
+def get_classifier():
+    """Process-wide RuleClassifier for the default rule file."""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = RuleClassifier()
+        return _classifier
@@ -0,0 +1,283 @@
+
+import json
+import time
+import uuid
+from logic.dynamics import (
+    BASE_SCORE,
+    DecayClock,
+    settle,
+    set_decay_mode,
+    apply_events,
+    get_influence,
+    get_scores,
+    INTERRUPT_TRANSFER,
+    SPEAKING_TIME_GAIN,
+)
+from logic.analysis import classify_speech
+from logic.rules import get_classifier
+from logic.interactions import InteractionGraph
+from logic.models import DEFAULT_MODEL, get_runner, known_model_settings
+from logic.records import Subject, TranscriptEntry, EngineEvent
+from logic.telemetry import LatencyTracker, stamp
+from logic.turns import TurnTracker
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SESSION STATE
+# ═══════════════════════════════════════════════════════════════════════════
+# Every function here takes a mapping `state` holding the keys below. In the
+# app that is st.session_state; headless tools pass a plain dict.
+
+def new_session():
+    return {
+        "session_id": uuid.uuid4().hex,  # stable across exports and snapshots
+        "people": [],
+        "nodes": {},
+        "interactions": InteractionGraph(),
+        "log": [],
+        "transcript": [],
+        "latency": LatencyTracker(),
+        "turns": TurnTracker(),
+        "clock": DecayClock(),
+        "models": None,  # ModelRunner for non-default/compared scoring models
+        "settings": {
+            "score_speaking_time": False,
+            "scoring_model": DEFAULT_MODEL,
+            "compare_models": [],
+        },
+    }
+
+
+def add_subject(state, name):
+    """Register a subject. Returns False if the name is already taken."""
+    if name in state["nodes"]:
+        return False
+    if state["clock"].timed:
+        # settle first so the newcomer doesn't inherit pending decay
+        settle(state["nodes"], state["clock"])
+    state["people"].append(name)
+    state["interactions"].add_subject(name)
+    state["nodes"][name] = Subject(BASE_SCORE)
+    state["log"].append(EngineEvent(time.time(), "joined", name))
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  EVENTS
+# ═══════════════════════════════════════════════════════════════════════════
+def _engine(state, events, burst):
+    """Apply engine events now, or queue them on `burst` (see process_results)."""
+    if burst is None:
+        apply_events(state["nodes"], events, state["clock"])
+    else:
+        burst.extend(events)
+
+
+def record_classification(state, speaker, classification, text=None, now=None, burst=None):
+    """Apply a classified statement to the engine and log it.
+
+    `text` is None for manual button presses. `now` is the event time for
+    time-based decay (defaults to the wall clock).
+    """
+    category = get_classifier().rules.category(classification)
+    if category is not None:
+        # Score effect and tally come from the rule file
+        _engine(state, [(category.name, speaker, None, now)], burst)
+        state["log"].append(
+            EngineEvent(time.time(), category.name, speaker, delta=category.score, text=text)
+        )
+    else:
+        # Neutral still triggers decay (silence penalty to everyone)
+        _engine(state, [("neutral", speaker, None, now)], burst)
+        state["log"].append(EngineEvent(time.time(), "neutral", speaker, text=text))
+
+
+def record_interruption(state, interrupter, interrupted, manual=False, now=None, burst=None):
+    _engine(state, [("interruption", interrupter, interrupted, now)], burst)
+    state["interactions"].record(interrupter, interrupted, t=now)
+    state["log"].append(EngineEvent(
+        time.time(), "interruption", interrupter, interrupted,
+        delta=INTERRUPT_TRANSFER, manual=manual,
+    ))
+
+
+def change_decay_mode(state, mode, now=None):
+    """Switch the decay mode (settling any pending decay) and log the
+    switch, so model replays follow the same mode history."""
+    clock = state["clock"]
+    if mode == clock.mode:
+        return False
+    set_decay_mode(state["nodes"], clock, mode, now)
+    state["log"].append(EngineEvent(time.time(), "decay_mode", text=mode))
+    return True
+
+
+def record_turn(state, speaker, start, end, burst=None):
+    """Feed turn-taking stats and, if enabled, credit speaking time."""
+    seconds = state["turns"].record_turn(speaker, start, end)
+    if state["settings"].get("score_speaking_time") and seconds > 0:
+        _engine(state, [("speaking", speaker, seconds, end)], burst)
+        state["log"].append(EngineEvent(
+            time.time(), "speaking", speaker, delta=SPEAKING_TIME_GAIN * seconds, duration=seconds,
+        ))
+
+
+def process_results(state, results, fallback_speaker=None):
+    """Run a burst of ListenerResults through classification and the engine.
+
+    Transcript, log, turn and interaction bookkeeping happen per result;
+    the score changes of the whole burst are applied by one apply_events()
+    call (one decay catch-up in time mode). Returns the number of results
+    that changed engine state.
+    """
+    nodes = state["nodes"]
+    latency = state.get("latency")
+    burst, timings, changed = [], [], 0
+    for result in results:
+        timing = result.timing
+        stamp(timing, "dequeue")
+        if result.error:
+            state["log"].append(EngineEvent(time.time(), "error", text=result.text))
+            continue
+
+        text = result.text
+        speaker = result.speaker
+        confidence = result.confidence
+        interrupted_person = result.interrupted
+        bounds = (result.start, result.end) if result.end is not None else None
+        # Event time on the listener's clock: wall time live, audio time offline
+        now = result.end
+
+        if speaker is None:
+            speaker = fallback_speaker
+
+        classification = classify_speech(text)
+        state["transcript"].append(TranscriptEntry(
+            time.time(), speaker, text, classification, confidence, interrupted_person,
+        ))
+
+        processed = False
+        if speaker and speaker in nodes:
+            record_classification(state, speaker, classification, text, now, burst)
+            if bounds is not None:
+                record_turn(state, speaker, *bounds, burst=burst)
+            processed = True
+
+        if interrupted_person and speaker and interrupted_person != speaker:
+            if interrupted_person in nodes and speaker in nodes:
+                record_interruption(state, speaker, interrupted_person, now=now, burst=burst)
+                processed = True
+
+        changed += processed
+        if timing is not None and latency is not None:
+            timings.append(timing)
+
+    apply_events(nodes, burst, state["clock"])
+    for timing in timings:
+        stamp(timing, "applied")
+        latency.mark_applied(timing)
+    return changed
+
+
+def process_result(state, result, fallback_speaker=None):
+    """Run one ListenerResult through classification and the engine.
+
+    Returns True if the engine state changed.
+    """
+    return process_results(state, [result], fallback_speaker) > 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SCORING MODELS
+# ═══════════════════════════════════════════════════════════════════════════
+def model_names(settings):
+    """Scoring models to run: the selected one first, then comparisons.
+    Names this build doesn't have are skipped (the default stands in)."""
+    settings = known_model_settings(settings)
+    return list(dict.fromkeys([settings["scoring_model"], *settings["compare_models"]]))
+
+
+def model_influence(state, now=None):
+    """(influence, scores) under the session's selected scoring model.
+
+    The default model reads the engine's own scores; others come from the
+    session's ModelRunner, caught up on the event log first.
+    """
+    settings = state["settings"]
+    name = model_names(settings)[0]
+    if name == DEFAULT_MODEL:
+        return get_influence(state["nodes"], state["clock"], now), get_scores(state["nodes"], state["clock"], now)
+    if state["clock"].timed and now is None:
+        now = time.time()
+    runner = get_runner(state, [n for n in model_names(settings) if n != DEFAULT_MODEL])
+    return runner.influence(name, now), runner.scores(name, now)
+
+
+def model_comparison(state, now=None):
+    """{model: {subject: influence %}} for the selected and compared models.
+
+    The default model's column is the engine's own influence, so it always
+    agrees with the leaderboard.
+    """
+    names = model_names(state["settings"])
+    others = [name for name in names if name != DEFAULT_MODEL]
+    compared = {}
+    if others:
+        runner = get_runner(state, others)
+        compared = runner.compare(time.time() if state["clock"].timed and now is None else now)
+    if DEFAULT_MODEL in names:
+        compared[DEFAULT_MODEL] = get_influence(state["nodes"], state["clock"], now)
+    return {
+        name: {subject: round(compared[name].get(subject, 0.0), 2) for subject in state["people"]}
+        for name in names
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  EXPORT
+# ═══════════════════════════════════════════════════════════════════════════
+def build_export(state, now=None):
+    """Export dict. `now` is the decay clock time to report scores at."""
+    inf = get_influence(state["nodes"], state["clock"], now)
+    scores = get_scores(state["nodes"], state["clock"], now)
+    subjects = []
+    for name in state["people"]:
+        node = state["nodes"][name]
+        subjects.append({
+            "name": name,
+            "raw_score": round(scores[name], 2),
+            "influence_pct": round(inf.get(name, 0), 2),
+            # statements, hesitations and any rule-file tallies
+            **node.counts(),
+        })
+    interactions = state["interactions"]
+    edges = []
+    for (src, dst), count in interactions.items():
+        edges.append({
+            "interrupter": src,
+            "interrupted": dst,
+            "count": count,
+        })
+    return {
+        "session_id": state.get("session_id"),
+        "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "subjects": subjects,
+        "transcript": [entry.as_dict() for entry in state["transcript"]],
+        "interaction_graph": edges,
+        "interaction_metrics": {
+            "reciprocity": round(interactions.reciprocity(), 4),
+            "subjects": interactions.metrics(),
+        },
+        "interruptions": [
+            {"time": round(t, 3), "interrupter": src, "interrupted": dst}
+            for t, src, dst in interactions.events()
+        ],
+        "event_log": [event.as_dict() for event in state["log"]],
+        "turn_taking": state["turns"].summary(),
+        "settings": {**state["settings"], "decay_mode": state["clock"].mode},
+        "latency": state["latency"].summary() if state.get("latency") else {},
+        **({"models": model_comparison(state, now)} if len(model_names(state["settings"])) > 1 else {}),
+    }
+
+
+def build_export_json(state, now=None):
+    return json.dumps(build_export(state, now), indent=2)
@@ -0,0 +1,303 @@
+
+import io
+import os
+import json
+import struct
+import tempfile
+import time
+import uuid
+import numpy as np
+
+from logic.dynamics import DecayClock, get_scores
+from logic.interactions import InteractionGraph
+from logic.models import known_model_settings
+from logic.records import Subject, TranscriptEntry, EngineEvent
+from logic.telemetry import LatencyTracker
+from logic.turns import TurnTracker
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SESSION SNAPSHOTS
+# ═══════════════════════════════════════════════════════════════════════════
+# A snapshot is the whole session (subjects, scores, interaction graph,
+# transcript, event log, turn stats, settings and voice profiles) in one
+# file, so a session can be resumed without re-enrolling anyone:
+#
+#   MAGIC | u64 meta length | meta JSON | pad | array blobs (64-byte aligned)
+#
+# Meta holds the small, irregular things (names, settings, string tables)
+# and a directory of arrays {key: [dtype, shape, offset]}. Everything that
+# grows with the session is stored column-wise as raw arrays, so loading
+# is one read (or mmap) plus a handful of np.frombuffer views. Latency
+# diagnostics are per-process and are not saved. In time-based decay mode
+# scores are written as of the save time (without touching the live
+# session) and the clock restarts on restore, so time between save and
+# restore is not counted as silence.
+MAGIC = b"GLMSNAP1"
+VERSION = 1
+ALIGN = 64
+SUFFIX = ".glmsnap"
+
+_HEADER = struct.Struct("<8sQ")
+
+
+# ── Column helpers ──
+def _codes(values):
+    """Low-cardinality strings (or None) -> (int32 codes, table); None is -1."""
+    table, index = [], {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        if v is None:
+            codes[i] = -1
+            continue
+        j = index.get(v)
+        if j is None:
+            j = index[v] = len(table)
+            table.append(v)
+        codes[i] = j
+    return codes, table
+
+
+def _decode(codes, table):
+    lookup = table + [None]  # -1 indexes the trailing None
+    return [lookup[c] for c in codes.tolist()]
+
+
+def _pack_text(values):
+    """Free text (or None) -> (utf-8 blob, int64 end offsets, null mask)."""
+    encoded = [b"" if v is None else v.encode("utf-8") for v in values]
+    ends = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    null = np.array([v is None for v in values], dtype=bool)
+    return blob, ends, null
+
+
+def _unpack_text(blob, ends, null):
+    raw = blob.tobytes()
+    out, start = [], 0
+    for end, is_null in zip(ends.tolist(), null.tolist()):
+        out.append(None if is_null else raw[start:end].decode("utf-8"))
+        start = end
+    return out
+
+
+def _text_columns(arrays, prefix, values):
+    arrays[f"{prefix}.blob"], arrays[f"{prefix}.ends"], arrays[f"{prefix}.null"] = _pack_text(values)
+
+
+def _text_from(arrays, prefix):
+    return _unpack_text(arrays[f"{prefix}.blob"], arrays[f"{prefix}.ends"], arrays[f"{prefix}.null"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  STATE <-> ARRAYS
+# ═══════════════════════════════════════════════════════════════════════════
+def _collect(state, now=None):
+    arrays, meta = {}, {"version": VERSION}
+    people = list(state["people"])
+    nodes = state["nodes"]
+    meta["people"] = people
+    meta["session_id"] = state.get("session_id")
+    meta["settings"] = dict(state["settings"])
+    clock = state["clock"]
+    # scores as of the save, decay accrued so far included (the live nodes
+    # are left alone); restore restarts the clock, so no t_ref is kept
+    meta["clock"] = {"mode": clock.mode}
+    scores = get_scores(nodes, clock, now)
+
+    arrays["nodes.raw_score"] = np.array([scores[p] for p in people], dtype=np.float64)
+    arrays["nodes.statements"] = np.array([nodes[p].statements for p in people], dtype=np.int64)
+    arrays["nodes.hesitations"] = np.array([nodes[p].hesitations for p in people], dtype=np.int64)
+    meta["tallies"] = {p: nodes[p].tallies for p in people if nodes[p].tallies}
+
+    graph_arrays, meta["interactions"] = state["interactions"].to_arrays()
+    arrays.update({f"interactions.{k}": v for k, v in graph_arrays.items()})
+    turn_arrays, meta["turns"] = state["turns"].to_arrays()
+    arrays.update({f"turns.{k}": v for k, v in turn_arrays.items()})
+
+    transcript = list(state["transcript"])  # one pass over any spilled pages
+    arrays["transcript.t"] = np.array([e.t for e in transcript], dtype=np.float64)
+    arrays["transcript.confidence"] = np.array([e.confidence for e in transcript], dtype=np.float64)
+    tables = meta["tables"] = {}
+    for field in ("speaker", "classification", "interrupted"):
+        arrays[f"transcript.{field}"], tables[f"transcript.{field}"] = _codes(
+            [getattr(e, field) for e in transcript]
+        )
+    _text_columns(arrays, "transcript.text", [e.text for e in transcript])
+
+    log = list(state["log"])
+    arrays["log.t"] = np.array([e.t for e in log], dtype=np.float64)
+    arrays["log.delta"] = np.array([e.delta for e in log], dtype=np.float64)
+    arrays["log.manual"] = np.array([e.manual for e in log], dtype=bool)
+    arrays["log.duration"] = np.array(
+        [np.nan if e.duration is None else e.duration for e in log], dtype=np.float64,
+    )
+    for field in ("kind", "actor", "target"):
+        arrays[f"log.{field}"], tables[f"log.{field}"] = _codes([getattr(e, field) for e in log])
+    _text_columns(arrays, "log.text", [e.text for e in log])
+
+    profiles = state.get("voice_profiles") or {}
+    meta["voice_profiles"] = list(profiles)
+    if profiles:
+        arrays["voice_profiles"] = np.stack([np.asarray(v, dtype=np.float32) for v in profiles.values()])
+    meta["enrollment_scripts"] = dict(state.get("enrollment_scripts") or {})
+    return arrays, meta
+
+
+def _restore(arrays, meta, now=None):
+    people = meta["people"]
+    tallies = meta["tallies"]
+    nodes = {
+        p: Subject(raw, statements, hesitations, tallies.get(p))
+        for p, raw, statements, hesitations in zip(
+            people,
+            arrays["nodes.raw_score"].tolist(),
+            arrays["nodes.statements"].tolist(),
+            arrays["nodes.hesitations"].tolist(),
+        )
+    }
+
+    def group(prefix):
+        n = len(prefix)
+        return {k[n:]: v for k, v in arrays.items() if k.startswith(prefix)}
+
+    tables = meta["tables"]
+    transcript = list(map(
+        TranscriptEntry,
+        arrays["transcript.t"].tolist(),
+        _decode(arrays["transcript.speaker"], tables["transcript.speaker"]),
+        _text_from(arrays, "transcript.text"),
+        _decode(arrays["transcript.classification"], tables["transcript.classification"]),
+        arrays["transcript.confidence"].tolist(),
+        _decode(arrays["transcript.interrupted"], tables["transcript.interrupted"]),
+    ))
+    durations = arrays["log.duration"]
+    log = list(map(
+        EngineEvent,
+        arrays["log.t"].tolist(),
+        _decode(arrays["log.kind"], tables["log.kind"]),
+        _decode(arrays["log.actor"], tables["log.actor"]),
+        _decode(arrays["log.target"], tables["log.target"]),
+        arrays["log.delta"].tolist(),
+        _text_from(arrays, "log.text"),
+        arrays["log.manual"].tolist(),
+        [None if d != d else d for d in durations.tolist()],  # NaN -> None
+    ))
+
+    profiles = {}
+    if meta["voice_profiles"]:
+        profiles = dict(zip(meta["voice_profiles"], arrays["voice_profiles"]))
+
+    return {
+        # snapshots from before session ids start a new identity
+        "session_id": meta.get("session_id") or uuid.uuid4().hex,
+        "people": list(people),
+        "nodes": nodes,
+        "interactions": InteractionGraph.from_arrays(group("interactions."), meta["interactions"]),
+        "log": log,
+        "transcript": transcript,
+        "latency": LatencyTracker(),
+        "turns": TurnTracker.from_arrays(group("turns."), meta["turns"]),
+        # scores are exact as of the save; time spent on disk doesn't decay them
+        "clock": DecayClock(meta["clock"]["mode"], time.time() if now is None else now),
+        "models": None,  # rebuilt from the log on first use
+        "settings": known_model_settings(meta["settings"]),
+        "voice_profiles": profiles,
+        "enrollment_scripts": meta["enrollment_scripts"],
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  FILE FORMAT
+# ═══════════════════════════════════════════════════════════════════════════
+def _pad(n):
+    return -n % ALIGN
+
+
+def write_snapshot(state, f, now=None):
+    """Write `state` to the binary file object `f`. `now` is the save
+    time on the decay clock (defaults to the wall clock)."""
+    arrays, meta = _collect(state, now)
+    directory, offset = {}, 0
+    for key, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        arrays[key] = arr
+        directory[key] = [arr.dtype.str, list(arr.shape), offset]
+        offset += arr.nbytes + _pad(arr.nbytes)
+    meta["arrays"] = directory
+    head = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    f.write(_HEADER.pack(MAGIC, len(head)))
+    f.write(head)
+    f.write(b"\0" * _pad(_HEADER.size + len(head)))
+    for arr in arrays.values():
+        f.write(arr.tobytes())
+        f.write(b"\0" * _pad(arr.nbytes))
+
+
+def snapshot_bytes(state, now=None):
+    buf = io.BytesIO()
+    write_snapshot(state, buf, now)
+    return buf.getvalue()
+
+
+def save_snapshot(state, path, now=None):
+    """Write a snapshot to `path` atomically (temp file + rename)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write_snapshot(state, f, now)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def _parse(buf):
+    """Split a snapshot buffer (bytes or a uint8 array) into (arrays, meta)."""
+    if len(buf) < _HEADER.size:
+        raise ValueError("not a session snapshot")
+    magic, meta_len = _HEADER.unpack(bytes(buf[:_HEADER.size]))
+    if magic != MAGIC:
+        raise ValueError("not a session snapshot")
+    end = _HEADER.size + meta_len
+    meta = json.loads(bytes(buf[_HEADER.size:end]).decode("utf-8"))
+    if meta.get("version") != VERSION:
+        raise ValueError(f"unsupported snapshot version {meta.get('version')}")
+    base = end + _pad(end)
+    raw = np.frombuffer(buf, dtype=np.uint8) if isinstance(buf, bytes) else buf
+    arrays = {}
+    for key, (dtype, shape, offset) in meta["arrays"].items():
+        dtype = np.dtype(dtype)
+        n = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        start = base + offset
+        if start + n > len(raw):
+            raise ValueError(f"snapshot truncated at {key!r}")
+        arrays[key] = raw[start:start + n].view(dtype).reshape(shape)
+    return arrays, meta
+
+
+def load_snapshot(source, mmap=False, now=None):
+    """Session state dict from a snapshot path or bytes.
+
+    The dict has every new_session() key plus voice_profiles and
+    enrollment_scripts. With mmap=True the file is mapped copy-on-write
+    rather than read, so large voice-profile matrices are paged in lazily.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        buf = bytes(source)
+    elif mmap:
+        buf = np.memmap(source, dtype=np.uint8, mode="c")
+    else:
+        with open(source, "rb") as f:
+            buf = f.read()
+    return _restore(*_parse(buf), now)
+
+
+def list_snapshots(directory):
+    """Snapshot files in `directory`, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    paths = [os.path.join(directory, n) for n in os.listdir(directory) if n.endswith(SUFFIX)]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
@@ -0,0 +1,248 @@
+
+import os
+import sys
+import json
+import tempfile
+import threading
+import weakref
+from array import array
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  LONG-SESSION MODE
+# ═══════════════════════════════════════════════════════════════════════════
+# The transcript and event log only ever grow. In long-session mode each is
+# a SpillList: the newest entries stay in RAM up to a byte budget and older
+# ones move to an append-only segment file (one JSON line per record, with
+# an in-memory offset index), read back a page at a time when the UI pages
+# back or an export iterates. Scores, tallies, the interaction matrix and
+# turn stats are already aggregates and stay in RAM.
+SPILL_TARGET = 0.5   # after spilling, keep this share of the budget in RAM
+PAGE = 1000          # records read per disk access when iterating
+SAMPLE = 200         # records sized when estimating a plain list
+
+
+def sizeof_record(record):
+    """Approximate RAM bytes of a slotted record and the values it owns."""
+    size = sys.getsizeof(record)
+    for name in record.__slots__:
+        value = getattr(record, name)
+        if value is not None and value is not True and value is not False:
+            size += sys.getsizeof(value)
+    return size
+
+
+class SpillList:
+    """Append-only sequence that keeps its newest records in RAM within
+    `budget` bytes and the rest in a segment file at `path`.
+
+    Supports len, indexing and slicing (negative too), iteration, reversed()
+    and append, so it stands in for the session's plain lists. Records need
+    as_dict()/from_dict() (logic.records). Reads and appends may come from
+    different threads (e.g. a deferred export).
+    """
+
+    def __init__(self, record_type, path, budget, items=()):
+        self.record_type = record_type
+        self.path = path
+        self.budget = budget
+        self.spilled_bytes = 0
+        self._recent = []
+        self._recent_bytes = 0
+        self._offsets = array("q", [0])  # start of each spilled record, plus the end
+        self._lock = threading.RLock()
+        self._writer = open(path, "wb")
+        self._reader = open(path, "rb")
+        self._finalizer = weakref.finalize(self, _remove, self._writer, self._reader, path)
+        for item in items:
+            self.append(item)
+
+    def close(self):
+        self._finalizer()
+
+    # ── Writes ──
+    def append(self, record):
+        with self._lock:
+            self._recent.append(record)
+            self._recent_bytes += sizeof_record(record)
+            if self._recent_bytes > self.budget:
+                self._spill()
+
+    def _spill(self):
+        keep = self.budget * SPILL_TARGET
+        recent, n, freed = self._recent, 0, 0
+        while n < len(recent) - 1 and self._recent_bytes - freed > keep:
+            freed += sizeof_record(recent[n])
+            n += 1
+        lines = [
+            (json.dumps(r.as_dict(), separators=(",", ":")) + "\n").encode("utf-8")
+            for r in recent[:n]
+        ]
+        end = self._offsets[-1]
+        for line in lines:
+            end += len(line)
+            self._offsets.append(end)
+        self._writer.write(b"".join(lines))
+        self._writer.flush()
+        self.spilled_bytes = end
+        del recent[:n]
+        self._recent_bytes -= freed
+
+    # ── Reads ──
+    @property
+    def n_spilled(self):
+        return len(self._offsets) - 1
+
+    def __len__(self):
+        return self.n_spilled + len(self._recent)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def _read(self, start, stop):
+        """Spilled records [start, stop) in one read."""
+        if start >= stop:
+            return []
+        a, b = self._offsets[start], self._offsets[stop]
+        self._reader.seek(a)
+        data = self._reader.read(b - a)
+        from_dict = self.record_type.from_dict
+        return [from_dict(json.loads(line)) for line in data.splitlines()]
+
+    def page(self, start, stop):
+        """Records [start, stop) as a list, from disk and/or RAM."""
+        with self._lock:
+            n_disk = self.n_spilled
+            start, stop = max(0, start), min(stop, n_disk + len(self._recent))
+            if start >= stop:
+                return []
+            out = self._read(start, min(stop, n_disk)) if start < n_disk else []
+            return out + self._recent[max(0, start - n_disk):max(0, stop - n_disk)]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self.page(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("SpillList index out of range")
+        return self.page(index, index + 1)[0]
+
+    def __iter__(self):
+        n = len(self)
+        for start in range(0, n, PAGE):
+            yield from self.page(start, min(start + PAGE, n))
+
+    def __reversed__(self):
+        n = len(self)
+        for stop in range(n, 0, -PAGE):
+            yield from reversed(self.page(max(0, stop - PAGE), stop))
+
+    def memory(self):
+        with self._lock:
+            return {
+                "items": len(self),
+                "in_ram": len(self._recent),
+                "ram_bytes": self._recent_bytes + sys.getsizeof(self._recent) + self._offsets.itemsize * len(self._offsets),
+                "disk_bytes": self.spilled_bytes,
+            }
+
+
+def _remove(writer, reader, path):
+    writer.close()
+    reader.close()
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SESSION HELPERS
+# ═══════════════════════════════════════════════════════════════════════════
+SPILLED = ("transcript", "log")
+
+
+def bound_session(state, budget_bytes, directory=None):
+    """Switch the transcript and event log to SpillLists sharing
+    `budget_bytes` (or update the budget if already switched). Segment
+    files go in `directory` (default: the system temp dir) and are
+    deleted with their list."""
+    from logic.records import TranscriptEntry, EngineEvent
+    types = {"transcript": TranscriptEntry, "log": EngineEvent}
+    share = budget_bytes / len(SPILLED)
+    for key in SPILLED:
+        seq = state[key]
+        if isinstance(seq, SpillList):
+            seq.budget = share
+            continue
+        fd, path = tempfile.mkstemp(prefix=f"glm-{key}-", suffix=".jsonl", dir=directory)
+        os.close(fd)
+        state[key] = SpillList(types[key], path, share, seq)
+
+
+def unbound_session(state):
+    """Back to plain in-memory lists (reads every spilled record)."""
+    for key in SPILLED:
+        seq = state[key]
+        if isinstance(seq, SpillList):
+            state[key] = list(seq)
+            seq.close()
+
+
+def _list_bytes(seq):
+    """RAM estimate for a plain list of records, from a sample."""
+    n = len(seq)
+    if n == 0:
+        return sys.getsizeof(seq)
+    step = max(1, n // SAMPLE)
+    sample = seq[::step]
+    return sys.getsizeof(seq) + int(sum(map(sizeof_record, sample)) * n / len(sample))
+
+
+def memory_report(state):
+    """{structure: {"items", "ram_bytes", "disk_bytes"}} for the session."""
+    report = {}
+    for key in SPILLED:
+        seq = state[key]
+        if isinstance(seq, SpillList):
+            report[key] = seq.memory()
+        else:
+            report[key] = {"items": len(seq), "in_ram": len(seq), "ram_bytes": _list_bytes(seq), "disk_bytes": 0}
+    nodes = state["nodes"]
+    report["nodes"] = {
+        "items": len(nodes),
+        "ram_bytes": sys.getsizeof(nodes) + sum(sizeof_record(n) + sys.getsizeof(k) for k, n in nodes.items()),
+    }
+    graph = state["interactions"]
+    report["interactions"] = {
+        "items": graph.n_events,
+        # every array the graph holds: matrix, degrees, event columns
+        "ram_bytes": sum(getattr(v, "nbytes", 0) for v in vars(graph).values()),
+    }
+    turns = state["turns"]
+    report["turns"] = {
+        "items": len(turns.subjects),
+        "ram_bytes": sys.getsizeof(turns.subjects) + len(turns.subjects) * 3 * sys.getsizeof(turns.gaps),
+    }
+    latency = state.get("latency")
+    if latency is not None:
+        # ring buffers plus the timings still waiting for a render stamp
+        pending = latency._pending
+        report["latency"] = {
+            "items": sum(latency._count.values()) + len(pending),
+            "ram_bytes": sum(b.nbytes for b in latency._buf.values())
+            + sys.getsizeof(pending) + sum(sys.getsizeof(t) for t in pending),
+        }
+    profiles = state.get("voice_profiles")
+    if profiles:
+        report["voice_profiles"] = {
+            "items": len(profiles),
+            "ram_bytes": sum(getattr(p, "nbytes", sys.getsizeof(p)) for p in profiles.values()),
+        }
+    for entry in report.values():
+        entry.setdefault("disk_bytes", 0)
+    return report
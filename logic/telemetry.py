@@ -0,0 +1,105 @@
+
+import time
+from collections import deque
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  LATENCY TELEMETRY
+# ═══════════════════════════════════════════════════════════════════════════
+# Each listener result carries a "timing" dict of perf_counter() stamps, one
+# per pipeline stage it has passed. Segments are measured between stamps.
+STAGES = ("capture", "embed", "stt", "enqueue", "dequeue", "applied", "rendered")
+SEGMENTS = (
+    # name,        from,                 to
+    ("embedding",  ("capture",),         "embed"),
+    ("stt",        ("embed", "capture"), "stt"),
+    ("enqueue",    ("stt",),             "enqueue"),
+    ("queue_wait", ("enqueue",),         "dequeue"),
+    ("engine",     ("dequeue",),         "applied"),
+    ("render",     ("applied",),         "rendered"),
+    ("end_to_end", ("capture",),         "rendered"),
+)
+WINDOW = 2048  # samples kept per segment
+HIST_EDGES_MS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float("inf"))
+
+
+def stamp(timing, stage):
+    """Record that an item reached `stage` now."""
+    if timing is not None:
+        timing[stage] = time.perf_counter()
+
+
+def _bin_label(i):
+    lo, hi = HIST_EDGES_MS[i], HIST_EDGES_MS[i + 1]
+    return f">={lo:g}ms" if hi == float("inf") else f"{lo:g}-{hi:g}ms"
+
+
+class LatencyTracker:
+    """Fixed-memory per-segment latency ring buffers.
+
+    Recording is O(1); percentiles are only computed when summarised.
+    """
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._buf = {name: np.zeros(window, dtype=np.float64) for name, _, _ in SEGMENTS}
+        self._count = {name: 0 for name, _, _ in SEGMENTS}
+        # timings applied but not yet drawn; bounded so headless callers
+        # that never render (ingest, engine service, soak) don't grow it
+        self._pending = deque(maxlen=window)
+
+    def observe(self, timing):
+        """Record every segment that `timing` has both endpoints for."""
+        for name, starts, end in SEGMENTS:
+            t_end = timing.get(end)
+            if t_end is None:
+                continue
+            for start in starts:
+                t_start = timing.get(start)
+                if t_start is not None:
+                    i = self._count[name] % self.window
+                    self._buf[name][i] = (t_end - t_start) * 1000.0
+                    self._count[name] += 1
+                    break
+
+    def mark_applied(self, timing):
+        """Record up to the engine stage and hold the item for render timing.
+
+        Only the newest `window` items are held; older ones never get a
+        render sample.
+        """
+        self.observe(timing)
+        self._pending.append(timing)
+
+    def mark_rendered(self):
+        """Stamp every applied-but-undrawn item as rendered now."""
+        if not self._pending:
+            return
+        now = time.perf_counter()
+        for timing in self._pending:
+            timing["rendered"] = now
+            self.observe({k: timing[k] for k in ("capture", "applied", "rendered") if k in timing})
+        self._pending.clear()
+
+    def samples(self, name):
+        n = min(self._count[name], self.window)
+        return self._buf[name][:n]
+
+    def summary(self):
+        """{segment: {count, p50, p95, p99, max, histogram}} in milliseconds."""
+        out = {}
+        for name, _, _ in SEGMENTS:
+            data = self.samples(name)
+            if data.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(data, (50, 95, 99))
+            hist, _ = np.histogram(data, bins=HIST_EDGES_MS)
+            out[name] = {
+                "count": self._count[name],
+                "p50_ms": round(float(p50), 2),
+                "p95_ms": round(float(p95), 2),
+                "p99_ms": round(float(p99), 2),
+                "max_ms": round(float(data.max()), 2),
+                "histogram": {_bin_label(i): int(c) for i, c in enumerate(hist)},
+            }
+        return out
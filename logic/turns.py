@@ -0,0 +1,141 @@
+
+import math
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  TURN-TAKING STATISTICS
+# ═══════════════════════════════════════════════════════════════════════════
+
+class RunningStats:
+    """Welford mean/variance accumulator. O(1) time and memory per sample."""
+
+    __slots__ = ("n", "mean", "m2", "total", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.max = 0.0
+
+    def to_row(self):
+        return (self.n, self.mean, self.m2, self.total, self.max)
+
+    @classmethod
+    def from_row(cls, row):
+        s = cls()
+        s.n = int(row[0])
+        s.mean, s.m2, s.total, s.max = (float(x) for x in row[1:])
+        return s
+
+    def push(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        self.total += x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def as_dict(self):
+        return {
+            "n": self.n,
+            "mean": round(self.mean, 3),
+            "std": round(self.std, 3),
+            "max": round(self.max, 3),
+            "total": round(self.total, 3),
+        }
+
+
+class SubjectTurns:
+    __slots__ = ("turns", "latency", "overlap")
+
+    def __init__(self):
+        self.turns = RunningStats()    # turn length, seconds
+        self.latency = RunningStats()  # gap before taking the floor, seconds
+        self.overlap = RunningStats()  # seconds spoken over the previous speaker
+
+
+class TurnTracker:
+    """Per-subject speaking time, turn length, response latency and overlap.
+
+    Fed with (speaker, start, end) for each utterance in arrival order.
+    A turn that starts before the previous speaker's turn ended counts as
+    overlap rather than latency. Consecutive utterances by the same subject
+    are still separate turns but carry no latency.
+    """
+
+    def __init__(self):
+        self.subjects = {}
+        self.gaps = RunningStats()  # silence between different speakers
+        self._last_speaker = None
+        self._last_end = None
+
+    def _get(self, name):
+        s = self.subjects.get(name)
+        if s is None:
+            s = self.subjects[name] = SubjectTurns()
+        return s
+
+    def record_turn(self, speaker, start, end):
+        duration = max(0.0, end - start)
+        s = self._get(speaker)
+        s.turns.push(duration)
+        if self._last_end is not None and speaker != self._last_speaker:
+            gap = start - self._last_end
+            if gap >= 0:
+                s.latency.push(gap)
+                self.gaps.push(gap)
+            else:
+                s.overlap.push(min(-gap, duration))
+        self._last_speaker = speaker
+        self._last_end = end if self._last_end is None else max(end, self._last_end)
+        return duration
+
+    def to_arrays(self):
+        """(arrays, meta) covering the tracker state (see logic.snapshot)."""
+        names = list(self.subjects)
+        stats = np.array(
+            [[s.turns.to_row(), s.latency.to_row(), s.overlap.to_row()] for s in self.subjects.values()],
+            dtype=np.float64,
+        ).reshape(len(names), 3, 5)
+        arrays = {"subjects": stats, "gaps": np.array(self.gaps.to_row(), dtype=np.float64)}
+        return arrays, {"names": names, "last_speaker": self._last_speaker, "last_end": self._last_end}
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        tracker = cls()
+        for name, rows in zip(meta["names"], arrays["subjects"]):
+            s = tracker._get(name)
+            s.turns, s.latency, s.overlap = (RunningStats.from_row(r) for r in rows)
+        tracker.gaps = RunningStats.from_row(arrays["gaps"])
+        tracker._last_speaker = meta["last_speaker"]
+        tracker._last_end = meta["last_end"]
+        return tracker
+
+    def speaking_time(self, name):
+        s = self.subjects.get(name)
+        return s.turns.total if s else 0.0
+
+    def summary(self):
+        total = sum(s.turns.total for s in self.subjects.values())
+        return {
+            "total_speaking_s": round(total, 3),
+            "gap_between_speakers": self.gaps.as_dict(),
+            "subjects": {
+                name: {
+                    "speaking_s": round(s.turns.total, 3),
+                    "speaking_share": round(s.turns.total / total, 4) if total else 0.0,
+                    "turns": s.turns.n,
+                    "turn_length": s.turns.as_dict(),
+                    "response_latency": s.latency.as_dict(),
+                    "overlap_s": round(s.overlap.total, 3),
+                    "overlaps": s.overlap.n,
+                }
+                for name, s in self.subjects.items()
+            },
+        }
@@ -0,0 +1,485 @@
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  SESSION WAREHOUSE
+# ═══════════════════════════════════════════════════════════════════════════
+# Session exports (build_export_json) loaded into one SQLite file so
+# questions across many meetings ("how does Alice's influence trend over the
+# last 200 sessions") are indexed lookups instead of re-reading every JSON.
+#
+# session_subjects holds one row per subject per session and is clustered
+# on (subject, session start), so per-subject aggregates and trends are a
+# single range scan. Utterances and interruptions are kept for drill-down.
+# Ingest is incremental: a file already loaded (same path, size and mtime,
+# or same content hash) is skipped. Sessions are keyed by identity, not by
+# file: the export's session_id, or for older exports the first event-log
+# time plus the subject set. A re-export of a session already loaded
+# replaces its rows instead of adding a second copy.
+#
+# Exports from the original app (transcript "time" as HH:MM:SS, text event
+# log, interruption counts only) are upgraded on ingest: clock times are
+# placed on the export date, and per-subject interruption totals come from
+# the count graph. They carry no session identity, so they are matched by
+# content hash only.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id              INTEGER PRIMARY KEY,
+    source          TEXT,
+    session_key     TEXT UNIQUE,
+    sha1            TEXT NOT NULL UNIQUE,
+    size            INTEGER,
+    mtime           REAL,
+    exported_at     TEXT,
+    started         REAL NOT NULL,
+    ended           REAL NOT NULL,
+    decay_mode      TEXT,
+    subjects        INTEGER NOT NULL,
+    utterances      INTEGER NOT NULL,
+    interruptions   INTEGER NOT NULL,
+    reciprocity     REAL,
+    speaking_s      REAL,
+    ingested_at     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started);
+CREATE INDEX IF NOT EXISTS sessions_source ON sessions (source);
+
+CREATE TABLE IF NOT EXISTS subjects (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS session_subjects (
+    subject_id      INTEGER NOT NULL REFERENCES subjects (id),
+    started         REAL NOT NULL,
+    session_id      INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    raw_score       REAL,
+    influence_pct   REAL,
+    statements      INTEGER,
+    hesitations     INTEGER,
+    tallies         TEXT,
+    utterances      INTEGER,
+    speaking_s      REAL,
+    speaking_share  REAL,
+    turns           INTEGER,
+    interruptions_made      INTEGER,
+    interruptions_suffered  INTEGER,
+    net_dominance   INTEGER,
+    pagerank        REAL,
+    PRIMARY KEY (subject_id, started, session_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS session_subjects_session ON session_subjects (session_id);
+
+CREATE TABLE IF NOT EXISTS utterances (
+    session_id      INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    t               REAL NOT NULL,
+    subject_id      INTEGER REFERENCES subjects (id),
+    classification  TEXT,
+    confidence      REAL,
+    interrupted_id  INTEGER REFERENCES subjects (id),
+    text            TEXT
+);
+CREATE INDEX IF NOT EXISTS utterances_subject ON utterances (subject_id, t);
+CREATE INDEX IF NOT EXISTS utterances_session ON utterances (session_id, t);
+
+CREATE TABLE IF NOT EXISTS interruptions (
+    session_id  INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    t           REAL NOT NULL,
+    src_id      INTEGER NOT NULL REFERENCES subjects (id),
+    dst_id      INTEGER NOT NULL REFERENCES subjects (id)
+);
+CREATE INDEX IF NOT EXISTS interruptions_src ON interruptions (src_id, t);
+CREATE INDEX IF NOT EXISTS interruptions_dst ON interruptions (dst_id, t);
+CREATE INDEX IF NOT EXISTS interruptions_session ON interruptions (session_id);
+"""
+
+# Per-subject aggregate columns, shared by subject_summary and leaderboard
+_AGGREGATES = """
+    COUNT(*)                        AS sessions,
+    ROUND(AVG(ss.influence_pct), 2) AS mean_influence_pct,
+    ROUND(MIN(ss.influence_pct), 2) AS min_influence_pct,
+    ROUND(MAX(ss.influence_pct), 2) AS max_influence_pct,
+    ROUND(AVG(ss.raw_score), 2)     AS mean_raw_score,
+    SUM(ss.statements)              AS statements,
+    SUM(ss.hesitations)             AS hesitations,
+    SUM(ss.utterances)              AS utterances,
+    ROUND(SUM(ss.speaking_s), 1)    AS speaking_s,
+    ROUND(AVG(ss.speaking_share), 4) AS mean_speaking_share,
+    SUM(ss.interruptions_made)      AS interruptions_made,
+    SUM(ss.interruptions_suffered)  AS interruptions_suffered,
+    SUM(ss.net_dominance)           AS net_dominance,
+    MIN(ss.started)                 AS first_session,
+    MAX(ss.started)                 AS last_session
+"""
+
+AGGREGATES = tuple(
+    line.split(" AS ")[1].strip().rstrip(",") for line in _AGGREGATES.strip().splitlines()
+)
+TREND_COLUMNS = (
+    "session_id", "started", "influence_pct", "raw_score", "statements", "hesitations",
+    "speaking_share", "interruptions_made", "interruptions_suffered", "net_dominance",
+)
+
+
+def _export_time(export):
+    """Epoch seconds of `exported_at` (local time, as build_export writes it)."""
+    try:
+        return time.mktime(time.strptime(export["exported_at"], "%Y-%m-%dT%H:%M:%S"))
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def session_key(export):
+    """Stable identity of the session behind an export (None if unknown)."""
+    if export.get("session_id"):
+        return str(export["session_id"])
+    log = export.get("event_log") or []
+    if not log or not isinstance(log[0], dict) or "t" not in log[0]:
+        return None
+    names = sorted(s["name"] for s in export.get("subjects", []))
+    digest = hashlib.sha1(json.dumps([log[0]["t"], names]).encode()).hexdigest()
+    return f"log:{digest}"
+
+
+def _clock_time(hms, exported):
+    """Epoch seconds of an HH:MM:SS stamp on the day of `exported` (the
+    day before if that would put it after the export)."""
+    try:
+        h, m, sec = (int(x) for x in hms.split(":"))
+    except (AttributeError, ValueError):
+        return exported
+    day = time.localtime(exported)
+    t = time.mktime((day.tm_year, day.tm_mon, day.tm_mday, h, m, sec, 0, 0, -1))
+    return t - 86400 if t > exported else t
+
+
+def upgrade_export(export):
+    """`export` in the current format; original-app exports are converted."""
+    if not isinstance(export, dict) or not isinstance(export.get("subjects"), list):
+        raise ValueError("not a session export (no subjects list)")
+    transcript = export.get("transcript", [])
+    if all("t" in e for e in transcript) and all(isinstance(e, dict) for e in export.get("event_log", [])):
+        return export
+    exported = _export_time(export)
+    upgraded = []
+    for e in transcript:
+        if "t" in e:
+            upgraded.append(e)
+        elif "time" in e:
+            conf = str(e.get("confidence") or "").strip().rstrip("%")
+            upgraded.append({
+                "t": _clock_time(e["time"], exported),
+                "speaker": None if e.get("speaker") in ("", "UNKNOWN") else e.get("speaker"),
+                "text": e.get("text"),
+                "classification": e.get("classification") or None,
+                "confidence": float(conf) / 100 if conf.replace(".", "", 1).isdigit() else None,
+                "interrupted": e.get("interrupted"),
+            })
+        # {"raw": ...} lines carry nothing to index
+    metrics = export.get("interaction_metrics")
+    if metrics is None:
+        made, suffered = {}, {}
+        for edge in export.get("interaction_graph", []):
+            made[edge["interrupter"]] = made.get(edge["interrupter"], 0) + edge["count"]
+            suffered[edge["interrupted"]] = suffered.get(edge["interrupted"], 0) + edge["count"]
+        metrics = {"subjects": {
+            s["name"]: {
+                "interruptions_made": made.get(s["name"], 0),
+                "interruptions_suffered": suffered.get(s["name"], 0),
+                "net_dominance": made.get(s["name"], 0) - suffered.get(s["name"], 0),
+            }
+            for s in export["subjects"]
+        }}
+    return {
+        **export,
+        "transcript": upgraded,
+        "event_log": [e for e in export.get("event_log", []) if isinstance(e, dict)],
+        "interaction_metrics": metrics,
+    }
+
+
+def _time_clause(column, since, until, params):
+    sql = ""
+    if since is not None:
+        sql += f" AND {column} >= ?"
+        params.append(since)
+    if until is not None:
+        sql += f" AND {column} < ?"
+        params.append(until)
+    return sql
+
+
+class Warehouse:
+    """SQLite store of session exports with per-subject queries.
+
+    Times are epoch seconds. Query methods return plain dicts/lists so
+    they can go straight to JSON.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(SCHEMA)
+        self._load_subjects()
+
+    def _load_subjects(self):
+        self._subject_ids = {
+            row["name"]: row["id"] for row in self.db.execute("SELECT id, name FROM subjects")
+        }
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── Ingest ──
+    def _subject_id(self, name):
+        if name is None:
+            return None
+        sid = self._subject_ids.get(name)
+        if sid is None:
+            sid = self.db.execute("INSERT INTO subjects (name) VALUES (?)", (name,)).lastrowid
+            self._subject_ids[name] = sid
+        return sid
+
+    def ingest_file(self, path):
+        """Load one export. Returns its session id, or None if already loaded."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        seen = self.db.execute(
+            "SELECT 1 FROM sessions WHERE source = ? AND size = ? AND mtime = ?",
+            (path, st.st_size, st.st_mtime),
+        ).fetchone()
+        if seen:
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        return self.ingest_bytes(data, source=path, size=st.st_size, mtime=st.st_mtime)
+
+    def ingest_bytes(self, data, source=None, size=None, mtime=None):
+        """Load one export. Returns its session id, or None if already loaded.
+
+        An earlier export of the same session (same session_key) is
+        replaced.
+        """
+        sha1 = hashlib.sha1(data).hexdigest()
+        if self.db.execute("SELECT 1 FROM sessions WHERE sha1 = ?", (sha1,)).fetchone():
+            return None
+        export = upgrade_export(json.loads(data))
+        key = session_key(export)
+        try:
+            with self.db:
+                if key is not None:
+                    self.db.execute("DELETE FROM sessions WHERE session_key = ?", (key,))
+                return self._insert(export, key, sha1, source, size, mtime)
+        except Exception:
+            self._load_subjects()  # names added in the rolled-back transaction
+            raise
+
+    def ingest(self, paths):
+        """Load every *.json export under `paths` (files or directories).
+
+        Returns {"added": n, "skipped": n, "failed": [(path, error)]}.
+        """
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, names in os.walk(path):
+                    files.extend(os.path.join(root, n) for n in names if n.endswith(".json"))
+            else:
+                files.append(path)
+        added, skipped, failed = 0, 0, []
+        for path in sorted(files):
+            try:
+                if self.ingest_file(path) is None:
+                    skipped += 1
+                else:
+                    added += 1
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                failed.append((path, f"{type(e).__name__}: {e}"))
+        return {"added": added, "skipped": skipped, "failed": failed}
+
+    def _insert(self, export, key, sha1, source, size, mtime):
+        db = self.db
+        transcript = export.get("transcript", [])
+        interruptions = export.get("interruptions", [])
+        times = [e["t"] for e in transcript] + [e["time"] for e in interruptions]
+        times += [e["t"] for e in export.get("event_log", []) if "t" in e]
+        exported = _export_time(export)
+        started = min(times, default=exported)
+        ended = max(times, default=exported)
+        turns = export.get("turn_taking", {})
+        metrics = export.get("interaction_metrics", {})
+
+        session_id = db.execute(
+            "INSERT INTO sessions (session_key, source, sha1, size, mtime, exported_at, started, ended, "
+            "decay_mode, subjects, utterances, interruptions, reciprocity, speaking_s, ingested_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key, source, sha1, size, mtime, export.get("exported_at"), started, ended,
+                export.get("settings", {}).get("decay_mode"), len(export.get("subjects", [])),
+                len(transcript), len(interruptions), metrics.get("reciprocity"),
+                turns.get("total_speaking_s"), time.time(),
+            ),
+        ).lastrowid
+
+        spoken = {}
+        for entry in transcript:
+            spoken[entry.get("speaker")] = spoken.get(entry.get("speaker"), 0) + 1
+        subject_turns = turns.get("subjects", {})
+        subject_metrics = metrics.get("subjects", {})
+        rows = []
+        for s in export.get("subjects", []):
+            name = s["name"]
+            tallies = {
+                k: v for k, v in s.items()
+                if k not in ("name", "raw_score", "influence_pct", "statements", "hesitations")
+            }
+            tt = subject_turns.get(name, {})
+            m = subject_metrics.get(name, {})
+            rows.append((
+                self._subject_id(name), started, session_id,
+                s.get("raw_score"), s.get("influence_pct"),
+                s.get("statements", 0), s.get("hesitations", 0),
+                json.dumps(tallies) if tallies else None,
+                spoken.get(name, 0), tt.get("speaking_s", 0.0), tt.get("speaking_share", 0.0),
+                tt.get("turns", 0), m.get("interruptions_made", 0),
+                m.get("interruptions_suffered", 0), m.get("net_dominance", 0), m.get("pagerank"),
+            ))
+        db.executemany(
+            "INSERT INTO session_subjects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        sid = self._subject_id
+        db.executemany(
+            "INSERT INTO utterances VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (session_id, e["t"], sid(e.get("speaker")), e.get("classification"),
+                 e.get("confidence"), sid(e.get("interrupted")), e.get("text"))
+                for e in transcript
+            ],
+        )
+        db.executemany(
+            "INSERT INTO interruptions VALUES (?, ?, ?, ?)",
+            [(session_id, e["time"], sid(e["interrupter"]), sid(e["interrupted"])) for e in interruptions],
+        )
+        return session_id
+
+    def remove_session(self, session_id):
+        with self.db:
+            self.db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    # ── Queries ──
+    def subjects(self):
+        return sorted(self._subject_ids)
+
+    def sessions(self, since=None, until=None, subject=None):
+        """Session rows, oldest first; only those `subject` took part in if given."""
+        params = []
+        if subject is None:
+            sql = "SELECT * FROM sessions WHERE 1" + _time_clause("started", since, until, params)
+        else:
+            params.append(self._subject_ids.get(subject, -1))
+            sql = (
+                "SELECT s.* FROM session_subjects ss JOIN sessions s ON s.id = ss.session_id "
+                "WHERE ss.subject_id = ?" + _time_clause("ss.started", since, until, params)
+            )
+        return [dict(r) for r in self.db.execute(sql + " ORDER BY started", params)]
+
+    def subject_summary(self, name, since=None, until=None):
+        """Aggregates over every session `name` took part in, or None."""
+        sid = self._subject_ids.get(name)
+        if sid is None:
+            return None
+        params = [sid]
+        row = self.db.execute(
+            f"SELECT {_AGGREGATES} FROM session_subjects ss WHERE ss.subject_id = ?"
+            + _time_clause("ss.started", since, until, params),
+            params,
+        ).fetchone()
+        if not row["sessions"]:
+            return None
+        return {"name": name, **dict(row)}
+
+    def subject_trend(self, name, since=None, until=None, limit=None):
+        """Per-session rows for `name`, oldest first (newest `limit` if given)."""
+        sid = self._subject_ids.get(name)
+        if sid is None:
+            return []
+        params = [sid]
+        sql = (
+            f"SELECT {', '.join('ss.' + c for c in TREND_COLUMNS)} FROM session_subjects ss "
+            "WHERE ss.subject_id = ?" + _time_clause("ss.started", since, until, params)
+        )
+        if limit:
+            sql = f"SELECT * FROM ({sql} ORDER BY ss.started DESC LIMIT ?)"
+            params.append(limit)
+        return [dict(r) for r in self.db.execute(sql + " ORDER BY started", params)]
+
+    def leaderboard(self, since=None, until=None, min_sessions=1, by="mean_influence_pct", limit=None):
+        """Every subject's aggregates, best `by` first."""
+        if by not in AGGREGATES:
+            raise ValueError(f"unknown aggregate {by!r}")
+        params = []
+        sql = (
+            f"SELECT sub.name AS name, {_AGGREGATES} FROM session_subjects ss "
+            "JOIN subjects sub ON sub.id = ss.subject_id WHERE 1"
+            + _time_clause("ss.started", since, until, params)
+            + f" GROUP BY ss.subject_id HAVING COUNT(*) >= ? ORDER BY {by} DESC"
+        )
+        params.append(min_sessions)
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(r) for r in self.db.execute(sql, params)]
+
+    def interruption_pairs(self, name, since=None, until=None):
+        """{"made": {target: n}, "suffered": {source: n}} for `name`."""
+        sid = self._subject_ids.get(name, -1)
+        out = {}
+        for key, mine, other in (("made", "src_id", "dst_id"), ("suffered", "dst_id", "src_id")):
+            params = [sid]
+            rows = self.db.execute(
+                f"SELECT sub.name, COUNT(*) FROM interruptions i JOIN subjects sub ON sub.id = i.{other} "
+                f"WHERE i.{mine} = ?" + _time_clause("i.t", since, until, params)
+                + f" GROUP BY i.{other} ORDER BY COUNT(*) DESC",
+                params,
+            )
+            out[key] = dict(rows.fetchall())
+        return out
+
+    def utterances(self, name, since=None, until=None, classification=None, limit=100):
+        """`name`'s most recent utterances, newest first."""
+        params = [self._subject_ids.get(name, -1)]
+        sql = (
+            "SELECT session_id, t, classification, confidence, text FROM utterances "
+            "WHERE subject_id = ?" + _time_clause("t", since, until, params)
+        )
+        if classification:
+            sql += " AND classification = ?"
+            params.append(classification)
+        sql += " ORDER BY t DESC LIMIT ?"
+        params.append(limit)
+        return [dict(r) for r in self.db.execute(sql, params)]
+
+    def stats(self):
+        count = lambda table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return {
+            "path": self.path,
+            "sessions": count("sessions"),
+            "subjects": count("subjects"),
+            "utterances": count("utterances"),
+            "interruptions": count("interruptions"),
+        }
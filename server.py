@@ -0,0 +1,117 @@
+"""Run the scoring engine as a local HTTP/WebSocket service.
+
+    python server.py --subjects Alice Bob --port 8765
+
+    POST /events     one event or a list (see logic/engine.py for the format)
+    GET  /state      latest snapshot
+    GET  /stats      queue and subscriber counters
+    GET  /export     session export, same format as the app's JSON export
+    WS   /stream     snapshot on connect, then one per engine update
+    WS   /ingest     send events (object or list) as text frames; acks {"seq": n}
+
+Requires starlette and uvicorn (both installed with recent Streamlit).
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocketDisconnect
+
+from logic.dynamics import DECAY_MODES
+from logic.engine import Engine
+from logic.session import add_subject, build_export_json, change_decay_mode
+
+
+def _events(payload):
+    return payload if isinstance(payload, list) else [payload]
+
+
+def create_app(engine):
+    async def post_events(request):
+        try:
+            seq = engine.post_many(_events(await request.json()))
+        except (ValueError, json.JSONDecodeError) as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse({"seq": seq})
+
+    async def get_state(request):
+        return JSONResponse(engine.snapshot())
+
+    async def get_stats(request):
+        return JSONResponse(engine.stats())
+
+    async def get_export(request):
+        return Response(build_export_json(engine.state), media_type="application/json")
+
+    async def stream(websocket):
+        await websocket.accept()
+        q = engine.subscribe()
+        try:
+            while True:
+                await websocket.send_text(json.dumps(await q.get()))
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            engine.unsubscribe(q)
+
+    async def ingest(websocket):
+        await websocket.accept()
+        try:
+            while True:
+                message = await websocket.receive_text()
+                try:
+                    seq = engine.post_many(_events(json.loads(message)))
+                except (ValueError, json.JSONDecodeError) as e:
+                    await websocket.send_text(json.dumps({"error": str(e)}))
+                else:
+                    await websocket.send_text(json.dumps({"seq": seq}))
+        except WebSocketDisconnect:
+            pass
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        task = asyncio.create_task(engine.run())
+        yield
+        task.cancel()
+
+    return Starlette(
+        routes=[
+            Route("/events", post_events, methods=["POST"]),
+            Route("/state", get_state),
+            Route("/stats", get_stats),
+            Route("/export", get_export),
+            WebSocketRoute("/stream", stream),
+            WebSocketRoute("/ingest", ingest),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def make_engine(subjects=(), decay_mode="event"):
+    engine = Engine()
+    for name in subjects:
+        add_subject(engine.state, name)
+    change_decay_mode(engine.state, decay_mode)
+    return engine
+
+
+def main(argv=None):
+    import uvicorn
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--subjects", nargs="*", default=[], help="subject names")
+    parser.add_argument("--decay", choices=DECAY_MODES, default="event",
+                        help="per-event or wall-time decay (default: event)")
+    args = parser.parse_args(argv)
+
+    app = create_app(make_engine(args.subjects, args.decay))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 
+import re
+import functools
 import streamlit as st
 
+FRAGMENT_CACHE_SIZE = 4096  # cached row/card fragments per builder
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  CLINICAL CSS
 # ═══════════════════════════════════════════════════════════════════════════
-def load_css():
-    st.markdown("""
+CSS = """
 <style>
 @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Roboto+Mono:wght@400;500&display=swap');
 html, body, [class*="css"] {
@@ -128,6 +131,7 @@ section[data-testid="stSidebar"] [data-testid="stSidebarContent"] {
 .tx-entry .cls-def { color: #000000; font-weight: 500; }
 .tx-entry .cls-hes { color: #6c757d; font-weight: 400; font-style: italic; }
 .tx-entry .cls-neu { color: #adb5bd; }
+.tx-entry .cls-tag { color: #495057; font-weight: 500; }
 .tx-entry .int-flag { color: #FF3333; font-weight: 600; }
 
 /* Event log */
@@ -249,11 +253,20 @@ section[data-testid="stSidebar"] .stMarkdown h2 {
     font-size: 1rem; font-weight: 700; color: #000000;
     width: 4.5rem; text-align: right; flex-shrink: 0;
 }
+.lb-net {
+    font-family: 'Roboto Mono', monospace;
+    font-size: 0.6rem; color: #adb5bd; letter-spacing: 0.06em;
+    width: 4.5rem; flex-shrink: 0;
+}
 .lb-bar-wrap {
     flex: 1; height: 3px; background: #e9ecef;
     margin: 0 1rem;
 }
 .lb-bar { height: 3px; background: #000000; }
+.lb-more {
+    font-family: 'Roboto Mono', monospace; font-size: 0.7rem;
+    color: #6c757d; letter-spacing: 0.05em;
+}
 
 /* Empty */
 .empty-state { text-align: center; padding: 5rem 2rem; color: #adb5bd; }
@@ -263,7 +276,20 @@ section[data-testid="stSidebar"] .stMarkdown h2 {
 }
 .empty-state .msg { font-size: 0.85rem; color: #6c757d; }
 </style>
-    """, unsafe_allow_html=True)
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _stylesheet():
+    css = re.sub(r"/\*.*?\*/", "", CSS, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", css).strip()
+
+
+def load_css():
+    # Streamlit clears any element a rerun doesn't re-emit, so the style
+    # block has to go out every run; it is minified once per process.
+    st.markdown(_stylesheet(), unsafe_allow_html=True)
 
 
 def render_header():
@@ -274,3 +300,73 @@ def render_header():
     <div class="sub">Attention-economy model — zero-sum ELO transfer with action-based decay</div>
 </div>
 """, unsafe_allow_html=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  CACHED FRAGMENTS
+# ═══════════════════════════════════════════════════════════════════════════
+# Builders take the values exactly as displayed (percentages rounded to one
+# decimal, raw scores to integers), so a row or card is rebuilt only when
+# something visible about it changed.
+
+@functools.lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def leaderboard_row(rank, name, net, pct):
+    return (
+        f'<div class="lb-row">'
+        f'<span class="lb-rank">{str(rank).zfill(2)}</span>'
+        f'<span class="lb-name">{name}</span>'
+        f'<span class="lb-net">NET {net:+d}</span>'
+        f'<div class="lb-bar-wrap"><div class="lb-bar" style="width:{pct:.1f}%"></div></div>'
+        f'<span class="lb-pct">{pct:.1f}%</span>'
+        f'</div>'
+    )
+
+
+@functools.lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def subject_card(idx, name, pct, raw):
+    return (
+        f'<div class="subject-card">'
+        f'<div class="id">Subject {str(idx).zfill(2)}</div>'
+        f'<div class="name">{name}</div>'
+        f'<div class="influence">{pct:.1f}%</div>'
+        f'<div class="raw">RAW {raw}</div>'
+        f'<div class="inf-bar-wrap"><div class="inf-bar" style="width:{pct:.1f}%"></div></div>'
+        f'</div>'
+    )
+
+
+# Built-in categories keep their own styles; any other rule-file category
+# gets the generic cls-tag plus a cls-<name> hook.
+CLASSIFICATION_STYLES = {"definitive": "cls-def", "hesitation": "cls-hes", "neutral": "cls-neu"}
+
+
+@functools.lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def classification_tag(classification):
+    """Transcript label for a classification (None or "" reads as neutral)."""
+    name = classification or "neutral"
+    style = CLASSIFICATION_STYLES.get(name)
+    if style is None:
+        style = "cls-tag cls-" + re.sub(r"[^a-z0-9_-]+", "-", name.lower())
+    return f'<span class="{style}">[{name.upper()}]</span>'
+
+
+def leaderboard_html(ranked, dominance, hidden=0):
+    """ranked: [(name, influence %)] best first; dominance: interactions.metrics().
+
+    `hidden` is the number of subjects left off a top-K board.
+    """
+    rows = [
+        leaderboard_row(rank, name, dominance.get(name, {}).get("net_dominance", 0), round(pct, 1))
+        for rank, (name, pct) in enumerate(ranked, 1)
+    ]
+    if hidden > 0:
+        rows.append(f'<div class="lb-row lb-more">+ {hidden} more subjects</div>')
+    return '<div class="leaderboard">' + "".join(rows) + '</div>'
+
+
+def fragment_cache_info():
+    """{builder: (hits, misses)} for the diagnostics panel."""
+    return {
+        fn.__name__: (fn.cache_info().hits, fn.cache_info().misses)
+        for fn in (leaderboard_row, subject_card, classification_tag)
+    }
@@ -1,38 +1,64 @@
 
 from pyvis.network import Network
+import heapq
 import tempfile
 import os
 import streamlit.components.v1 as components
 from logic.dynamics import get_node_size
+from ui.layout import layout_positions
 
 # ═══════════════════════════════════════════════════════════════════════════
 #  GRAPH VISUALIZATION
 # ═══════════════════════════════════════════════════════════════════════════
+# Node id of the collapsed group. Subject names are strings, so an int id
+# can never collide with a real subject (one may well be called "Others").
+OTHERS = -1
+OTHERS_LABEL = "Others"
 
-def render_graph(people, nodes, edges, influence):
+
+def simplify_graph(people, influence, edges, max_nodes=None, min_edge=1):
+    """Collapse low-influence subjects and drop light edges for large groups.
+
+    Keeps the `max_nodes` most influential subjects; the rest become one
+    OTHERS node, with their edges re-routed to it (edges inside the group
+    vanish). Edges with fewer than `min_edge` interruptions after merging
+    are dropped. Returns (shown people, collapsed people, {(src, dst): count}).
+    """
+    if max_nodes is not None and len(people) > max_nodes:
+        keep = set(heapq.nlargest(max_nodes, people, key=lambda p: influence.get(p, 0)))
+        shown = [p for p in people if p in keep]
+        collapsed = [p for p in people if p not in keep]
+    else:
+        keep, shown, collapsed = None, list(people), []
+    merged = {}
+    for (src, dst), count in edges:
+        if keep is not None:
+            src = src if src in keep else OTHERS
+            dst = dst if dst in keep else OTHERS
+            if src == dst:
+                continue
+        merged[(src, dst)] = merged.get((src, dst), 0) + count
+    if min_edge > 1:
+        merged = {edge: count for edge, count in merged.items() if count >= min_edge}
+    return shown, collapsed, merged
+
+
+def build_graph_html(people, nodes, interactions, influence, scores=None,
+                     max_nodes=None, min_edge=1):
+    """Build the standalone pyvis HTML document for the interaction graph.
+
+    `max_nodes` / `min_edge` enable large-group simplification (see
+    simplify_graph).
+    """
     net = Network(
         height="500px", width="100%", directed=True,
         bgcolor="#FFFFFF", font_color="#000000",
     )
+    # Positions come from ui.layout, so the browser runs no simulation
     net.set_options("""
     {
         "physics": {
-            "enabled": true,
-            "barnesHut": {
-                "gravitationalConstant": -4000,
-                "centralGravity": 0.5,
-                "springLength": 160,
-                "springConstant": 0.1,
-                "damping": 0.85,
-                "avoidOverlap": 0.3
-            },
-            "stabilization": {
-                "enabled": true,
-                "iterations": 200,
-                "updateInterval": 25
-            },
-            "maxVelocity": 15,
-            "minVelocity": 0.75
+            "enabled": false
         },
         "interaction": {
             "hover": true,
@@ -42,33 +68,61 @@ def render_graph(people, nodes, edges, influence):
     }
     """)
 
-    for person in people:
+    metrics = interactions.metrics()
+    scores = scores or {p: nodes[p].raw_score for p in people}
+    shown, collapsed, edges = simplify_graph(
+        people, influence, interactions.items(), max_nodes, min_edge,
+    )
+    # Laid out over every subject, so nodes keep their place as they move
+    # in and out of the collapsed group
+    positions = layout_positions(tuple(people) + ((OTHERS,) if max_nodes is not None else ()))
+    for person in shown:
         node = nodes[person]
+        x, y = positions[person]
+        m = metrics.get(person, {})
+        dom = m.get("net_dominance", 0)
         pct = influence.get(person, 0)
         vis_size = get_node_size(pct)
         net.add_node(
             person,
             label=f"{person}\n{pct:.0f}%",
             size=vis_size,
+            x=x, y=y, physics=False,
             color={
                 "background": "#FFFFFF",
                 "border": "#000000",
                 "highlight": {"background": "#F8F9FA", "border": "#000000"},
                 "hover": {"background": "#F8F9FA", "border": "#000000"},
             },
-            borderWidth=2,
+            borderWidth=2 + min(4, max(0, dom)),
             borderWidthSelected=3,
             font={"size": 14, "color": "#000000", "face": "Inter, Helvetica, sans-serif", "multi": True},
             shape="dot",
             title=(
                 f"{person}\n"
                 f"Influence: {pct:.1f}%\n"
-                f"Raw Score: {node['raw_score']:.0f}\n"
-                f"Statements: {node['statements']}\n"
-                f"Hesitations: {node['hesitations']}"
+                f"Raw Score: {scores[person]:.0f}\n"
+                f"Statements: {node.statements}\n"
+                f"Hesitations: {node.hesitations}\n"
+                f"Net Dominance: {dom:+d}\n"
+                f"Interruption Rank: {m.get('pagerank', 0):.3f}"
             ),
         )
 
+    if collapsed:
+        pct = sum(influence.get(p, 0) for p in collapsed)
+        net.add_node(
+            OTHERS,
+            label=f"{OTHERS_LABEL} ({len(collapsed)})\n{pct:.0f}%",
+            size=get_node_size(pct),
+            x=positions[OTHERS][0], y=positions[OTHERS][1], physics=False,
+            color={"background": "#F8F9FA", "border": "#adb5bd"},
+            borderWidth=1,
+            font={"size": 12, "color": "#6c757d", "face": "Inter, Helvetica, sans-serif", "multi": True},
+            shape="dot",
+            title=f"{len(collapsed)} lower-influence subjects\nCombined influence: {pct:.1f}%",
+        )
+
     for (src, dst), count in edges.items():
         net.add_edge(
             src, dst,
@@ -88,8 +142,15 @@ def render_graph(people, nodes, edges, influence):
         html_content = open(f.name, "r").read()
         os.unlink(f.name)
 
-    html_content = html_content.replace(
+    return html_content.replace(
         "<body>",
         '<body style="background:#FFFFFF; margin:0; border:1px solid #212529;">',
     )
+
+
+def render_graph(people, nodes, interactions, influence, scores=None,
+                 max_nodes=None, min_edge=1):
+    html_content = build_graph_html(
+        people, nodes, interactions, influence, scores, max_nodes, min_edge,
+    )
     components.html(html_content, height=520, scrolling=False)
@@ -0,0 +1,63 @@
+
+import functools
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════
+#  STATIC GRAPH LAYOUT
+# ═══════════════════════════════════════════════════════════════════════════
+# Node positions are computed here once per subject set and handed to pyvis
+# as fixed x/y with physics off, so the browser draws the graph without
+# running a simulation and nodes stay put between refreshes.
+LAYOUT_SPACING = 120.0   # px of radius per sqrt(subject)
+LAYOUT_MIN_RADIUS = 160.0
+SPRING_MIN_NODES = 12    # below this a circle reads best
+SPRING_ITERATIONS = 60
+
+
+def _radius(n):
+    return max(LAYOUT_MIN_RADIUS, LAYOUT_SPACING * np.sqrt(n))
+
+
+def circular_layout(n, radius):
+    """n points on a circle, first one at 12 o'clock, clockwise."""
+    theta = 2 * np.pi * np.arange(n) / max(n, 1) - np.pi / 2
+    return radius * np.column_stack((np.cos(theta), np.sin(theta)))
+
+
+def spring_layout(n, radius, iterations=SPRING_ITERATIONS):
+    """Fruchterman-Reingold style spread of n points over a disc.
+
+    Only repulsion and a pull towards the centre act (the layout must not
+    depend on who interrupts whom), which evens out the sunflower seed into
+    a uniform disc. Each iteration is one vectorized O(n^2) pass.
+    """
+    i = np.arange(n) + 0.5
+    r = radius * np.sqrt(i / n)
+    theta = i * np.pi * (3 - np.sqrt(5))  # golden angle
+    pos = np.column_stack((r * np.cos(theta), r * np.sin(theta)))
+    k = radius * np.sqrt(np.pi / n)        # ideal spacing for n points in the disc
+    gravity = np.pi                        # balances repulsion at the rim of `radius`
+    delta = np.empty((n, n, 2))
+    for step in range(iterations):
+        np.subtract(pos[:, None, :], pos[None, :, :], out=delta)
+        dist2 = np.einsum("ijk,ijk->ij", delta, delta)
+        np.fill_diagonal(dist2, np.inf)
+        np.maximum(dist2, 1e-6, out=dist2)
+        disp = np.einsum("ijk,ij->ik", delta, k * k / dist2) - gravity * pos
+        length = np.linalg.norm(disp, axis=1, keepdims=True)
+        temp = k * (1.0 - step / iterations)  # max move, cooling linearly
+        pos += disp / np.maximum(length, 1e-9) * np.minimum(length, temp)
+    return pos
+
+
+@functools.lru_cache(maxsize=64)
+def layout_positions(names):
+    """{name: (x, y)} for a tuple of node names. Cached per subject set."""
+    n = len(names)
+    if n == 0:
+        return {}
+    if n < SPRING_MIN_NODES:
+        pos = circular_layout(n, _radius(n))
+    else:
+        pos = spring_layout(n, _radius(n))
+    return {name: (float(x), float(y)) for name, (x, y) in zip(names, pos.round(1))}
@@ -0,0 +1,83 @@
+"""Load session exports into a local SQLite warehouse and query across sessions.
+
+    python warehouse.py ingest exports/ session_*.json     # incremental
+    python warehouse.py leaderboard --since 2025-01-01 --limit 10
+    python warehouse.py subject Alice --trend 20
+    python warehouse.py sessions --subject Alice
+
+The database defaults to sessions.db (--db or GLM_WAREHOUSE). Output is
+JSON so it can be piped into other tools.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from logic.warehouse import AGGREGATES, Warehouse
+
+
+def parse_date(value):
+    """YYYY-MM-DD[THH:MM:SS] (local time) or epoch seconds."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
+        try:
+            return time.mktime(time.strptime(value, fmt))
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"not a date: {value!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=os.environ.get("GLM_WAREHOUSE", "sessions.db"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("ingest", help="load export JSON files or directories")
+    p.add_argument("paths", nargs="+")
+
+    for name in ("leaderboard", "subject", "sessions"):
+        p = commands.add_parser(name)
+        p.add_argument("--since", type=parse_date)
+        p.add_argument("--until", type=parse_date)
+        if name == "leaderboard":
+            p.add_argument("--by", choices=AGGREGATES, default="mean_influence_pct")
+            p.add_argument("--min-sessions", type=int, default=1)
+            p.add_argument("--limit", type=int)
+        elif name == "subject":
+            p.add_argument("name")
+            p.add_argument("--trend", type=int, metavar="N", help="also list the last N sessions")
+        else:
+            p.add_argument("--subject")
+
+    commands.add_parser("stats")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    with Warehouse(args.db) as wh:
+        if args.command == "ingest":
+            result = wh.ingest(args.paths)
+        elif args.command == "leaderboard":
+            result = wh.leaderboard(args.since, args.until, args.min_sessions, args.by, args.limit)
+        elif args.command == "subject":
+            result = wh.subject_summary(args.name, args.since, args.until)
+            if result is None:
+                parser.exit(1, f"no sessions for {args.name!r}\n")
+            result["interruptions"] = wh.interruption_pairs(args.name, args.since, args.until)
+            if args.trend:
+                result["trend"] = wh.subject_trend(args.name, args.since, args.until, args.trend)
+        elif args.command == "sessions":
+            result = wh.sessions(args.since, args.until, args.subject)
+        else:
+            result = wh.stats()
+    print(json.dumps(result, indent=2))
+    print(f"{(time.perf_counter() - t0) * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()